@@ -0,0 +1,387 @@
+"""Benchmark every MCP tool cold and warm, plus allocations, startup and stdio.
+
+Writes machine-readable JSON results (stdout or --output) so releases can be
+compared; --compare reports the change against an earlier results file and
+exits non-zero when any benchmark regressed beyond --threshold.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+BIRTH: dict[str, Any] = {
+    "birth_year": 1996,
+    "birth_month": 7,
+    "birth_day": 4,
+    "birth_hour": 9,
+    "birth_minute": 10,
+    "birth_second": 0,
+    "latitude": 18.404,
+    "longitude": 75.195,
+    "timezone_offset": 5.5,
+}
+
+_BATCH_BIRTHS = [
+    BIRTH,
+    {**BIRTH, "birth_year": 1990, "latitude": 28.61, "longitude": 77.21},
+    {**BIRTH, "birth_year": 1985, "latitude": 19.07, "longitude": 72.88},
+    {**BIRTH, "birth_year": 2001, "latitude": 12.97, "longitude": 77.59},
+]
+
+# Arguments for each tool; every registered tool must have an entry.
+TOOL_CASES: dict[str, dict[str, Any]] = {
+    "calculate_birth_chart": BIRTH,
+    "get_panchanga": BIRTH,
+    "get_planetary_positions": BIRTH,
+    "get_dashas": BIRTH,
+    "get_dasha_at": {**BIRTH, "date": "2024-06-01", "depth": 5},
+    "get_dasha_range": {
+        **BIRTH,
+        "start_date": "2024-01-01",
+        "end_date": "2026-12-31",
+        "depth": 3,
+    },
+    "get_divisional_chart": {**BIRTH, "chart_code": "d9"},
+    "get_ashtakavarga": BIRTH,
+    "get_shadbala": BIRTH,
+    "get_ascendant": BIRTH,
+    "get_houses_summary": BIRTH,
+    "get_planetary_aspects": BIRTH,
+    "get_ayanamsa": BIRTH,
+    "get_sunrise_sunset": BIRTH,
+    "get_chart_views": {
+        **BIRTH,
+        "views": ["ascendant", "planetary_positions", "dashas", "panchanga", "d9"],
+    },
+    "create_chart": BIRTH,
+    # chart_id is filled in with BIRTH's ID at setup (see ``_with_chart_id``).
+    "get_chart_views_by_id": {
+        "chart_id": "",
+        "views": ["ascendant", "planetary_positions", "dashas", "panchanga", "d9"],
+    },
+    "release_chart": {"chart_id": ""},
+    "batch_get_chart_views": {
+        "births": _BATCH_BIRTHS,
+        "views": ["panchanga", "dashas", "d9"],
+    },
+    "get_position_series": {
+        "start": "2024-01-01T00:00:00",
+        "end": "2024-12-31T00:00:00",
+        "step_hours": 24,
+    },
+    "find_events": {
+        "start": "2024-01-01T00:00:00",
+        "end": "2025-01-01T00:00:00",
+        "timezone_offset": 5.5,
+    },
+    "sweep_birth_time": {**BIRTH, "charts": ["d9", "d60"]},
+    "get_panchanga_calendar": {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-31",
+        "latitude": 18.404,
+        "longitude": 75.195,
+        "timezone_offset": 5.5,
+    },
+    "match_charts": {"reference": BIRTH, "candidates": _BATCH_BIRTHS},
+    "cache_stats": {},
+}
+
+
+def _summary(name: str, mode: str, seconds: list[float]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "mode": mode,
+        "runs": len(seconds),
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+        "mean": statistics.fmean(seconds),
+        "max": max(seconds),
+    }
+
+
+async def _time_async(
+    call: Callable[[], Awaitable[object]],
+    runs: int,
+    before: Callable[[], None] | None = None,
+) -> list[float]:
+    seconds = []
+    for _ in range(runs):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        await call()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def missing_cases() -> list[str]:
+    """Registered tools without an entry in TOOL_CASES."""
+    from jyotishganit_mcp.server import mcp
+
+    tools = asyncio.run(mcp.list_tools())
+    return sorted(t.name for t in tools if t.name not in TOOL_CASES)
+
+
+def _with_chart_id(arguments: dict[str, Any]) -> dict[str, Any]:
+    """``arguments`` with BIRTH's chart ID registered, as create_chart does.
+
+    The ID depends on the coordinate precision, so it is not hard-coded.
+    """
+    from jyotishganit_mcp.chart_cache import BirthDetails, register_chart_id
+
+    if "chart_id" not in arguments:
+        return arguments
+    key = BirthDetails.from_record(BIRTH).key
+    return {**arguments, "chart_id": register_chart_id(key)}
+
+
+async def bench_tools(runs: int, only: str) -> list[dict[str, Any]]:
+    """Each tool through FastMCP, cold (cache cleared) and warm."""
+    from jyotishganit_mcp.chart_cache import clear_cache, set_chart_store
+    from jyotishganit_mcp.server import mcp
+
+    set_chart_store(None)
+    results = []
+    for name, arguments in TOOL_CASES.items():
+        if only not in name:
+            continue
+        arguments = _with_chart_id(arguments)
+
+        def call(name: str = name, arguments: dict[str, Any] = arguments) -> Any:
+            return mcp.call_tool(name, arguments)
+
+        # Untimed call so process-wide setup (ephemeris, worker pools) is done.
+        await call()
+        cold = await _time_async(call, runs, before=clear_cache)
+        results.append(_summary(name, "cold", cold))
+        await call()
+        warm = await _time_async(call, runs)
+        results.append(_summary(name, "warm", warm))
+    return results
+
+
+async def bench_allocations(runs: int, only: str) -> list[dict[str, Any]]:
+    """Named chart copies and bytes allocated per warm call of each named tool.
+
+    Tools that take a ``name`` are called with one; only output that includes
+    the person should copy the cached chart to carry it.
+    """
+    from jyotishganit_mcp.chart_cache import LazyBirthChart, set_chart_store
+    from jyotishganit_mcp.server import mcp
+
+    set_chart_store(None)
+    copies = 0
+    with_person = LazyBirthChart.with_person
+
+    def counting(self: LazyBirthChart, person: Any) -> LazyBirthChart:
+        nonlocal copies
+        copies += 1
+        return with_person(self, person)
+
+    named = {
+        t.name for t in await mcp.list_tools() if "name" in t.inputSchema["properties"]
+    }
+    results = []
+    LazyBirthChart.with_person = counting  # type: ignore[method-assign]
+    try:
+        for name, arguments in TOOL_CASES.items():
+            if only not in name or name not in named:
+                continue
+            arguments = {**arguments, "name": "Bhampu"}
+            await mcp.call_tool(name, arguments)
+            copies = 0
+            tracemalloc.start()
+            for _ in range(runs):
+                await mcp.call_tool(name, arguments)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append(
+                {
+                    "name": name,
+                    "mode": "allocations",
+                    "runs": runs,
+                    "chart_copies": copies,
+                    "peak_bytes": peak,
+                }
+            )
+    finally:
+        LazyBirthChart.with_person = with_person  # type: ignore[method-assign]
+    return results
+
+
+def bench_serialization(runs: int) -> list[dict[str, Any]]:
+    """Full-chart JSON-LD serialization of a chart with every section computed."""
+    from jyotishganit import get_birth_chart_json_string
+
+    from jyotishganit_mcp.chart_cache import get_birth_chart
+
+    chart = get_birth_chart(
+        datetime(1996, 7, 4, 9, 10),
+        BIRTH["latitude"],
+        BIRTH["longitude"],
+        BIRTH["timezone_offset"],
+    )
+    birth_chart = chart.to_birth_chart()
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        get_birth_chart_json_string(birth_chart)
+        seconds.append(time.perf_counter() - start)
+    return [_summary("full_chart_json", "serialize", seconds)]
+
+
+def bench_imports(runs: int) -> list[dict[str, Any]]:
+    """Fresh-interpreter import time of the server and of the chart modules."""
+    results = []
+    for name, statement in (
+        ("import_server", "import jyotishganit_mcp.server"),
+        ("import_chart_cache", "import jyotishganit_mcp.chart_cache"),
+    ):
+        seconds = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", statement], check=True)
+            seconds.append(time.perf_counter() - start)
+        results.append(_summary(name, "startup", seconds))
+    return results
+
+
+async def bench_stdio(runs: int) -> list[dict[str, Any]]:
+    """JSON-RPC over stdio: spawn + initialize, list_tools, cold and warm calls."""
+    from mcp import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "jyotishganit_mcp"],
+        env={**os.environ, "JYOTISHGANIT_MCP_WARMUP": "0"},
+    )
+    timings: dict[str, list[float]] = {
+        "initialize": [],
+        "list_tools": [],
+        "call_cold": [],
+        "call_warm": [],
+    }
+    with open(os.devnull, "w") as server_log:
+        for _ in range(runs):
+            start = time.perf_counter()
+            async with stdio_client(params, errlog=server_log) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    timings["initialize"].append(time.perf_counter() - start)
+                    for key, call in (
+                        ("list_tools", session.list_tools),
+                        (
+                            "call_cold",
+                            lambda: session.call_tool("get_panchanga", BIRTH),
+                        ),
+                        (
+                            "call_warm",
+                            lambda: session.call_tool("get_panchanga", BIRTH),
+                        ),
+                    ):
+                        start = time.perf_counter()
+                        await call()
+                        timings[key].append(time.perf_counter() - start)
+    return [_summary("stdio", mode, seconds) for mode, seconds in timings.items()]
+
+
+def _metadata() -> dict[str, Any]:
+    versions: dict[str, str | None] = {}
+    for package in ("jyotishganit-mcp", "jyotishganit", "skyfield", "mcp"):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float
+) -> list[str]:
+    """Lines describing median changes; those beyond ``threshold`` are marked."""
+    previous = {(r["name"], r["mode"]): r.get("median") for r in baseline}
+    lines = []
+    for r in results:
+        before = previous.get((r["name"], r["mode"]))
+        if "median" not in r:
+            continue
+        if not before:
+            continue
+        ratio = r["median"] / before
+        flag = "REGRESSION" if ratio > threshold else ""
+        lines.append(
+            f"{r['name']:<24} {r['mode']:<10} {before * 1e3:10.2f}ms "
+            f"-> {r['median'] * 1e3:10.2f}ms  x{ratio:5.2f} {flag}".rstrip()
+        )
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--only", default="", help="only tools whose name contains")
+    parser.add_argument("--skip-stdio", action="store_true")
+    parser.add_argument("--skip-imports", action="store_true")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="median ratio counted as a regression (default 1.25)",
+    )
+    args = parser.parse_args()
+
+    missing = missing_cases()
+    if missing:
+        sys.exit(f"No benchmark case for tools: {', '.join(missing)}")
+
+    results = asyncio.run(bench_tools(args.runs, args.only))
+    results += asyncio.run(bench_allocations(args.runs, args.only))
+    results += bench_serialization(args.runs)
+    if not args.skip_imports:
+        results += bench_imports(args.runs)
+    if not args.skip_stdio:
+        results += asyncio.run(bench_stdio(args.runs))
+
+    report = json.dumps({"meta": _metadata(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        lines = compare(results, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if any(line.endswith("REGRESSION") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Hot-chart access log and chart files for warming the cache at start-up.
+
+A chart file is JSON Lines, one birth per line with the fields of
+batch_get_chart_views births (birth_year, ..., timezone_offset). The access
+log is a chart file the server writes itself: when JYOTISHGANIT_MCP_ACCESS_LOG
+is set, every chart lookup is counted and the most requested charts are
+written there (hottest first, with a ``hits`` field) every minute and at exit,
+so the next start can warm the cache from it. Imports nothing heavy.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from jyotishganit_mcp.chart_store import ChartKey
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_KEYS = 1000
+_WRITE_INTERVAL_SECONDS = 60.0
+
+_log: AccessLog | None = None
+_log_configured = False
+_log_lock = threading.Lock()
+
+
+def birth_record(key: ChartKey) -> dict[str, int | float]:
+    """Birth record with local time for a canonical chart key."""
+    year, month, day, hour, minute, second, latitude, longitude, tz = key
+    utc = datetime(year, month, day, hour, minute, second)
+    local = utc + timedelta(minutes=round(tz * 60))
+    return {
+        "birth_year": local.year,
+        "birth_month": local.month,
+        "birth_day": local.day,
+        "birth_hour": local.hour,
+        "birth_minute": local.minute,
+        "birth_second": local.second,
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone_offset": tz,
+    }
+
+
+def _record_key(record: dict[str, Any]) -> ChartKey:
+    """Chart key of a record written by ``birth_record`` (its inverse).
+
+    Raises:
+        KeyError: If a field is missing.
+        TypeError, ValueError: If a field is not a valid number or date part.
+    """
+    tz = float(record["timezone_offset"])
+    local = datetime(
+        int(record["birth_year"]),
+        int(record["birth_month"]),
+        int(record["birth_day"]),
+        int(record["birth_hour"]),
+        int(record["birth_minute"]),
+        int(record["birth_second"]),
+    )
+    utc = local - timedelta(minutes=round(tz * 60))
+    return (
+        utc.year,
+        utc.month,
+        utc.day,
+        utc.hour,
+        utc.minute,
+        utc.second,
+        float(record["latitude"]),
+        float(record["longitude"]),
+        tz,
+    )
+
+
+def read_chart_file(path: str) -> list[dict[str, Any]]:
+    """Birth records of a chart file, by descending ``hits`` if it has them.
+
+    Blank lines are skipped; lines that are not JSON objects are logged and
+    skipped, and a ``hits`` that is not a number is logged and counted as 0.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                logger.warning("%s:%d: not a JSON object, skipped", path, number)
+                continue
+            hits = record.get("hits", 0)
+            if isinstance(hits, bool) or not isinstance(hits, int | float):
+                logger.warning("%s:%d: hits is not a number, using 0", path, number)
+                record["hits"] = 0
+            records.append(record)
+    records.sort(key=lambda r: -r.get("hits", 0))
+    return records
+
+
+class AccessLog:
+    """Lookup counts of charts, written to ``path`` as a chart file.
+
+    Counting resumes from the ``hits`` already in the file, so the hottest
+    charts are kept across restarts. Only the ``max_keys`` most requested
+    charts are written; counts of the rest are dropped when too many distinct
+    charts have been seen.
+    """
+
+    def __init__(self, path: str, max_keys: int = _DEFAULT_MAX_KEYS) -> None:
+        self.path = path
+        self.max_keys = max_keys
+        self._counts: Counter[ChartKey] = Counter()
+        self._lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        """Seed the counts from the ``hits`` of the existing file."""
+        try:
+            records = read_chart_file(self.path)
+        except OSError:
+            logger.exception("Could not read the access log %s", self.path)
+            return
+        for record in records[: self.max_keys]:
+            try:
+                key = _record_key(record)
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Invalid birth in the access log %s", self.path)
+                continue
+            self._counts[key] += int(record.get("hits", 0))
+
+    def record(self, key: ChartKey) -> None:
+        """Count one lookup of the chart for ``key``."""
+        with self._lock:
+            self._counts[key] += 1
+            if len(self._counts) > 4 * self.max_keys:
+                self._counts = Counter(dict(self._counts.most_common(self.max_keys)))
+
+    def hottest(self) -> list[tuple[ChartKey, int]]:
+        """The most requested keys with their counts, hottest first."""
+        with self._lock:
+            return self._counts.most_common(self.max_keys)
+
+    def write(self) -> int:
+        """Replace the file with the hottest charts; returns how many."""
+        hottest = self.hottest()
+        # A temporary file of its own, as several workers may share the path.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for key, hits in hottest:
+                    f.write(json.dumps({**birth_record(key), "hits": hits}) + "\n")
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return len(hottest)
+
+    def start_writer(self, interval: float = _WRITE_INTERVAL_SECONDS) -> None:
+        """Write the log every ``interval`` seconds and at exit (once started)."""
+        if self._writer is not None:
+            return
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                self._write_logged()
+
+        self._writer = threading.Thread(
+            target=run, name="jyotishganit-access-log", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self._write_logged)
+
+    def _write_logged(self) -> None:
+        try:
+            self.write()
+        except OSError:
+            logger.exception("Could not write the access log %s", self.path)
+
+
+def access_log_from_env() -> AccessLog | None:
+    """Access log configured by environment variables, if any.
+
+    JYOTISHGANIT_MCP_ACCESS_LOG is the file path (unset or empty disables it);
+    JYOTISHGANIT_MCP_ACCESS_LOG_MAX_KEYS is how many charts it keeps.
+    """
+    path = os.environ.get("JYOTISHGANIT_MCP_ACCESS_LOG", "").strip()
+    if not path:
+        return None
+    max_keys = int(
+        os.environ.get("JYOTISHGANIT_MCP_ACCESS_LOG_MAX_KEYS", "").strip()
+        or _DEFAULT_MAX_KEYS
+    )
+    return AccessLog(os.path.expanduser(path), max_keys=max_keys)
+
+
+def get_access_log() -> AccessLog | None:
+    """Return the access log, opening it from env on first use."""
+    global _log, _log_configured
+    if _log_configured:
+        return _log
+    with _log_lock:
+        if not _log_configured:
+            _log = access_log_from_env()
+            _log_configured = True
+        return _log
+
+
+def set_access_log(log: AccessLog | None) -> None:
+    """Use ``log`` as the access log (None rereads env on next use)."""
+    global _log, _log_configured
+    with _log_lock:
+        _log = log
+        _log_configured = log is not None
@@ -0,0 +1,66 @@
+"""Bounds of the in-process chart cache.
+
+Kept apart from ``chart_cache`` so the CLI can configure the cache without
+importing jyotishganit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+_DEFAULT_MAX_ENTRIES = 128
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_limits: CacheLimits | None = None
+_limits_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CacheLimits:
+    """Entry count, approximate size and time-to-live bounds (0 disables one).
+
+    Sizes are estimated from the pickled size of each chart's computed
+    sections and memoized responses.
+    """
+
+    max_entries: int = _DEFAULT_MAX_ENTRIES
+    max_bytes: int = _DEFAULT_MAX_BYTES
+    ttl_seconds: float = 0.0
+
+
+def limits_from_env() -> CacheLimits:
+    """Read limits from environment variables, defaulting unset ones.
+
+    JYOTISHGANIT_MCP_CACHE_SIZE is the maximum number of charts,
+    JYOTISHGANIT_MCP_CACHE_MAX_BYTES their approximate total size and
+    JYOTISHGANIT_MCP_CACHE_TTL the seconds a chart stays cached.
+    """
+    size = os.environ.get("JYOTISHGANIT_MCP_CACHE_SIZE", "").strip()
+    max_bytes = os.environ.get("JYOTISHGANIT_MCP_CACHE_MAX_BYTES", "").strip()
+    ttl = os.environ.get("JYOTISHGANIT_MCP_CACHE_TTL", "").strip()
+    return CacheLimits(
+        max_entries=max(0, int(size)) if size else _DEFAULT_MAX_ENTRIES,
+        max_bytes=max(0, int(max_bytes)) if max_bytes else _DEFAULT_MAX_BYTES,
+        ttl_seconds=max(0.0, float(ttl)) if ttl else 0.0,
+    )
+
+
+def get_cache_limits() -> CacheLimits:
+    """Return the configured limits, reading them from env on first use."""
+    global _limits
+    with _limits_lock:
+        if _limits is None:
+            _limits = limits_from_env()
+        return _limits
+
+
+def set_cache_limits(limits: CacheLimits | None) -> None:
+    """Replace the limits (None rereads env on next use).
+
+    Smaller limits take effect on the next cache insertion.
+    """
+    global _limits
+    with _limits_lock:
+        _limits = limits
@@ -1,45 +1,672 @@
-"""LRU-cached birth chart computation for jyotishganit."""
+"""LRU-cached, lazily computed birth charts for jyotishganit.
+
+The in-process cache is bounded by entry count, approximate size and an
+optional time-to-live (see ``cache_limits``), and keeps hit/miss/eviction
+counts and compute-time histograms (see ``cache_stats``).
+
+When a persistent store is configured (see ``chart_store``), it sits behind
+the in-process LRU cache: misses are looked up there before computing, and new
+charts and newly computed sections are written back to it. Sections are written
+a second after the first of them is computed, so a request computing several
+writes the chart once; database errors are logged rather than failing it.
+"""
 
 from __future__ import annotations
 
-import dataclasses
+import atexit
 import functools
-from datetime import datetime
-from typing import TYPE_CHECKING
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import jyotishganit.components.ashtakavarga as ashtakavarga
+import jyotishganit.components.aspects as aspects
+import jyotishganit.components.divisional_charts as divisional_charts
+import jyotishganit.components.houses as houses
+import jyotishganit.components.panchanga as panchanga
+import jyotishganit.components.strengths as strengths
+import jyotishganit.dasha.vimshottari as vimshottari
+from jyotishganit.core.astronomical import calculate_all_positions
+from jyotishganit.core.constants import DIVISIONAL_CHARTS
+from jyotishganit.core.models import Person, RasiChart, VedicBirthChart
+from jyotishganit.core.utils import longitude_to_nakshatra, longitude_to_zodiac
 
-from jyotishganit import calculate_birth_chart
-from jyotishganit.core.models import Person
+# Use local hip_main.dat when JYOTISHGANIT_HIP_MAIN_DAT is set, also in workers
+import jyotishganit_mcp._patch_skyfield  # noqa: F401
+
+# Share sunrise/sunset searches between charts for the same place and day
+import jyotishganit_mcp.location_cache  # noqa: F401
+
+# Build Spica from the compact cache instead of parsing hip_main.dat
+import jyotishganit_mcp.star_cache  # noqa: F401
+from jyotishganit_mcp.access_log import get_access_log
+from jyotishganit_mcp.cache_limits import get_cache_limits
+from jyotishganit_mcp.chart_store import ChartKey, ChartStore, store_from_env
+from jyotishganit_mcp.dasha_index import DashaIndex
+from jyotishganit_mcp.location_cache import location_cache_stats
+from jyotishganit_mcp.metrics import Counters, Histogram
+from jyotishganit_mcp.profiling import record, stage
 
 if TYPE_CHECKING:
-    from jyotishganit.core.models import VedicBirthChart
+    from jyotishganit.core.models import (
+        Ashtakavarga,
+        Ayanamsa,
+        Dashas,
+        DivisionalChart,
+        Panchanga,
+    )
 
-_CACHE_MAXSIZE = 32
+# Divisional chart codes in jyotishganit's order, D1 excluded (e.g. "d9").
+DIVISIONAL_CHART_CODES = tuple(code.lower() for code in list(DIVISIONAL_CHARTS)[1:])
 
+# Lazily computed chart sections; divisional chart codes are also accepted.
+SECTIONS = ("panchanga", "divisional_charts", "ashtakavarga", "strengths", "dashas")
 
-@functools.lru_cache(maxsize=_CACHE_MAXSIZE)
-def _get_birth_chart_cached(
-    year: int,
-    month: int,
-    day: int,
-    hour: int,
-    minute: int,
-    second: int,
-    latitude: float,
-    longitude: float,
-    timezone_offset: float,
-) -> VedicBirthChart:
-    """Compute birth chart; result is cached by birth details."""
-    birth_date = datetime(year, month, day, hour, minute, second)
-    return calculate_birth_chart(
-        birth_date=birth_date,
+_T = TypeVar("_T")
+
+logger = logging.getLogger(__name__)
+
+# Decimal places latitude and longitude are rounded to in cache keys.
+_DEFAULT_COORDINATE_DECIMALS = 4
+
+_cache: OrderedDict[ChartKey, _CacheEntry] = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+_counters = Counters("hits", "misses", "evictions", "expirations")
+# Compute time of D1 charts ("chart") and of each kind of section.
+_compute_times: dict[str, Histogram] = {}
+_compute_times_lock = threading.Lock()
+# Charts being loaded or computed, so concurrent misses wait for one result.
+_inflight: dict[ChartKey, Future[LazyBirthChart]] = {}
+# Charts that are neither evicted nor expired (see ``pin_chart``).
+_pinned: set[ChartKey] = set()
+_MAX_PINNED_CHARTS = 256
+# Keys of the chart IDs handed out (see ``register_chart_id``), oldest first.
+_chart_ids: OrderedDict[str, ChartKey] = OrderedDict()
+_MAX_CHART_IDS = 100_000
+
+_store: ChartStore | None = None
+_store_configured = False
+# Charts with sections not yet written to the store, by key (see ``_save_later``).
+_pending_saves: dict[ChartKey, tuple[ChartStore, LazyBirthChart, threading.Timer]] = {}
+_pending_saves_lock = threading.Lock()
+_SAVE_DELAY_SECONDS = 1.0
+
+_batch_pool: ProcessPoolExecutor | None = None
+_batch_pool_workers = 0
+_batch_pool_lock = threading.Lock()
+
+
+def _approximate_size(value: object) -> int:
+    """Approximate memory use of ``value``: its pickled size in bytes."""
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _record_compute_time(kind: str, seconds: float) -> None:
+    """Add a computation of ``kind`` ("chart" or a section) to its histogram.
+
+    It is also recorded as stage ``compute:<kind>`` of the current tool request.
+    """
+    with _compute_times_lock:
+        histogram = _compute_times.get(kind)
+        if histogram is None:
+            histogram = _compute_times[kind] = Histogram()
+    histogram.observe(seconds)
+    record(f"compute:{kind}", seconds)
+
+
+def coordinate_decimals() -> int:
+    """Decimal places coordinates are rounded to before charts are computed.
+
+    JYOTISHGANIT_MCP_COORD_DECIMALS, default 4 (about 11 m), which moves the
+    ascendant by well under an arc-second.
+    """
+    configured = os.environ.get("JYOTISHGANIT_MCP_COORD_DECIMALS", "").strip()
+    return max(0, int(configured)) if configured else _DEFAULT_COORDINATE_DECIMALS
+
+
+def chart_key(
+    birth_date: datetime, latitude: float, longitude: float, timezone_offset: float
+) -> ChartKey:
+    """Canonical cache key for birth details.
+
+    The key holds the UTC instant's components, the coordinates rounded to
+    ``coordinate_decimals`` places and the offset rounded to the minute, so
+    equivalent requests share a chart. The offset stays in the key because
+    jyotishganit reads local clock time for some strengths and dasha dates.
+    """
+    offset = round(timezone_offset * 60) / 60 + 0.0
+    utc = birth_date - timedelta(hours=offset)
+    decimals = coordinate_decimals()
+    return (
+        utc.year,
+        utc.month,
+        utc.day,
+        utc.hour,
+        utc.minute,
+        utc.second,
+        round(latitude, decimals) + 0.0,
+        round(longitude, decimals) + 0.0,
+        offset,
+    )
+
+
+@dataclass(frozen=True)
+class BirthDetails:
+    """Birth details that determine a chart (the cache key)."""
+
+    birth_date: datetime
+    latitude: float
+    longitude: float
+    timezone_offset: float = 0.0
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> BirthDetails:
+        """Build from a birth record (birth_year, ..., timezone_offset).
+
+        Raises:
+            KeyError: If a field is missing.
+            ValueError: If a field is not a valid number or date part.
+        """
+        return cls(
+            birth_date=datetime(
+                int(record["birth_year"]),
+                int(record["birth_month"]),
+                int(record["birth_day"]),
+                int(record["birth_hour"]),
+                int(record["birth_minute"]),
+                int(record["birth_second"]),
+            ),
+            latitude=float(record["latitude"]),
+            longitude=float(record["longitude"]),
+            timezone_offset=float(record["timezone_offset"]),
+        )
+
+    @property
+    def key(self) -> ChartKey:
+        """Canonical cache key (see ``chart_key``)."""
+        return chart_key(
+            self.birth_date, self.latitude, self.longitude, self.timezone_offset
+        )
+
+
+class LazyBirthChart:
+    """Vedic birth chart whose sections are computed on first access.
+
+    The D1 chart (ayanamsa, planet positions, houses, aspects and lordships) is
+    computed up front because every other section derives from it. Panchanga,
+    each divisional chart, ashtakavarga, strengths (shadbala and bhava bala)
+    and dashas are computed the first time they are read and memoized on the
+    instance, so a cached entry only pays for the sections tools actually use.
+    Built tool responses can be memoized on the instance too (``response``).
+    """
+
+    def __init__(self, person: Person) -> None:
+        self.person = person
+        self._sections: dict[str, Any] = {}
+        self._responses: dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+        # Called after a section is computed (persists the cached chart).
+        self._on_update: Callable[[], None] | None = None
+        # Called with the approximate size of each new section or response.
+        self._on_grow: Callable[[int], None] | None = None
+
+        start = time.perf_counter()
+        ayanamsa, asc_lon, planets = calculate_all_positions(person)
+        house_objects = houses.calculate_houses(asc_lon)
+        houses.update_house_occupants(house_objects, planets)
+        _, planets = aspects.calculate_all_aspects(planets, house_objects)
+        houses.compute_lord_data(planets, house_objects)
+
+        asc_sign, asc_degrees = longitude_to_zodiac(asc_lon)
+        asc_nak, asc_pada, asc_deity = longitude_to_nakshatra(asc_lon)
+        house_objects[0].sign_degrees = asc_degrees
+        house_objects[0].nakshatra = asc_nak
+        house_objects[0].pada = asc_pada
+        house_objects[0].nakshatra_deity = asc_deity
+
+        self.ayanamsa: Ayanamsa = ayanamsa
+        self.ascendant_sign: str = asc_sign
+        self.d1_chart = RasiChart(planets=planets, houses=house_objects)
+        _record_compute_time("chart", time.perf_counter() - start)
+
+    def _section(self, key: str, compute: Callable[[], _T]) -> _T:
+        """Return the memoized section ``key``, computing it once if missing."""
+        try:
+            return self._sections[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._sections:
+                start = time.perf_counter()
+                self._sections[key] = compute()
+                _record_compute_time(key.split(":")[0], time.perf_counter() - start)
+                if self._on_update is not None:
+                    self._on_update()
+                if self._on_grow is not None:
+                    self._on_grow(_approximate_size(self._sections[key]))
+            return self._sections[key]
+
+    def response(self, key: Hashable, build: Callable[[], _T]) -> _T:
+        """Return the memoized response ``key``, building it once if missing.
+
+        Responses are shared with the named views of this chart (see
+        ``with_person``), so ``key`` must identify everything the response
+        depends on except the person's name, and ``build`` must not use it.
+        """
+        try:
+            return self._responses[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._responses:
+                self._responses[key] = build()
+                if self._on_grow is not None:
+                    self._on_grow(_approximate_size(self._responses[key]))
+            return self._responses[key]
+
+    def has_response(self, key: Hashable) -> bool:
+        """Return whether the response ``key`` is already memoized."""
+        return key in self._responses
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_on_update"] = None
+        state["_on_grow"] = None
+        # Responses are cheap to rebuild from the sections; do not store them.
+        state["_responses"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_responses", {})
+        self.__dict__.setdefault("_on_grow", None)
+        self._lock = threading.RLock()
+
+    @property
+    def panchanga(self) -> Panchanga:
+        """Panchanga (tithi, nakshatra, yoga, karana, vaara) at birth."""
+        return self._section(
+            "panchanga",
+            lambda: panchanga.create_panchanga(
+                self.person.birth_datetime,
+                self.person.timezone_offset,
+                self.ayanamsa.value,
+            ),
+        )
+
+    def divisional_chart(self, chart_code: str) -> DivisionalChart:
+        """Return one divisional chart by lowercase code (e.g. ``"d9"``)."""
+        if chart_code not in DIVISIONAL_CHART_CODES:
+            raise KeyError(chart_code)
+        return self._section(
+            f"divisional:{chart_code}",
+            lambda: divisional_charts.compute_divisional_chart(
+                self.d1_chart, chart_code.upper()
+            ),
+        )
+
+    @property
+    def divisional_charts(self) -> dict[str, DivisionalChart]:
+        """All divisional charts (D2-D60) keyed by lowercase code."""
+        return {code: self.divisional_chart(code) for code in DIVISIONAL_CHART_CODES}
+
+    @property
+    def ashtakavarga(self) -> Ashtakavarga:
+        """Sarvashtakavarga and Bhinnashtakavarga for the D1 chart."""
+        return self._section(
+            "ashtakavarga",
+            lambda: ashtakavarga.calculate_ashtakavarga_for_chart(
+                self.d1_chart, self.ascendant_sign
+            ),
+        )
+
+    @property
+    def strengths(self) -> RasiChart:
+        """D1 chart with shadbala and bhava bala filled in.
+
+        jyotishganit computes strengths in place, so this is ``d1_chart`` itself
+        once the strengths have been applied.
+        """
+        return self._section(
+            "strengths",
+            lambda: strengths.calculate_all_strengths(self.d1_chart, self.person),
+        )
+
+    @property
+    def dashas(self) -> Dashas:
+        """Vimshottari dasha periods: all, current and upcoming."""
+        return self._section(
+            "dashas",
+            lambda: vimshottari.calculate_vimshottari_dashas(
+                self.person.birth_datetime,
+                self.person.timezone_offset,
+                self.person.latitude,
+                self.person.longitude,
+                self.ayanamsa.value,
+            ),
+        )
+
+    @property
+    def dasha_index(self) -> DashaIndex:
+        """Vimshottari periods searchable by date, sub-periods built on demand."""
+        return self._section(
+            "dasha_index",
+            lambda: DashaIndex(
+                *vimshottari.calculate_dasha_start_date(
+                    self.person.birth_datetime,
+                    self.person.timezone_offset,
+                    self.ayanamsa.value,
+                )
+            ),
+        )
+
+    def compute_sections(self, sections: Sequence[str]) -> None:
+        """Compute the named sections now (names from ``SECTIONS`` or "d9" etc.).
+
+        Raises:
+            ValueError: If a section name is unknown.
+        """
+        for section in sections:
+            if section in DIVISIONAL_CHART_CODES:
+                self.divisional_chart(section)
+            elif section in SECTIONS:
+                getattr(self, section)
+            else:
+                raise ValueError(f"Unknown chart section: {section!r}")
+
+    def has_sections(self, sections: Sequence[str]) -> bool:
+        """Return whether the named sections are already computed."""
+        for section in sections:
+            if section in DIVISIONAL_CHART_CODES:
+                keys = [f"divisional:{section}"]
+            elif section == "divisional_charts":
+                keys = [f"divisional:{code}" for code in DIVISIONAL_CHART_CODES]
+            else:
+                keys = [section]
+            if any(key not in self._sections for key in keys):
+                return False
+        return True
+
+    def with_person(self, person: Person) -> LazyBirthChart:
+        """Return a view of this chart with a different person.
+
+        The view shares this chart's memoized sections and responses; only the
+        person (used for the name in the JSON-LD output) differs.
+        """
+        # Not copy.copy: that goes through __getstate__, which drops responses.
+        view = object.__new__(LazyBirthChart)
+        view.__dict__.update(self.__dict__)
+        view.person = person
+        return view
+
+    def with_name(self, name: str | None) -> LazyBirthChart:
+        """Return a view of this chart whose person has ``name``, if one is given.
+
+        Only output that includes the person needs it: every other view reads
+        the same sections from the shared, unnamed chart.
+        """
+        if name is None or name == "":
+            return self
+        p = self.person
+        return self.with_person(
+            Person(
+                birth_datetime=p.birth_datetime,
+                latitude=p.latitude,
+                longitude=p.longitude,
+                timezone_offset=p.timezone_offset,
+                timezone=p.timezone,
+                name=name,
+            )
+        )
+
+    def to_birth_chart(self) -> VedicBirthChart:
+        """Compute any missing sections and return a full ``VedicBirthChart``."""
+        return VedicBirthChart(
+            person=self.person,
+            ayanamsa=self.ayanamsa,
+            panchanga=self.panchanga,
+            d1_chart=self.strengths,
+            divisional_charts=self.divisional_charts,
+            ashtakavarga=self.ashtakavarga,
+            dashas=self.dashas,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the same JSON-LD dict as ``VedicBirthChart.to_dict``."""
+        return self.to_birth_chart().to_dict()
+
+
+def _person_from_key(key: ChartKey) -> Person:
+    """Build the unnamed Person (with local birth time) for a cache key."""
+    year, month, day, hour, minute, second, latitude, longitude, tz = key
+    utc = datetime(year, month, day, hour, minute, second)
+    return Person(
+        birth_datetime=utc + timedelta(hours=tz),
         latitude=latitude,
         longitude=longitude,
-        timezone_offset=timezone_offset,
-        location_name=None,
+        timezone_offset=tz,
         name=None,
     )
 
 
+@dataclass
+class _CacheEntry:
+    """A cached chart with its approximate size and expiry time."""
+
+    chart: LazyBirthChart
+    nbytes: int
+    expires_at: float = field(default=math.inf)
+
+
+def _record_access(key: ChartKey) -> None:
+    """Count a lookup of ``key`` in the access log, if one is configured."""
+    log = get_access_log()
+    if log is not None:
+        log.record(key)
+
+
+def _lookup(key: ChartKey) -> LazyBirthChart | None:
+    """Return the live cached chart for ``key``, marking it recently used.
+
+    Expired entries are dropped unless pinned. Must be called with
+    ``_cache_lock`` held.
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if entry.expires_at <= time.monotonic() and key not in _pinned:
+        _remove(key)
+        _counters.add("expirations")
+        return None
+    _cache.move_to_end(key)
+    return entry.chart
+
+
+def _remove(key: ChartKey) -> None:
+    """Drop an entry. Must be called with ``_cache_lock`` held."""
+    global _cache_bytes
+    entry = _cache.pop(key)
+    _cache_bytes -= entry.nbytes
+
+
+def _evict_over_limits() -> None:
+    """Evict least recently used entries beyond the configured limits.
+
+    The most recently used entry and pinned entries are always kept. Must be
+    called with ``_cache_lock`` held.
+    """
+    limits = get_cache_limits()
+
+    def over_limits() -> bool:
+        return bool(
+            (limits.max_entries and len(_cache) > limits.max_entries)
+            or (limits.max_bytes and _cache_bytes > limits.max_bytes)
+        )
+
+    if not over_limits():
+        return
+    for key in [k for k in list(_cache)[:-1] if k not in _pinned]:
+        _remove(key)
+        _counters.add("evictions")
+        if not over_limits():
+            return
+
+
+def _cache_get(key: ChartKey) -> LazyBirthChart | None:
+    """Return the cached chart for ``key`` and mark it most recently used."""
+    with _cache_lock:
+        chart = _lookup(key)
+    _counters.add("hits" if chart is not None else "misses")
+    return chart
+
+
+def _cache_put(key: ChartKey, chart: LazyBirthChart) -> None:
+    """Insert ``chart``, evicting least recently used entries over the limits."""
+    global _cache_bytes
+    nbytes = _approximate_size(chart.__getstate__())
+    ttl = get_cache_limits().ttl_seconds
+    entry = _CacheEntry(chart, nbytes, time.monotonic() + ttl if ttl else math.inf)
+    with _cache_lock:
+        if key in _cache:
+            _remove(key)
+        _cache[key] = entry
+        _cache_bytes += nbytes
+        chart._on_grow = functools.partial(_grow, key, chart)
+        _evict_over_limits()
+
+
+def _grow(key: ChartKey, chart: LazyBirthChart, nbytes: int) -> None:
+    """Account for ``nbytes`` added to a cached chart, evicting if over limits."""
+    global _cache_bytes
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry.chart is not chart:
+            return
+        entry.nbytes += nbytes
+        _cache_bytes += nbytes
+        _evict_over_limits()
+
+
+def _save(store: ChartStore, key: ChartKey, chart: LazyBirthChart) -> None:
+    """Write ``chart`` to ``store``, logging database errors instead of raising."""
+    with chart._lock:
+        data = pickle.dumps(chart, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        store.save_pickled(key, data)
+    except sqlite3.Error:
+        logger.warning("Could not save a chart to %s", store.path, exc_info=True)
+
+
+def _save_later(store: ChartStore, key: ChartKey, chart: LazyBirthChart) -> None:
+    """Write ``chart`` to ``store`` once, shortly after a section is computed."""
+    with _pending_saves_lock:
+        if key in _pending_saves:
+            return
+        timer = threading.Timer(_SAVE_DELAY_SECONDS, _save_pending, (key,))
+        timer.daemon = True
+        _pending_saves[key] = (store, chart, timer)
+    timer.start()
+
+
+def _save_pending(key: ChartKey) -> None:
+    with _pending_saves_lock:
+        pending = _pending_saves.pop(key, None)
+    if pending is not None:
+        store, chart, timer = pending
+        timer.cancel()
+        _save(store, key, chart)
+
+
+def flush_store_writes() -> None:
+    """Write the charts whose new sections are waiting to be stored now."""
+    with _pending_saves_lock:
+        keys = list(_pending_saves)
+    for key in keys:
+        _save_pending(key)
+
+
+atexit.register(flush_store_writes)
+
+
+def _attach_store(key: ChartKey, chart: LazyBirthChart) -> None:
+    """Write sections computed later on ``chart`` back to the store."""
+    store = get_chart_store()
+    if store is not None:
+        # Bound to the cached chart, so named views persist it, not themselves.
+        chart._on_update = functools.partial(_save_later, store, key, chart)
+
+
+def _load_from_store(key: ChartKey) -> LazyBirthChart | None:
+    """Return the stored chart for ``key``, if a persistent tier has it."""
+    store = get_chart_store()
+    return store.load(key) if store is not None else None
+
+
+def _adopt(key: ChartKey, chart: LazyBirthChart, *, save: bool) -> None:
+    """Insert a chart into the cache (and the store if ``save``)."""
+    store = get_chart_store()
+    if save and store is not None:
+        _save(store, key, chart)
+    _attach_store(key, chart)
+    _cache_put(key, chart)
+
+
+def _get_birth_chart_cached(key: ChartKey) -> LazyBirthChart:
+    """Load or compute the D1 chart for a canonical key; result is cached.
+
+    Concurrent calls for the same uncached key share a single computation.
+    """
+    _record_access(key)
+    with stage("cache_lookup"), _cache_lock:
+        chart = _lookup(key)
+        if chart is not None:
+            _counters.add("hits")
+            return chart
+        _counters.add("misses")
+        inflight = _inflight.get(key)
+        if inflight is None:
+            future: Future[LazyBirthChart] = Future()
+            _inflight[key] = future
+    if inflight is not None:
+        with stage("inflight_wait"):
+            return inflight.result()
+
+    try:
+        with stage("store_load"):
+            chart = _load_from_store(key)
+        if chart is not None:
+            with stage("cache_insert"):
+                _adopt(key, chart, save=False)
+        else:
+            chart = LazyBirthChart(_person_from_key(key))
+            with stage("cache_insert"):
+                _adopt(key, chart, save=True)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(chart)
+    finally:
+        with _cache_lock:
+            del _inflight[key]
+    return chart
+
+
 def get_birth_chart(
     birth_date: datetime,
     latitude: float,
@@ -47,39 +674,279 @@ def get_birth_chart(
     timezone_offset: float = 0.0,
     location_name: str | None = None,
     name: str | None = None,
-) -> VedicBirthChart:
-    """Return a Vedic birth chart, using LRU cache for same birth details.
-
-    The cache key is (birth_date, lat, lon, timezone_offset) only; name and
-    location_name do not affect calculations. If the caller provides name,
-    the returned chart's person is patched so the full JSON-LD has the
-    correct label. (location_name is not stored by jyotishganit's Person.)
-    """
-    chart = _get_birth_chart_cached(
-        birth_date.year,
-        birth_date.month,
-        birth_date.day,
-        birth_date.hour,
-        birth_date.minute,
-        birth_date.second,
-        latitude,
-        longitude,
-        timezone_offset,
-    )
-    if name is not None and name != "":
-        p = chart.person
-        new_person = Person(
-            birth_datetime=p.birth_datetime,
-            latitude=p.latitude,
-            longitude=p.longitude,
-            timezone_offset=p.timezone_offset,
-            timezone=p.timezone,
-            name=name,
-        )
-        chart = dataclasses.replace(chart, person=new_person)
+) -> LazyBirthChart:
+    """Return a lazily computed Vedic birth chart, using LRU cache.
+
+    The cache key is (birth_date, lat, lon, timezone_offset) only, in the
+    canonical form of ``chart_key``: the chart is computed for the rounded
+    coordinates. Name and location_name do not affect calculations. If the
+    caller provides name, the returned chart's person is patched so the full
+    JSON-LD has the correct label. (location_name is not stored by
+    jyotishganit's Person.) Sections computed through a patched chart are
+    shared with the cached one.
+    """
+    key = chart_key(birth_date, latitude, longitude, timezone_offset)
+    return _get_birth_chart_cached(key).with_name(name)
+
+
+def peek_birth_chart(
+    birth_date: datetime,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float = 0.0,
+    name: str | None = None,
+) -> LazyBirthChart | None:
+    """Return the in-process cached chart, or None; never computes or blocks.
+
+    Like ``get_birth_chart`` but without loading from the persistent store or
+    computing on a miss, so it is cheap enough to call on the event loop. Only
+    hits are counted, since a miss is followed by a real lookup.
+    """
+    key = BirthDetails(birth_date, latitude, longitude, timezone_offset).key
+    with _cache_lock:
+        chart = _lookup(key)
+    if chart is None:
+        return None
+    _counters.add("hits")
+    _record_access(key)
+    return chart.with_name(name)
+
+
+def chart_id(key: ChartKey) -> str:
+    """Short stable ID of a chart: a hash of its canonical key."""
+    return hashlib.sha256(json.dumps(list(key)).encode()).hexdigest()[:16]
+
+
+def register_chart_id(key: ChartKey) -> str:
+    """Return the ID of ``key`` and remember it for ``get_chart_by_id``.
+
+    IDs are kept in-process (the most recent ``_MAX_CHART_IDS``) and in the
+    persistent store, if any, so they stay valid after a restart. A failed
+    store write is logged; the ID then lasts for this process only.
+    """
+    cid = chart_id(key)
+    with _cache_lock:
+        _chart_ids[cid] = key
+        _chart_ids.move_to_end(cid)
+        if len(_chart_ids) > _MAX_CHART_IDS:
+            _chart_ids.popitem(last=False)
+    store = get_chart_store()
+    if store is not None:
+        try:
+            store.save_chart_id(cid, key)
+        except sqlite3.Error:
+            logger.warning("Could not save a chart ID to %s", store.path, exc_info=True)
+    return cid
+
+
+def chart_key_for_id(cid: str) -> ChartKey | None:
+    """Return the key a chart ID was registered for, or None if unknown."""
+    with _cache_lock:
+        key = _chart_ids.get(cid)
+    if key is None:
+        store = get_chart_store()
+        key = store.load_chart_key(cid) if store is not None else None
+    return key
+
+
+def get_chart_by_id(cid: str) -> LazyBirthChart:
+    """Return the chart of a registered ID, loading or computing it on a miss.
+
+    Raises:
+        KeyError: If the ID was never registered (or has been forgotten).
+    """
+    key = chart_key_for_id(cid)
+    if key is None:
+        raise KeyError(cid)
+    return _get_birth_chart_cached(key)
+
+
+def peek_chart_by_id(cid: str) -> LazyBirthChart | None:
+    """Like ``peek_birth_chart`` for a chart ID known in this process."""
+    with _cache_lock:
+        key = _chart_ids.get(cid)
+        chart = _lookup(key) if key is not None else None
+    if key is not None and chart is not None:
+        _counters.add("hits")
+        _record_access(key)
+    return chart
+
+
+def pin_chart(key: ChartKey) -> None:
+    """Keep the chart of ``key`` cached until ``unpin_chart``.
+
+    Pinned charts are exempt from eviction and expiry, so the cache may hold
+    more than its limits while they are pinned.
+
+    Raises:
+        ValueError: If ``_MAX_PINNED_CHARTS`` charts are already pinned.
+    """
+    with _cache_lock:
+        if key not in _pinned and len(_pinned) >= _MAX_PINNED_CHARTS:
+            raise ValueError(
+                f"Too many pinned charts; the limit is {_MAX_PINNED_CHARTS}."
+            )
+        _pinned.add(key)
+
+
+def unpin_chart(key: ChartKey) -> bool:
+    """Let the chart of ``key`` be evicted again; returns whether it was pinned."""
+    with _cache_lock:
+        if key not in _pinned:
+            return False
+        _pinned.discard(key)
+        _evict_over_limits()
+    return True
+
+
+def _compute_chart(key: ChartKey, sections: tuple[str, ...]) -> LazyBirthChart:
+    """Compute a chart and the requested sections (runs in a worker process)."""
+    chart = LazyBirthChart(_person_from_key(key))
+    chart.compute_sections(sections)
     return chart
 
 
+def _default_batch_workers() -> int:
+    """Worker count from JYOTISHGANIT_MCP_BATCH_WORKERS, else the CPU count."""
+    configured = os.environ.get("JYOTISHGANIT_MCP_BATCH_WORKERS", "").strip()
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def _get_batch_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared batch process pool, resized to ``max_workers``."""
+    global _batch_pool, _batch_pool_workers
+    with _batch_pool_lock:
+        if _batch_pool is None or _batch_pool_workers != max_workers:
+            if _batch_pool is not None:
+                _batch_pool.shutdown(wait=False)
+            _batch_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _batch_pool_workers = max_workers
+        return _batch_pool
+
+
+def get_birth_charts(
+    births: Sequence[BirthDetails],
+    sections: Sequence[str] = (),
+    max_workers: int | None = None,
+    record_access: bool = True,
+) -> list[LazyBirthChart | Exception]:
+    """Return charts for many births, computing cache misses in parallel.
+
+    Duplicate births are computed once, and births already in the cache (or
+    the persistent store) are not recomputed. Remaining misses are computed
+    with their requested ``sections`` (see ``LazyBirthChart.compute_sections``)
+    in a process pool of ``max_workers`` (default JYOTISHGANIT_MCP_BATCH_WORKERS
+    or the CPU count). Results are in input order; a birth whose computation
+    failed gets the exception in its place instead of failing the batch.
+    With ``record_access`` false (for warm-up), the lookups are not counted in
+    the access log.
+    """
+    wanted = tuple(sections)
+    workers = max_workers if max_workers is not None else _default_batch_workers()
+    found: dict[ChartKey, LazyBirthChart | Exception] = {}
+    misses: list[ChartKey] = []
+    for key in dict.fromkeys(b.key for b in births):
+        if record_access:
+            _record_access(key)
+        chart = _cache_get(key)
+        if chart is None:
+            chart = _load_from_store(key)
+            if chart is not None:
+                _adopt(key, chart, save=False)
+        if chart is not None:
+            found[key] = chart
+        else:
+            misses.append(key)
+
+    if len(misses) > 1 and workers > 1:
+        pool = _get_batch_pool(workers)
+        futures = {key: pool.submit(_compute_chart, key, wanted) for key in misses}
+        for key, future in futures.items():
+            try:
+                found[key] = future.result()
+            except Exception as e:
+                found[key] = e
+    else:
+        for key in misses:
+            try:
+                found[key] = _compute_chart(key, wanted)
+            except Exception as e:
+                found[key] = e
+
+    for key in misses:
+        result = found[key]
+        if isinstance(result, LazyBirthChart):
+            _adopt(key, result, save=True)
+    return [found[b.key] for b in births]
+
+
+def get_chart_store() -> ChartStore | None:
+    """Return the persistent chart store, opening it from env on first use.
+
+    A store that cannot be opened is logged once and left disabled, so charts
+    are cached in memory only.
+    """
+    global _store, _store_configured
+    if not _store_configured:
+        try:
+            _store = store_from_env()
+        except (OSError, sqlite3.Error):
+            logger.exception("Could not open the chart store; caching in memory only")
+            _store = None
+        _store_configured = True
+    return _store
+
+
+def set_chart_store(store: ChartStore | None) -> None:
+    """Use ``store`` as the persistent tier (None disables it)."""
+    global _store, _store_configured
+    _store = store
+    _store_configured = True
+    clear_cache()
+
+
+def cache_stats() -> dict[str, object]:
+    """Snapshot of the in-process cache for tuning its limits.
+
+    Returns current size, the limits, hit/miss/eviction/expiration counts and
+    histograms of compute seconds for D1 charts ("chart") and each section.
+    Charts computed in batch worker processes are not timed here. Also
+    reports the per-location sunrise/sunset caches (see ``location_cache``).
+    """
+    limits = get_cache_limits()
+    with _cache_lock:
+        entries, nbytes, inflight = len(_cache), _cache_bytes, len(_inflight)
+        pinned = len(_pinned)
+    with _compute_times_lock:
+        histograms = sorted(_compute_times.items())
+    return {
+        "entries": entries,
+        "approximate_bytes": nbytes,
+        "inflight": inflight,
+        "pinned": pinned,
+        "max_entries": limits.max_entries,
+        "max_bytes": limits.max_bytes,
+        "ttl_seconds": limits.ttl_seconds,
+        **_counters.to_dict(),
+        "compute_seconds": {kind: h.to_dict() for kind, h in histograms},
+        "location_cache": location_cache_stats(),
+    }
+
+
 def clear_cache() -> None:
-    """Clear the birth chart cache. Used for testing."""
-    _get_birth_chart_cached.cache_clear()
+    """Clear the in-process birth chart cache and pins. Used for testing.
+
+    Chart IDs stay valid (their charts are recomputed on use), and the
+    persistent store, if any, gets the sections still waiting to be written.
+    """
+    global _cache_bytes
+    flush_store_writes()
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+        _pinned.clear()
@@ -0,0 +1,253 @@
+"""Persistent SQLite tier for the birth chart cache.
+
+Enabled by setting JYOTISHGANIT_MCP_CACHE_DB to a file path. Charts are stored
+pickled, keyed by the same birth details as the in-process LRU cache, so a
+restarted server (or another server process sharing the file) can serve them
+without recomputing. Rows written by a different store format or jyotishganit
+version are ignored and eventually evicted.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import date
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from jyotishganit_mcp.chart_cache import LazyBirthChart
+
+# UTC date and time components, latitude, longitude and timezone offset
+# (see ``chart_cache.chart_key``).
+ChartKey = tuple[int, int, int, int, int, int, float, float, float]
+
+# Bump when the pickled chart layout or the key changes incompatibly.
+_FORMAT_VERSION = 2
+_DEFAULT_MAX_ENTRIES = 10_000
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+# Sections that depend on the current date rather than only on birth details.
+_DATE_DEPENDENT_SECTIONS = ("dashas",)
+
+
+def _store_version() -> str:
+    """Version tag for stored rows: store format plus jyotishganit version."""
+    try:
+        lib_version = version("jyotishganit")
+    except PackageNotFoundError:
+        lib_version = "0.0.0"
+    return f"{_FORMAT_VERSION}:{lib_version}"
+
+
+class ChartStore:
+    """Size-bounded SQLite store of pickled birth charts.
+
+    Safe to share between threads and between processes: each process opens
+    its own connection, the database runs in WAL mode, and writers wait on a
+    busy timeout instead of failing. When more than ``max_entries`` charts (or
+    chart IDs) are stored, the least recently accessed ones are deleted.
+    """
+
+    def __init__(self, path: str, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._version = _store_version()
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path,
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS charts (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                computed_on TEXT NOT NULL,
+                accessed_at REAL NOT NULL,
+                data BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS charts_accessed_at ON charts (accessed_at)"
+        )
+        # Chart IDs handed out by create_chart, so they outlive the process.
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chart_ids (
+                id TEXT PRIMARY KEY,
+                key TEXT,
+                accessed_at REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chart_ids)")}
+        if "accessed_at" not in columns:
+            # Databases written before chart IDs were evicted.
+            self._conn.execute(
+                "ALTER TABLE chart_ids ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS chart_ids_accessed_at"
+            " ON chart_ids (accessed_at)"
+        )
+
+    @staticmethod
+    def _encode_key(key: ChartKey) -> str:
+        return json.dumps(list(key))
+
+    def load(self, key: ChartKey) -> LazyBirthChart | None:
+        """Return the stored chart for ``key``, or None if absent or stale.
+
+        Date-dependent sections (the current and upcoming dashas) are dropped
+        when the row was written on an earlier day, so they get recomputed.
+        """
+        encoded = self._encode_key(key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT computed_on, data FROM charts WHERE key = ? AND version = ?",
+                (encoded, self._version),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE charts SET accessed_at = ? WHERE key = ?",
+                (time.time(), encoded),
+            )
+        computed_on, data = row
+        try:
+            chart: LazyBirthChart = pickle.loads(data)
+        except Exception:
+            return None
+        if computed_on != date.today().isoformat():
+            for section in _DATE_DEPENDENT_SECTIONS:
+                chart._sections.pop(section, None)
+        return chart
+
+    def save(self, key: ChartKey, chart: LazyBirthChart) -> None:
+        """Store ``chart`` under ``key``, evicting old rows if over capacity."""
+        self.save_pickled(key, pickle.dumps(chart, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def save_pickled(self, key: ChartKey, data: bytes) -> None:
+        """Like ``save``, for a chart already pickled."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO charts"
+                    " (key, version, computed_on, accessed_at, data)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        self._encode_key(key),
+                        self._version,
+                        date.today().isoformat(),
+                        time.time(),
+                        data,
+                    ),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def save_chart_id(self, chart_id: str, key: ChartKey) -> None:
+        """Remember that ``chart_id`` stands for the birth details ``key``."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO chart_ids (id, key, accessed_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT (id) DO UPDATE"
+                    " SET accessed_at = excluded.accessed_at",
+                    (chart_id, self._encode_key(key), time.time()),
+                )
+                self._evict_chart_ids()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_chart_key(self, chart_id: str) -> ChartKey | None:
+        """Return the key saved for ``chart_id``, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key FROM chart_ids WHERE id = ?", (chart_id,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE chart_ids SET accessed_at = ? WHERE id = ?",
+                    (time.time(), chart_id),
+                )
+        if row is None:
+            return None
+        year, month, day, hour, minute, second, lat, lon, tz = json.loads(row[0])
+        return (year, month, day, hour, minute, second, lat, lon, tz)
+
+    def _evict(self) -> None:
+        """Delete rows of other versions and the least recently used overflow."""
+        self._conn.execute("DELETE FROM charts WHERE version != ?", (self._version,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM charts").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM charts WHERE key IN"
+                " (SELECT key FROM charts ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+
+    def _evict_chart_ids(self) -> None:
+        """Delete the least recently used chart IDs beyond ``max_entries``."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM chart_ids").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM chart_ids WHERE id IN"
+                " (SELECT id FROM chart_ids ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM charts WHERE version = ?", (self._version,)
+            ).fetchone()
+        return int(count)
+
+    def clear(self) -> None:
+        """Delete every stored chart and chart ID."""
+        with self._lock:
+            self._conn.execute("DELETE FROM charts")
+            self._conn.execute("DELETE FROM chart_ids")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def store_from_env() -> ChartStore | None:
+    """Open the store configured by environment variables, if any.
+
+    JYOTISHGANIT_MCP_CACHE_DB is the database path (unset or empty disables the
+    persistent tier); JYOTISHGANIT_MCP_CACHE_DB_MAX_ENTRIES bounds its size.
+    """
+    path = os.environ.get("JYOTISHGANIT_MCP_CACHE_DB", "").strip()
+    if not path:
+        return None
+    max_entries = int(
+        os.environ.get("JYOTISHGANIT_MCP_CACHE_DB_MAX_ENTRIES", "").strip()
+        or _DEFAULT_MAX_ENTRIES
+    )
+    return ChartStore(os.path.expanduser(path), max_entries=max_entries)
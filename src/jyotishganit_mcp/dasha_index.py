@@ -0,0 +1,162 @@
+"""Interval index over the Vimshottari dasha tree.
+
+jyotishganit builds every mahadasha, antardasha and pratyantardasha of a
+chart as nested dicts, and answering "what is running on this date" means
+scanning them. The index keeps the nine mahadashas with sorted start dates
+and builds a period's sub-periods only when a query reaches it, using the
+same arithmetic as jyotishganit so the dates agree exactly. Queries descend
+by binary search, so they touch only the periods that overlap the requested
+dates. Sub-periods down to pratyantardashas are memoized; deeper levels
+(sookshma and prana) are recomputed on each query.
+"""
+
+from __future__ import annotations
+
+import bisect
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from jyotishganit.core.constants import (
+    HUMAN_LIFE_SPAN_FOR_VIMSHOTTARI,
+    VIMSHOTTARI_ADHIPATI_LIST,
+    VIMSHOTTARI_DASHA_DURATIONS,
+    YEAR_DURATION_DAYS,
+)
+
+LEVELS = (
+    "mahadasha",
+    "antardasha",
+    "pratyantardasha",
+    "sookshmadasha",
+    "pranadasha",
+)
+
+# Deepest level whose sub-periods are kept (as jyotishganit precomputes).
+_MEMOIZED_DEPTH = 2
+
+
+class Period(NamedTuple):
+    """One dasha period; ``lords`` runs from the mahadasha lord down."""
+
+    lords: tuple[str, ...]
+    start: datetime
+    end: datetime
+    days: float
+
+    @property
+    def level(self) -> str:
+        return LEVELS[len(self.lords) - 1]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "level": self.level,
+            "lord": self.lords[-1],
+            "lords": list(self.lords),
+            "start": self.start.isoformat(timespec="seconds"),
+            "end": self.end.isoformat(timespec="seconds"),
+        }
+
+
+def _lords_from(lord: str) -> list[str]:
+    """The nine dasha lords in Vimshottari order, starting at ``lord``."""
+    index = VIMSHOTTARI_ADHIPATI_LIST.index(lord)
+    return VIMSHOTTARI_ADHIPATI_LIST[index:] + VIMSHOTTARI_ADHIPATI_LIST[:index]
+
+
+def _sequence(
+    parent: tuple[str, ...], lords: list[str], start: datetime, days: list[float]
+) -> list[Period]:
+    """Consecutive periods of ``lords`` from ``start``, lasting ``days``."""
+    periods = []
+    for lord, length in zip(lords, days, strict=True):
+        end = start + timedelta(days=length)
+        periods.append(Period((*parent, lord), start, end, length))
+        start = end
+    return periods
+
+
+class DashaIndex:
+    """Vimshottari periods of one chart, searchable by date.
+
+    Built from the mahadasha running at birth and the start of its cycle
+    (``vimshottari.calculate_dasha_start_date``).
+    """
+
+    def __init__(self, lord: str, cycle_start: datetime) -> None:
+        lords = _lords_from(lord)
+        days = [VIMSHOTTARI_DASHA_DURATIONS[x] * YEAR_DURATION_DAYS for x in lords]
+        self.mahadashas = _sequence((), lords, cycle_start, days)
+        self._starts = [p.start for p in self.mahadashas]
+        # Sub-periods and their start dates, by parent lords.
+        self._children: dict[tuple[str, ...], tuple[list[datetime], list[Period]]] = {}
+
+    def _sub_periods(self, parent: Period) -> tuple[list[datetime], list[Period]]:
+        """Start dates and sub-periods of ``parent``, as jyotishganit splits it."""
+        memo = self._children.get(parent.lords)
+        if memo is not None:
+            return memo
+        lords = _lords_from(parent.lords[-1])
+        days = [
+            parent.days
+            * (VIMSHOTTARI_DASHA_DURATIONS[x] / HUMAN_LIFE_SPAN_FOR_VIMSHOTTARI)
+            for x in lords
+        ]
+        periods = _sequence(parent.lords, lords, parent.start, days)
+        result = ([p.start for p in periods], periods)
+        if len(parent.lords) <= _MEMOIZED_DEPTH:
+            self._children[parent.lords] = result
+        return result
+
+    def _level(self, parent: Period | None) -> tuple[list[datetime], list[Period]]:
+        if parent is None:
+            return self._starts, self.mahadashas
+        return self._sub_periods(parent)
+
+    def at(self, moment: datetime, depth: int = 3) -> list[Period]:
+        """Periods running at ``moment``, mahadasha first, ``depth`` levels deep.
+
+        Empty outside the 120-year cycle.
+        """
+        if not self.mahadashas[0].start <= moment < self.mahadashas[-1].end:
+            return []
+        path: list[Period] = []
+        parent = None
+        for _ in range(depth):
+            starts, periods = self._level(parent)
+            # Sub-period ends are summed, so the last may differ from the
+            # parent's end by rounding; it still runs until the parent ends.
+            i = max(bisect.bisect_right(starts, moment) - 1, 0)
+            parent = periods[i]
+            path.append(parent)
+        return path
+
+    def between(
+        self, start: datetime, end: datetime, depth: int = 2, limit: int | None = None
+    ) -> list[Period]:
+        """Periods at level ``depth`` overlapping ``start`` up to ``end``, in order.
+
+        Raises:
+            ValueError: If more than ``limit`` periods overlap.
+        """
+        found: list[Period] = []
+
+        def visit(parent: Period | None, level: int) -> None:
+            starts, periods = self._level(parent)
+            i = max(bisect.bisect_right(starts, start) - 1, 0)
+            for period in periods[i:]:
+                if period.start >= end:
+                    break
+                if period.end <= start:
+                    continue
+                if level == depth:
+                    found.append(period)
+                    if limit is not None and len(found) > limit:
+                        raise ValueError(
+                            f"Too many periods; the limit is {limit}. "
+                            "Narrow the dates or lower the depth."
+                        )
+                else:
+                    visit(period, level + 1)
+
+        visit(None, 1)
+        return found
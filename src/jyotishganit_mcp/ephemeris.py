@@ -0,0 +1,244 @@
+"""Vectorized sidereal positions over many instants.
+
+jyotishganit evaluates Skyfield one instant at a time while building a full
+chart. The functions here evaluate the same quantities (True Chitra Paksha
+ayanamsa, apparent geocentric graha longitudes, mean lunar nodes) for a whole
+Skyfield ``Time`` array at once, so a series of instants costs about as much as
+a single chart.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from jyotishganit.core.astronomical import get_ephemeris, get_timescale
+from jyotishganit.core.constants import NAKSHATRAS, ZODIAC_SIGNS
+from numpy.typing import NDArray
+from skyfield.api import wgs84
+from skyfield.framelib import ecliptic_frame
+from skyfield.nutationlib import iau2000a_radians, mean_obliquity
+from skyfield.timelib import Time
+
+from jyotishganit_mcp.star_cache import get_spica
+
+FloatArray = NDArray[np.float64]
+IntArray = NDArray[np.int64]
+
+# Grahas in jyotishganit's order.
+GRAHAS = (
+    "Sun",
+    "Moon",
+    "Mars",
+    "Mercury",
+    "Jupiter",
+    "Venus",
+    "Saturn",
+    "Rahu",
+    "Ketu",
+)
+
+_EPHEMERIS_BODIES = {
+    "Sun": "sun",
+    "Moon": "moon",
+    "Mars": "mars",
+    "Mercury": "mercury",
+    "Jupiter": "jupiter barycenter",
+    "Venus": "venus",
+    "Saturn": "saturn barycenter",
+}
+
+# Same threshold as jyotishganit's motion type (degrees per day).
+_STATIONARY_THRESHOLD = 1e-3
+# Mean node motion of the linear model in calculate_mean_node_longitude.
+_MEAN_NODE_SPEED = -1934.136261 / 36525.0
+_NAKSHATRA_SPAN = 360.0 / 27.0
+
+
+def utc_times(datetimes: Sequence[datetime], timezone_offset: float = 0.0) -> Time:
+    """Skyfield Time array for local datetimes at ``timezone_offset``.
+
+    Datetimes that carry their own UTC offset are converted with it instead.
+    """
+    offset = timedelta(hours=timezone_offset)
+    utc = [
+        d.astimezone(timezone.utc)
+        if d.tzinfo is not None
+        else (d - offset).replace(tzinfo=timezone.utc)
+        for d in datetimes
+    ]
+    return get_timescale().from_datetimes(utc)
+
+
+def local_datetimes(t: Time, timezone_offset: float = 0.0) -> list[datetime]:
+    """Naive local datetimes at ``timezone_offset``, to the second, of ``t``."""
+    offset = timedelta(hours=timezone_offset, microseconds=500_000)
+    return [
+        (d.replace(tzinfo=None) + offset).replace(microsecond=0)
+        for d in t.utc_datetime()
+    ]
+
+
+def ascendants(
+    t: Time, latitude: float, longitude: float, ayanamsa_deg: FloatArray
+) -> FloatArray:
+    """Sidereal ascendant (degrees) at each instant, as jyotishganit computes it."""
+    location = wgs84.latlon(latitude_degrees=latitude, longitude_degrees=longitude)
+    lst = np.radians((np.asarray(t.gast) + location.longitude.hours) * 15.0)
+    _, delta_epsilon = iau2000a_radians(t)
+    obliquity = np.radians(mean_obliquity(t.tdb) / 3600.0) + delta_epsilon
+    tan_lat = np.tan(location.latitude.radians)
+    y = -np.cos(lst)
+    x = np.sin(lst) * np.cos(obliquity) + tan_lat * np.sin(obliquity)
+    tropical = (np.degrees(np.arctan2(y, x)) + 180.0) % 360.0
+    return np.asarray((tropical - ayanamsa_deg) % 360.0, dtype=np.float64)
+
+
+def ayanamsa(t: Time) -> FloatArray:
+    """True Chitra Paksha ayanamsa (degrees) at each instant of ``t``."""
+    eph = get_ephemeris()
+    pos = eph["earth"].at(t).observe(get_spica()).apparent()
+    _, lon, _ = pos.frame_latlon(ecliptic_frame)
+    return np.asarray((lon.degrees - 180.0) % 360.0, dtype=np.float64)
+
+
+def tropical_longitudes(t: Time, body: str) -> tuple[FloatArray, FloatArray]:
+    """Tropical longitude and its speed (degrees/day) of a graha over ``t``."""
+    if body in ("Rahu", "Ketu"):
+        centuries = (np.asarray(t.tt) - 2451545.0) / 36525.0
+        delta_psi, _ = iau2000a_radians(t)
+        rahu = (125.04452 - 1934.136261 * centuries + np.degrees(delta_psi)) % 360.0
+        lon = rahu if body == "Rahu" else (rahu + 180.0) % 360.0
+        speed = np.full_like(lon, _MEAN_NODE_SPEED)
+        return np.asarray(lon, dtype=np.float64), speed
+    eph = get_ephemeris()
+    pos = eph["earth"].at(t).observe(eph[_EPHEMERIS_BODIES[body]]).apparent()
+    _, lon, _, _, lon_rate, _ = pos.frame_latlon_and_rates(ecliptic_frame)
+    return (
+        np.asarray(lon.degrees, dtype=np.float64),
+        np.asarray(lon_rate.degrees.per_day, dtype=np.float64),
+    )
+
+
+def sidereal_longitudes(
+    t: Time, bodies: Sequence[str], ayanamsa_deg: FloatArray
+) -> dict[str, tuple[FloatArray, FloatArray]]:
+    """Sidereal longitude and speed for each body, given the ayanamsa."""
+    out = {}
+    for body in bodies:
+        lon, speed = tropical_longitudes(t, body)
+        out[body] = ((lon - ayanamsa_deg) % 360.0, speed)
+    return out
+
+
+def motion_types(body: str, speed: FloatArray) -> list[str]:
+    """Direct/retrograde/stationary per instant, as jyotishganit classifies them."""
+    if body in ("Sun", "Moon"):
+        return ["direct"] * len(speed)
+    if body in ("Rahu", "Ketu"):
+        return ["retrograde"] * len(speed)
+    return [
+        "stationary"
+        if abs(s) <= _STATIONARY_THRESHOLD
+        else ("retrograde" if s < 0 else "direct")
+        for s in speed
+    ]
+
+
+def signs(longitude: FloatArray) -> list[str]:
+    """Zodiac sign name of each sidereal longitude."""
+    return [ZODIAC_SIGNS[i] for i in (longitude // 30.0).astype(int) % 12]
+
+
+def nakshatras(longitude: FloatArray) -> tuple[list[str], list[int]]:
+    """Nakshatra name and pada (1-4) of each sidereal longitude."""
+    index = (longitude // _NAKSHATRA_SPAN).astype(int) % 27
+    pada = ((longitude % _NAKSHATRA_SPAN) // (_NAKSHATRA_SPAN / 4)).astype(int) + 1
+    return [NAKSHATRAS[i] for i in index], [int(p) for p in pada]
+
+
+def sample_grid(t0: Time, t1: Time, step_days: float) -> FloatArray:
+    """TT Julian dates every ``step_days`` from ``t0`` to ``t1``, both included."""
+    grid = np.arange(t0.tt, t1.tt + step_days, step_days)
+    grid[-1] = min(grid[-1], t1.tt)
+    return np.asarray(grid, dtype=np.float64)
+
+
+def changes(values: IntArray) -> IntArray:
+    """Indices ``i`` where ``values[i + 1]`` differs from ``values[i]``."""
+    return np.nonzero(values[1:] != values[:-1])[0]
+
+
+def bisect_changes(
+    evaluate: Callable[[Time], dict[str, IntArray]],
+    grid: FloatArray,
+    states: dict[str, IntArray],
+    iterations: int,
+    starts: dict[str, IntArray] | None = None,
+    to_time: Callable[[FloatArray], Time] | None = None,
+) -> dict[str, FloatArray]:
+    """Grid values at which discrete states change, by vectorized bisection.
+
+    ``evaluate`` gives named integer states over a Time array and ``states``
+    are its values on ``grid``, which holds TT Julian dates unless
+    ``to_time`` converts it. Every interval ``grid[i]..grid[i + 1]`` where
+    a state changes (or, per name, only those starting at ``starts``) is
+    halved ``iterations`` times, all intervals in one ``evaluate`` call per
+    step. The result is, per interval, the first value found with a new
+    state.
+    """
+    if starts is None:
+        starts = {name: changes(values) for name, values in states.items()}
+    brackets = {
+        name: (grid[i], grid[i + 1], states[name][i]) for name, i in starts.items()
+    }
+    if to_time is None:
+        to_time = get_timescale().tt_jd
+    if sum(len(i) for i in starts.values()):
+        for _ in range(iterations):
+            mids = np.concatenate([(lo + hi) / 2.0 for lo, hi, _ in brackets.values()])
+            at_mid = evaluate(to_time(mids))
+            offset = 0
+            for name, (lo, hi, state) in brackets.items():
+                mid = mids[offset : offset + len(lo)]
+                same = at_mid[name][offset : offset + len(lo)] == state
+                brackets[name] = (
+                    np.where(same, mid, lo),
+                    np.where(same, hi, mid),
+                    state,
+                )
+                offset += len(lo)
+    return {name: hi for name, (_, hi, _) in brackets.items()}
+
+
+def position_series(
+    datetimes: Sequence[datetime],
+    timezone_offset: float = 0.0,
+    bodies: Sequence[str] = GRAHAS,
+) -> dict[str, object]:
+    """Columnar sidereal positions of ``bodies`` at each local datetime.
+
+    Returns ``{"timestamps": [...], "ayanamsa": [...], "bodies": {name: {
+    "longitude", "sign", "sign_degrees", "nakshatra", "pada", "speed",
+    "motion_type"}}}`` where every leaf is a list aligned with ``timestamps``.
+    """
+    t = utc_times(datetimes, timezone_offset)
+    ayan = ayanamsa(t)
+    columns: dict[str, object] = {}
+    for body, (lon, speed) in sidereal_longitudes(t, bodies, ayan).items():
+        nak, pada = nakshatras(lon)
+        columns[body] = {
+            "longitude": lon.tolist(),
+            "sign": signs(lon),
+            "sign_degrees": (lon % 30.0).tolist(),
+            "nakshatra": nak,
+            "pada": pada,
+            "speed": speed.tolist(),
+            "motion_type": motion_types(body, speed),
+        }
+    return {
+        "timestamps": [d.isoformat() for d in datetimes],
+        "ayanamsa": ayan.tolist(),
+        "bodies": columns,
+    }
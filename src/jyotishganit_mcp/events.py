@@ -0,0 +1,217 @@
+"""Search a time window for transit events of the grahas.
+
+Events are changes of a discrete state: the sidereal sign or nakshatra of a
+graha (ingresses), the sign of its speed (stations), which side of another
+graha it is on (conjunctions) and whether the Moon is waxing or waning
+(syzygies, kept as eclipses when the Sun is close to a lunar node). Every
+state is sampled over the window in one vectorized pass, then each sampling
+interval containing a change is bisected to well under a minute.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+from jyotishganit.core.astronomical import get_timescale
+from jyotishganit.core.constants import NAKSHATRAS, ZODIAC_SIGNS
+from numpy.typing import NDArray
+from skyfield.timelib import Time
+
+from jyotishganit_mcp.ephemeris import (
+    FloatArray,
+    IntArray,
+    ayanamsa,
+    bisect_changes,
+    changes,
+    local_datetimes,
+    sample_grid,
+    sidereal_longitudes,
+    utc_times,
+)
+
+EVENT_TYPES = ("sign_ingress", "nakshatra_ingress", "station", "conjunction", "eclipse")
+
+# Grahas that turn retrograde; the mean nodes always are and the luminaries
+# never are.
+STATIONARY_GRAHAS = ("Mars", "Mercury", "Jupiter", "Venus", "Saturn")
+
+# The Moon moves at most about 4 degrees (a third of a nakshatra) in 6 hours.
+_SAMPLE_DAYS = 0.25
+# Bisection steps taking a sampling interval below two seconds.
+_BISECTIONS = 14
+_NAKSHATRA_SPAN = 360.0 / 27.0
+# Largest distance of the Sun from a lunar node (degrees) at new moon for a
+# solar eclipse and at full moon for an umbral lunar eclipse.
+_SOLAR_ECLIPSE_LIMIT = 18.5
+_LUNAR_ECLIPSE_LIMIT = 12.2
+
+Positions = dict[str, tuple[FloatArray, FloatArray]]
+
+
+def _separation(positions: Positions, a: str, b: str) -> FloatArray:
+    """Longitude of ``a`` minus that of ``b``, in [-180, 180)."""
+    return (positions[a][0] - positions[b][0] + 180.0) % 360.0 - 180.0
+
+
+def _node_distance(positions: Positions) -> FloatArray:
+    """Distance (degrees) of the Sun from the nearer lunar node."""
+    return np.abs((_separation(positions, "Sun", "Rahu") + 90.0) % 180.0 - 90.0)
+
+
+class _Search:
+    """States to sample for the requested events, keyed by ``type:bodies``."""
+
+    def __init__(
+        self,
+        event_types: Sequence[str],
+        bodies: Sequence[str],
+        pairs: Sequence[tuple[str, str]],
+    ) -> None:
+        self.keys: list[str] = []
+        for event in ("sign_ingress", "nakshatra_ingress"):
+            if event in event_types:
+                self.keys += [f"{event}:{body}" for body in bodies]
+        if "station" in event_types:
+            self.keys += [f"station:{b}" for b in bodies if b in STATIONARY_GRAHAS]
+        if "conjunction" in event_types:
+            self.keys += [f"conjunction:{a}:{b}" for a, b in pairs]
+        if "eclipse" in event_types:
+            self.keys.append("eclipse")
+        needed = {body for key in self.keys for body in key.split(":")[1:]}
+        if "eclipse" in self.keys:
+            needed |= {"Sun", "Moon", "Rahu"}
+        self.bodies = sorted(needed)
+
+    def positions(self, t: Time) -> Positions:
+        return sidereal_longitudes(t, self.bodies, ayanamsa(t))
+
+    def states(self, t: Time) -> dict[str, IntArray]:
+        """Integer state of every key at each instant of ``t``."""
+        positions = self.positions(t)
+        out = {}
+        for key in self.keys:
+            event, *bodies = key.split(":")
+            state: NDArray[np.generic]
+            if event == "sign_ingress":
+                state = positions[bodies[0]][0] // 30.0 % 12
+            elif event == "nakshatra_ingress":
+                state = positions[bodies[0]][0] // _NAKSHATRA_SPAN % 27
+            elif event == "station":
+                state = positions[bodies[0]][1] < 0.0
+            elif event == "conjunction":
+                # Quadrant of the separation; 1 <-> 2 crosses zero.
+                state = (_separation(positions, *bodies) + 180.0) // 90.0
+            else:
+                state = _separation(positions, "Moon", "Sun") < 0.0
+            out[key] = np.asarray(state, dtype=np.int64)
+        return out
+
+
+def _describe(
+    key: str, before: int, after: int, positions: Positions, i: int
+) -> dict[str, object] | None:
+    """The event for a state change of ``key``, or None if it is not one."""
+    event, *bodies = key.split(":")
+    if event == "sign_ingress":
+        return {
+            "type": event,
+            "body": bodies[0],
+            "sign": ZODIAC_SIGNS[after],
+            "from": ZODIAC_SIGNS[before],
+            "retrograde": after == (before - 1) % 12,
+        }
+    if event == "nakshatra_ingress":
+        return {
+            "type": event,
+            "body": bodies[0],
+            "nakshatra": NAKSHATRAS[after],
+            "from": NAKSHATRAS[before],
+            "retrograde": after == (before - 1) % 27,
+        }
+    if event == "station":
+        longitude = float(positions[bodies[0]][0][i])
+        return {
+            "type": "station_retrograde" if after else "station_direct",
+            "body": bodies[0],
+            "longitude": longitude,
+            "sign": ZODIAC_SIGNS[int(longitude // 30.0) % 12],
+        }
+    if event == "conjunction":
+        longitude = float(positions[bodies[0]][0][i])
+        return {
+            "type": event,
+            "bodies": bodies,
+            "longitude": longitude,
+            "sign": ZODIAC_SIGNS[int(longitude // 30.0) % 12],
+        }
+    # The Moon reaches the Sun (new moon) or passes opposition (full moon).
+    distance = float(_node_distance(positions)[i])
+    new_moon = bool(before)
+    if distance > (_SOLAR_ECLIPSE_LIMIT if new_moon else _LUNAR_ECLIPSE_LIMIT):
+        return None
+    near_rahu = abs(_separation(positions, "Sun", "Rahu")[i]) < 90.0
+    return {
+        "type": "solar_eclipse" if new_moon else "lunar_eclipse",
+        "node": "Rahu" if near_rahu else "Ketu",
+        "node_distance": distance,
+    }
+
+
+def _is_event(key: str, before: IntArray, after: IntArray) -> IntArray:
+    """Mask of the state changes of ``key`` that are events.
+
+    A conjunction's separation also changes quadrant at quadratures and jumps
+    at opposition; only its zero crossing counts.
+    """
+    if key.startswith("conjunction:"):
+        return np.asarray(
+            (np.minimum(before, after) == 1) & (np.maximum(before, after) == 2)
+        )
+    return np.ones(len(before), dtype=bool)
+
+
+def find_events(
+    start: datetime,
+    end: datetime,
+    timezone_offset: float = 0.0,
+    event_types: Sequence[str] = EVENT_TYPES,
+    bodies: Sequence[str] = (),
+    pairs: Sequence[tuple[str, str]] = (),
+) -> list[dict[str, object]]:
+    """Events of ``event_types`` between local datetimes ``start`` and ``end``.
+
+    Ingresses and stations are searched for ``bodies`` and conjunctions for
+    ``pairs``. Eclipses are new and full moons within the ecliptic limits of
+    a node (possible eclipses, not a full eclipse computation). Each event has
+    ``type`` and ``at`` (local ISO time to the second); events are sorted by
+    time.
+    """
+    ts = get_timescale()
+    search = _Search(event_types, bodies, pairs)
+    t0, t1 = utc_times([start, end], timezone_offset)
+    grid = sample_grid(t0, t1, _SAMPLE_DAYS)
+    on_grid = search.states(ts.tt_jd(grid))
+    starts = {}
+    for key, values in on_grid.items():
+        i = changes(values)
+        starts[key] = i[_is_event(key, values[i], values[i + 1])]
+    found = bisect_changes(search.states, grid, on_grid, _BISECTIONS, starts)
+
+    keys = [key for key in search.keys for _ in starts[key]]
+    jd = np.concatenate([found[key] for key in search.keys] or [np.empty(0)])
+    if not len(jd):
+        return []
+    t = ts.tt_jd(jd)
+    positions = search.positions(t)
+    local = local_datetimes(t, timezone_offset)
+    indices = np.concatenate([starts[key] for key in search.keys])
+    events = []
+    for n, (key, i) in enumerate(zip(keys, indices, strict=True)):
+        values = on_grid[key]
+        event = _describe(key, int(values[i]), int(values[i + 1]), positions, n)
+        if event is not None:
+            events.append({"at": local[n].isoformat(), **event})
+    events.sort(key=lambda e: str(e["at"]))
+    return events
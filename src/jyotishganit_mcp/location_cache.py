@@ -0,0 +1,126 @@
+"""Per-location and per-day caches of jyotishganit's sunrise/sunset searches.
+
+jyotishganit finds sunrises and sunsets by searching five days of Skyfield's
+almanac around the birth date, once for the sunrise_sunset tool, again for the
+hora lord and again for the day/night period of kala bala. The result depends
+only on the place, the local date and the timezone offset, so many charts for
+one city share it. This module caches the observer's sunrise predicate per
+place, and the horizon crossings (and polar culminations) per place and local
+day, in bounded LRU caches.
+
+Importing this module replaces ``_solar_events``, ``_solar_culmination`` and
+``is_birth_daytime`` in ``jyotishganit.core.astronomical``; the public
+``get_sunrise_sunset`` and ``get_day_night_period`` use them.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from datetime import date, datetime, time
+from typing import Any
+
+import jyotishganit.core.astronomical as astronomical
+from jyotishganit.core.models import Person
+from skyfield import almanac
+from skyfield.api import wgs84
+
+_MAX_LOCATIONS = 1024
+_MAX_DAYS = 16384
+
+_original_solar_events = astronomical._solar_events
+_original_solar_culmination = astronomical._solar_culmination
+_original_is_daytime = astronomical.is_birth_daytime
+
+# Horizon crossings of one place and local day: (local hour, 1 rise / 0 set).
+SolarEvents = tuple[tuple[float, int], ...]
+
+
+@functools.lru_cache(maxsize=_MAX_LOCATIONS)
+def sun_is_up(latitude: float, longitude: float) -> Callable[[Any], Any]:
+    """Skyfield's sunrise_sunset predicate (true while the Sun is up) for a place.
+
+    Built once per place around its WGS84 observer location.
+    """
+    return almanac.sunrise_sunset(
+        astronomical.get_ephemeris(), wgs84.latlon(latitude, longitude)
+    )
+
+
+def _day_person(latitude: float, longitude: float, day: date, offset: float) -> Person:
+    """A person standing for every birth at this place on this local day."""
+    return Person(
+        birth_datetime=datetime.combine(day, time(12)),
+        latitude=latitude,
+        longitude=longitude,
+        timezone_offset=offset,
+    )
+
+
+def _day_key(person: Person) -> tuple[float, float, date, float]:
+    return (
+        person.latitude,
+        person.longitude,
+        person.birth_datetime.date(),
+        person.timezone_offset or 0.0,
+    )
+
+
+@functools.lru_cache(maxsize=_MAX_DAYS)
+def solar_events(
+    latitude: float, longitude: float, day: date, offset: float
+) -> SolarEvents:
+    """Sunrises and sunsets around a local day, as hours after its midnight."""
+    person = _day_person(latitude, longitude, day, offset)
+    return tuple(_original_solar_events(person))
+
+
+@functools.lru_cache(maxsize=_MAX_DAYS)
+def solar_culmination(
+    latitude: float, longitude: float, day: date, offset: float, upper: bool
+) -> float:
+    """Local hour of the Sun's upper or lower culmination (polar days only)."""
+    person = _day_person(latitude, longitude, day, offset)
+    return float(_original_solar_culmination(person, upper))
+
+
+def _solar_events(person: Person) -> list[tuple[float, int]]:
+    return list(solar_events(*_day_key(person)))
+
+
+def _solar_culmination(person: Person, upper: bool) -> float:
+    return solar_culmination(*_day_key(person), upper)
+
+
+def is_birth_daytime(person: Person) -> bool:
+    """Whether the Sun is up at birth, as jyotishganit decides it."""
+    utc = astronomical._birth_utc(person)
+    t = astronomical.get_timescale().utc(
+        utc.year, utc.month, utc.day, utc.hour, utc.minute, utc.second
+    )
+    return bool(sun_is_up(person.latitude, person.longitude)(t))
+
+
+def location_cache_stats() -> dict[str, dict[str, int]]:
+    """Hits, misses and size of the location and day caches."""
+    caches = {
+        "sunrise_predicates": sun_is_up,
+        "solar_events": solar_events,
+        "solar_culminations": solar_culmination,
+    }
+    stats = {}
+    for name, cache in caches.items():
+        info = cache.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return stats
+
+
+def clear_location_cache() -> None:
+    """Clear the location and day caches. Used for testing."""
+    for cache in (sun_is_up, solar_events, solar_culmination):
+        cache.cache_clear()
+
+
+astronomical._solar_events = _solar_events
+astronomical._solar_culmination = _solar_culmination
+astronomical.is_birth_daytime = is_birth_daytime
@@ -0,0 +1,246 @@
+"""Ashtakoota (guna milan) compatibility of one birth against many.
+
+The eight kootas depend only on the Moon of each chart: tara, yoni, gana and
+nadi on its nakshatra, varna, vashya, graha maitri and bhakoot on its sign
+(vashya on the half sign). Every koota is tabulated once per groom/bride
+pair of nakshatras (27 x 27) or half signs (24 x 24), so scoring a pool of
+candidates is a few array lookups. Moon longitudes come from cached charts
+when present and otherwise from one vectorized ephemeris pass; no chart is
+built. Dosha cancellations are not applied.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+
+import numpy as np
+from jyotishganit.core.constants import (
+    NAKSHATRAS,
+    PLANETARY_RELATIONS,
+    SIGN_LORDS,
+    ZODIAC_SIGNS,
+)
+
+from jyotishganit_mcp.chart_cache import BirthDetails, peek_birth_chart
+from jyotishganit_mcp.ephemeris import (
+    FloatArray,
+    ayanamsa,
+    sidereal_longitudes,
+    utc_times,
+)
+
+MAX_POINTS = {
+    "varna": 1.0,
+    "vashya": 2.0,
+    "tara": 3.0,
+    "yoni": 4.0,
+    "graha_maitri": 5.0,
+    "gana": 6.0,
+    "bhakoot": 7.0,
+    "nadi": 8.0,
+}
+KOOTAS = tuple(MAX_POINTS)
+
+_NAKSHATRA_SPAN = 360.0 / 27.0
+
+# Varna rank by sign: Brahmin 3, Kshatriya 2, Vaishya 1, Shudra 0.
+_VARNA = (2, 1, 0, 3, 2, 1, 0, 3, 2, 1, 0, 3)
+
+# Vashya group by half sign: quadruped, human, water, wild, insect.
+_QUADRUPED, _HUMAN, _WATER, _WILD, _INSECT = range(5)
+_VASHYA = (
+    *(_QUADRUPED, _QUADRUPED),  # Aries
+    *(_QUADRUPED, _QUADRUPED),  # Taurus
+    *(_HUMAN, _HUMAN),  # Gemini
+    *(_WATER, _WATER),  # Cancer
+    *(_WILD, _WILD),  # Leo
+    *(_HUMAN, _HUMAN),  # Virgo
+    *(_HUMAN, _HUMAN),  # Libra
+    *(_INSECT, _INSECT),  # Scorpio
+    *(_HUMAN, _QUADRUPED),  # Sagittarius
+    *(_QUADRUPED, _WATER),  # Capricorn
+    *(_HUMAN, _HUMAN),  # Aquarius
+    *(_WATER, _WATER),  # Pisces
+)
+_VASHYA_POINTS = (
+    (2.0, 1.0, 1.0, 0.5, 1.0),
+    (1.0, 2.0, 0.5, 0.0, 1.0),
+    (1.0, 0.5, 2.0, 1.0, 1.0),
+    (0.5, 0.0, 1.0, 2.0, 0.0),
+    (1.0, 1.0, 1.0, 0.0, 2.0),
+)
+
+# Yoni animal by nakshatra: horse, elephant, sheep, serpent, dog, cat, rat,
+# cow, buffalo, tiger, deer, monkey, mongoose, lion.
+_YONI = (
+    *(0, 1, 2, 3, 3, 4, 5, 2, 5),
+    *(6, 6, 7, 8, 9, 8, 9, 10, 10),
+    *(4, 11, 12, 11, 13, 0, 13, 7, 1),
+)
+_YONI_POINTS = (
+    (4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1),
+    (2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0),
+    (2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1),
+    (3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2),
+    (2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1),
+    (2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1),
+    (2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2),
+    (1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1),
+    (0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1),
+    (1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1),
+    (3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1),
+    (3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2),
+    (2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2),
+    (1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4),
+)
+
+# Gana by nakshatra: deva 0, manushya 1, rakshasa 2; points by groom, bride.
+_GANA = (
+    *(0, 1, 2, 1, 0, 1, 0, 0, 2),
+    *(2, 1, 1, 0, 2, 0, 2, 0, 2),
+    *(2, 1, 1, 0, 2, 2, 1, 1, 0),
+)
+_GANA_POINTS = ((6.0, 6.0, 1.0), (5.0, 6.0, 0.0), (1.0, 0.0, 6.0))
+
+# Graha maitri points by how each Moon sign lord regards the other.
+_MAITRI_POINTS = {
+    ("friend", "friend"): 5.0,
+    ("friend", "neutral"): 4.0,
+    ("neutral", "neutral"): 3.0,
+    ("enemy", "friend"): 1.0,
+    ("enemy", "neutral"): 0.5,
+    ("enemy", "enemy"): 0.0,
+}
+
+
+def _relation(lord: str, other: str) -> str:
+    relations = PLANETARY_RELATIONS[lord]
+    if other in relations["friends"]:
+        return "friend"
+    if other in relations["enemies"]:
+        return "enemy"
+    return "neutral"
+
+
+def _maitri(groom_sign: int, bride_sign: int) -> float:
+    a = SIGN_LORDS[ZODIAC_SIGNS[groom_sign]]
+    b = SIGN_LORDS[ZODIAC_SIGNS[bride_sign]]
+    if a == b:
+        return 5.0
+    pair = sorted((_relation(a, b), _relation(b, a)))
+    return _MAITRI_POINTS[pair[0], pair[1]]
+
+
+def _good_tara(start: int, to: int) -> bool:
+    """Whether the tara counted from nakshatra ``start`` to ``to`` is good."""
+    return ((to - start) % 27 + 1) % 9 not in (3, 5, 7)
+
+
+def _nakshatra_tables() -> dict[str, FloatArray]:
+    """Tara, yoni, gana and nadi points indexed by groom, bride nakshatra."""
+    tables = {name: np.zeros((27, 27)) for name in ("tara", "yoni", "gana", "nadi")}
+    nadi = [(0, 1, 2, 2, 1, 0)[n % 6] for n in range(27)]
+    for g in range(27):
+        for b in range(27):
+            tables["tara"][g, b] = 1.5 * _good_tara(b, g) + 1.5 * _good_tara(g, b)
+            tables["yoni"][g, b] = _YONI_POINTS[_YONI[g]][_YONI[b]]
+            tables["gana"][g, b] = _GANA_POINTS[_GANA[g]][_GANA[b]]
+            tables["nadi"][g, b] = 8.0 if nadi[g] != nadi[b] else 0.0
+    return tables
+
+
+def _half_sign_tables() -> dict[str, FloatArray]:
+    """Varna, vashya, graha maitri and bhakoot points by groom, bride half sign."""
+    names = ("varna", "vashya", "graha_maitri", "bhakoot")
+    tables = {name: np.zeros((24, 24)) for name in names}
+    for g in range(24):
+        for b in range(24):
+            gs, bs = g // 2, b // 2
+            tables["varna"][g, b] = 1.0 if _VARNA[gs] >= _VARNA[bs] else 0.0
+            tables["vashya"][g, b] = _VASHYA_POINTS[_VASHYA[g]][_VASHYA[b]]
+            tables["graha_maitri"][g, b] = _maitri(gs, bs)
+            distance = (gs - bs) % 12 + 1
+            tables["bhakoot"][g, b] = 0.0 if distance in (2, 5, 6, 8, 9, 12) else 7.0
+    return tables
+
+
+_NAKSHATRA_TABLES = _nakshatra_tables()
+_HALF_SIGN_TABLES = _half_sign_tables()
+
+
+def moon_longitudes(births: Sequence[BirthDetails]) -> FloatArray:
+    """Sidereal Moon longitude of each birth, from the cache where possible."""
+    out = np.empty(len(births))
+    missing = []
+    for i, birth in enumerate(births):
+        chart = peek_birth_chart(
+            birth.birth_date, birth.latitude, birth.longitude, birth.timezone_offset
+        )
+        if chart is None:
+            missing.append(i)
+            continue
+        moon = next(p for p in chart.d1_chart.planets if p.celestial_body == "Moon")
+        out[i] = ZODIAC_SIGNS.index(moon.sign) * 30.0 + moon.sign_degrees
+    if missing:
+        # Each birth has its own offset, so convert to UTC before batching.
+        t = utc_times(
+            [
+                births[i].birth_date - timedelta(hours=births[i].timezone_offset)
+                for i in missing
+            ]
+        )
+        out[missing] = sidereal_longitudes(t, ("Moon",), ayanamsa(t))["Moon"][0]
+    return out
+
+
+def scores(groom_moon: FloatArray, bride_moon: FloatArray) -> dict[str, FloatArray]:
+    """Points of each koota and the ``total`` for aligned groom and bride Moons."""
+    g_nak = (groom_moon // _NAKSHATRA_SPAN).astype(int) % 27
+    b_nak = (bride_moon // _NAKSHATRA_SPAN).astype(int) % 27
+    g_half = (groom_moon // 15.0).astype(int) % 24
+    b_half = (bride_moon // 15.0).astype(int) % 24
+    out = {}
+    for name in KOOTAS:
+        if name in _NAKSHATRA_TABLES:
+            out[name] = _NAKSHATRA_TABLES[name][g_nak, b_nak]
+        else:
+            out[name] = _HALF_SIGN_TABLES[name][g_half, b_half]
+    out["total"] = np.sum([out[name] for name in KOOTAS], axis=0)
+    return out
+
+
+def _moon_summary(longitude: float) -> dict[str, str]:
+    return {
+        "moon_sign": ZODIAC_SIGNS[int(longitude // 30.0) % 12],
+        "moon_nakshatra": NAKSHATRAS[int(longitude // _NAKSHATRA_SPAN) % 27],
+    }
+
+
+def rank_matches(
+    reference: BirthDetails,
+    candidates: Sequence[BirthDetails],
+    reference_is_groom: bool = True,
+    top_k: int = 10,
+) -> dict[str, Any]:
+    """The ``top_k`` candidates by total points, best first (ties in input order).
+
+    Each match has the candidate's ``index`` in ``candidates``, its Moon sign
+    and nakshatra, ``total`` (of 36) and the points of each koota.
+    """
+    moons = moon_longitudes([reference, *candidates])
+    ref = np.full(len(candidates), moons[0])
+    others = moons[1:]
+    points = scores(ref, others) if reference_is_groom else scores(others, ref)
+    order = np.argsort(-points["total"], kind="stable")[:top_k]
+    matches = [
+        {
+            "index": int(i),
+            **_moon_summary(float(others[i])),
+            "total": float(points["total"][i]),
+            "kootas": {name: float(points[name][i]) for name in KOOTAS},
+        }
+        for i in order
+    ]
+    return {"reference": _moon_summary(float(moons[0])), "matches": matches}
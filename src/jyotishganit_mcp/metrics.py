@@ -0,0 +1,67 @@
+"""Small in-process metrics: counters and latency histograms."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Thread-safe histogram of durations in fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    @property
+    def count(self) -> int:
+        """Number of recorded durations."""
+        return sum(self._counts)
+
+    def to_dict(self) -> dict[str, object]:
+        """Count, total seconds and per-bucket counts keyed by upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        bounds = [*self.buckets, math.inf]
+        return {
+            "count": sum(counts),
+            "sum_seconds": total,
+            "buckets": {
+                f"le_{bound:g}": n for bound, n in zip(bounds, counts, strict=True)
+            },
+        }
+
+
+class Counters:
+    """Thread-safe named integer counters."""
+
+    def __init__(self, *names: str) -> None:
+        self._values = dict.fromkeys(names, 0)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, amount: int = 1) -> None:
+        """Increase counter ``name`` by ``amount``."""
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def __getitem__(self, name: str) -> int:
+        return self._values.get(name, 0)
+
+    def to_dict(self) -> dict[str, int]:
+        """Snapshot of all counters."""
+        with self._lock:
+            return dict(self._values)
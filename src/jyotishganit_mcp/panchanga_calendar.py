@@ -0,0 +1,172 @@
+"""Panchanga from the Sun and Moon alone: at one moment, and as calendars.
+
+The five limbs depend only on the Sun and Moon longitudes, the ayanamsa and
+the civil weekday, so none of them needs a chart. For a calendar, the Sun and
+Moon are evaluated over the whole date range at once: limb indices are sampled
+every few hours, each sampling interval where a limb changes is bisected (all
+intervals together) to the second, and sunrises come from a single almanac
+search. Limbs follow jyotishganit's panchanga definitions, so they agree with
+the panchanga of a birth chart.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from jyotishganit.core.astronomical import get_ephemeris, get_timescale
+from jyotishganit.core.constants import (
+    FIXED_KARANAS,
+    MOVABLE_KARANAS,
+    NAKSHATRAS,
+    TITHI_NAMES,
+    VAARA_NAMES,
+    YOGA_NAMES,
+)
+from skyfield import almanac
+from skyfield.timelib import Time
+
+from jyotishganit_mcp.ephemeris import (
+    IntArray,
+    ayanamsa,
+    bisect_changes,
+    changes,
+    local_datetimes,
+    sample_grid,
+    utc_times,
+)
+from jyotishganit_mcp.location_cache import sun_is_up
+
+LIMBS = ("tithi", "nakshatra", "yoga", "karana")
+
+# Nakshatra and yoga width as jyotishganit's panchanga uses it.
+_SEGMENT = 13.3333
+# Karanas last at least about 9 hours, so no limb changes twice per sample.
+_SAMPLE_DAYS = 3.0 / 24.0
+# Bisection steps taking a sampling interval below one second.
+_BISECTIONS = 14
+
+
+def _limb_indices(t: Time) -> dict[str, IntArray]:
+    """Index of each limb at each instant (karana as 6-degree step 0-59)."""
+    eph = get_ephemeris()
+    earth = eph["earth"].at(t)
+    # jyotishganit's panchanga uses ecliptic longitudes of J2000.
+    _, sun, _ = earth.observe(eph["sun"]).apparent().ecliptic_latlon()
+    _, moon, _ = earth.observe(eph["moon"]).apparent().ecliptic_latlon()
+    sun_lon = np.asarray(sun.degrees, dtype=np.float64)
+    moon_lon = np.asarray(moon.degrees, dtype=np.float64)
+    ayan = ayanamsa(t)
+    elongation = (moon_lon - sun_lon) % 360.0
+    sidereal_sun = (sun_lon - ayan) % 360.0
+    sidereal_moon = (moon_lon - ayan) % 360.0
+    return {
+        "tithi": np.minimum(elongation // 12.0, 29).astype(np.int64),
+        "nakshatra": (sidereal_moon // _SEGMENT).astype(np.int64) % 27,
+        "yoga": (((sidereal_sun + sidereal_moon) % 360.0) // _SEGMENT).astype(np.int64)
+        % 27,
+        "karana": (elongation // 6.0).astype(np.int64),
+    }
+
+
+def karana_name(step: int) -> str:
+    """Karana of the 6-degree elongation step 0-59, as jyotishganit names it."""
+    if step in (57, 58, 59, 0):
+        return FIXED_KARANAS[(step or 60) - 57]
+    return MOVABLE_KARANAS[(step % 7 or 7) - 1]
+
+
+def limb_name(limb: str, index: int) -> str:
+    """Name of a limb index from ``_limb_indices``."""
+    if limb == "tithi":
+        return TITHI_NAMES[index]
+    if limb == "nakshatra":
+        return NAKSHATRAS[index]
+    if limb == "yoga":
+        return YOGA_NAMES[index]
+    return karana_name(index)
+
+
+def _vaara(day: date) -> str:
+    # jyotishganit's vaara is the civil weekday (Sunday first).
+    return VAARA_NAMES[(day.weekday() + 1) % 7]
+
+
+def panchanga_at(moment: datetime, timezone_offset: float) -> dict[str, str]:
+    """Tithi, nakshatra, yoga, karana and vaara at a local moment."""
+    indices = _limb_indices(utc_times([moment], timezone_offset))
+    limbs = {limb: limb_name(limb, int(indices[limb][0])) for limb in LIMBS}
+    return {**limbs, "vaara": _vaara(moment.date())}
+
+
+def _sun_events(
+    latitude: float, longitude: float, t0: Time, t1: Time, timezone_offset: float
+) -> dict[date, dict[str, datetime]]:
+    """First local sunrise and sunset of each local date between t0 and t1."""
+    times, states = almanac.find_discrete(t0, t1, sun_is_up(latitude, longitude))
+    events: dict[date, dict[str, datetime]] = {}
+    if len(times) == 0:
+        return events
+    for local, state in zip(
+        local_datetimes(times, timezone_offset), states, strict=True
+    ):
+        kind = "sunrise" if state else "sunset"
+        events.setdefault(local.date(), {}).setdefault(kind, local)
+    return events
+
+
+def panchanga_calendar(
+    first: date,
+    last: date,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+) -> dict[str, object]:
+    """Daily panchanga at sunrise and limb transitions from ``first`` to ``last``.
+
+    Returns ``{"days": [{"date", "vaara", "sunrise", "sunset", "tithi",
+    "nakshatra", "yoga", "karana"}], "transitions": {limb: [{"at", "name"}]}}``
+    with naive local ISO times. Limbs of a day without a sunrise (polar
+    regions) are given at its local midnight.
+    """
+    ts = get_timescale()
+    t0, t1 = utc_times(
+        [
+            datetime.combine(first, datetime.min.time()),
+            datetime.combine(last + timedelta(days=1), datetime.min.time()),
+        ],
+        timezone_offset,
+    )
+
+    events = _sun_events(latitude, longitude, t0, t1, timezone_offset)
+    dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    moments = [
+        events.get(d, {}).get("sunrise", datetime.combine(d, datetime.min.time()))
+        for d in dates
+    ]
+    at_sunrise = _limb_indices(utc_times(moments, timezone_offset))
+    days = []
+    for i, d in enumerate(dates):
+        sun = events.get(d, {})
+        day: dict[str, object] = {
+            "date": d.isoformat(),
+            "vaara": _vaara(d),
+            "sunrise": sun["sunrise"].isoformat() if "sunrise" in sun else None,
+            "sunset": sun["sunset"].isoformat() if "sunset" in sun else None,
+        }
+        for limb in LIMBS:
+            day[limb] = limb_name(limb, int(at_sunrise[limb][i]))
+        days.append(day)
+
+    grid = sample_grid(t0, t1, _SAMPLE_DAYS)
+    on_grid = _limb_indices(ts.tt_jd(grid))
+    found = bisect_changes(_limb_indices, grid, on_grid, _BISECTIONS)
+    transitions = {}
+    for limb, jd in found.items():
+        after = on_grid[limb][changes(on_grid[limb]) + 1]
+        times = local_datetimes(ts.tt_jd(jd), timezone_offset) if len(jd) else []
+        transitions[limb] = [
+            {"at": at.isoformat(), "name": limb_name(limb, int(i))}
+            for at, i in zip(times, after, strict=True)
+        ]
+    return {"days": days, "transitions": transitions}
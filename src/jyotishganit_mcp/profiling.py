@@ -0,0 +1,302 @@
+"""Opt-in per-stage timing of tool calls, with cProfile dumps of the slowest.
+
+When enabled, each tool call records how long it spent in named stages:
+``validate`` (birth details), ``cache_lookup``, ``inflight_wait`` (for another
+request computing the same chart), ``store_load``, ``cache_insert``, ``queue``
+(waiting for a worker), ``compute:<kind>`` (the D1 chart or a section),
+``build`` (the tool's response) and ``encode`` (FastMCP's result conversion),
+plus the whole ``request``. Stages nest: ``build`` includes
+the sections it computes. Each call is logged as one JSON line and added to
+per-tool histograms (see ``profiling_stats``).
+
+With a dump directory, every call also runs under cProfile and the pstats
+files of the slowest calls are kept there. From Python 3.12 a profile covers
+all threads, so it may include other requests running at the same time.
+
+This module imports only the standard library, so the server can import it
+cheaply. When profiling is off, ``stage`` and ``record`` cost one context
+variable lookup.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import heapq
+import itertools
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import TypeVar
+
+from jyotishganit_mcp.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_DEFAULT_DUMP_SLOWEST = 10
+
+_config: ProfilingConfig | None = None
+_config_lock = threading.Lock()
+
+_current: ContextVar[RequestProfile | None] = ContextVar(
+    "jyotishganit_mcp_profile", default=None
+)
+
+# Stage durations per tool: {tool: {stage: histogram}}.
+_stage_times: dict[str, dict[str, Histogram]] = {}
+_stage_times_lock = threading.Lock()
+
+# Min-heap of (seconds, sequence, path) of the dumped profiles.
+_slowest: list[tuple[float, int, Path]] = []
+_slowest_lock = threading.Lock()
+_sequence = itertools.count()
+
+# Before Python 3.12, cProfile only sees the thread that enabled it.
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """Whether to time tool calls, and where to dump the slowest profiles.
+
+    ``dump_dir`` (None disables dumps) keeps the pstats files of the
+    ``dump_slowest`` slowest calls.
+    """
+
+    enabled: bool = False
+    dump_dir: str | None = None
+    dump_slowest: int = _DEFAULT_DUMP_SLOWEST
+
+
+def config_from_env() -> ProfilingConfig:
+    """Read the configuration from environment variables.
+
+    JYOTISHGANIT_MCP_PROFILE enables timing, JYOTISHGANIT_MCP_PROFILE_DIR (which
+    implies it) is where cProfile dumps go and JYOTISHGANIT_MCP_PROFILE_SLOWEST
+    how many of them to keep.
+    """
+    enabled = os.environ.get("JYOTISHGANIT_MCP_PROFILE", "").strip().lower()
+    dump_dir = os.environ.get("JYOTISHGANIT_MCP_PROFILE_DIR", "").strip()
+    slowest = os.environ.get("JYOTISHGANIT_MCP_PROFILE_SLOWEST", "").strip()
+    return ProfilingConfig(
+        enabled=enabled in ("1", "true", "yes", "on") or bool(dump_dir),
+        dump_dir=dump_dir or None,
+        dump_slowest=max(1, int(slowest)) if slowest else _DEFAULT_DUMP_SLOWEST,
+    )
+
+
+def get_profiling_config() -> ProfilingConfig:
+    """Return the configuration, reading it from env on first use."""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = config_from_env()
+        return _config
+
+
+def set_profiling_config(config: ProfilingConfig | None) -> None:
+    """Replace the configuration (None rereads env on next use)."""
+    global _config
+    with _config_lock:
+        _config = config
+
+
+@dataclass
+class RequestProfile:
+    """Stage durations (summed per name) and profilers of one tool call."""
+
+    tool: str
+    stages: dict[str, float] = field(default_factory=dict)
+    profilers: list[cProfile.Profile] = field(default_factory=list)
+    dump: bool = False
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to stage ``name``."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+
+class _Stage:
+    """Context manager adding its duration to a request's stage."""
+
+    def __init__(self, profile: RequestProfile, name: str) -> None:
+        self._profile = profile
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._profile.add(self._name, time.perf_counter() - self._start)
+
+
+def stage(name: str) -> contextlib.AbstractContextManager[None]:
+    """Time the enclosed block as stage ``name`` of the current tool call."""
+    profile = _current.get()
+    if profile is None:
+        return _NO_STAGE
+    return _Stage(profile, name)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add an already measured duration to the current tool call, if any."""
+    profile = _current.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    """Return an enabled profiler, or None if another one is active."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def in_worker(fn: Callable[[], _T]) -> Callable[[], _T]:
+    """Wrap ``fn`` to run in a worker thread for the current tool call.
+
+    The worker records how long ``fn`` waited to start (``queue``) and, where
+    cProfile is per thread, runs it under its own profiler. Run the result in
+    a copy of the caller's context so stages reach the same call.
+    """
+    profile = _current.get()
+    if profile is None:
+        return fn
+    submitted = time.perf_counter()
+
+    def run() -> _T:
+        profile.add("queue", time.perf_counter() - submitted)
+        if not (profile.dump and _PER_THREAD_PROFILERS):
+            return fn()
+        profiler = _start_profiler()
+        try:
+            return fn()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profile.profilers.append(profiler)
+
+    return run
+
+
+@contextlib.contextmanager
+def profile_request(tool: str) -> Iterator[RequestProfile | None]:
+    """Time one call of ``tool`` if profiling is enabled (else yield None).
+
+    On exit the call is logged, added to the per-tool histograms and, if it is
+    among the slowest, its profile is dumped.
+    """
+    config = get_profiling_config()
+    if not config.enabled:
+        yield None
+        return
+    profile = RequestProfile(tool, dump=config.dump_dir is not None)
+    profiler = _start_profiler() if profile.dump else None
+    token = _current.set(profile)
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        seconds = time.perf_counter() - start
+        _current.reset(token)
+        if profiler is not None:
+            profiler.disable()
+            profile.profilers.insert(0, profiler)
+        profile.add("request", seconds)
+        _finish(profile, seconds, config)
+
+
+def _finish(profile: RequestProfile, seconds: float, config: ProfilingConfig) -> None:
+    """Log, aggregate and maybe dump a finished tool call."""
+    logger.info(
+        "%s",
+        json.dumps(
+            {
+                "event": "tool_profile",
+                "tool": profile.tool,
+                "seconds": round(seconds, 6),
+                "stages": {k: round(v, 6) for k, v in profile.stages.items()},
+            }
+        ),
+    )
+    with _stage_times_lock:
+        histograms = _stage_times.setdefault(profile.tool, {})
+        for name in profile.stages:
+            if name not in histograms:
+                histograms[name] = Histogram()
+    for name, value in profile.stages.items():
+        histograms[name].observe(value)
+    if config.dump_dir is not None and profile.profilers:
+        _keep_if_slowest(profile, seconds, Path(config.dump_dir), config.dump_slowest)
+
+
+def _keep_if_slowest(
+    profile: RequestProfile, seconds: float, dump_dir: Path, keep: int
+) -> None:
+    """Dump the call's profile if it is among the ``keep`` slowest so far."""
+    with _slowest_lock:
+        if len(_slowest) >= keep and seconds <= _slowest[0][0]:
+            return
+        sequence = next(_sequence)
+        path = dump_dir / f"{profile.tool}-{seconds * 1e3:.0f}ms-{sequence}.pstats"
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profile.profilers[0])
+        for profiler in profile.profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        heapq.heappush(_slowest, (seconds, sequence, path))
+        while len(_slowest) > keep:
+            _, _, dropped = heapq.heappop(_slowest)
+            dropped.unlink(missing_ok=True)
+
+
+def profiling_stats() -> dict[str, object]:
+    """Per-tool histograms of stage seconds and the dumped slowest profiles."""
+    config = get_profiling_config()
+    with _stage_times_lock:
+        tools = {
+            tool: {name: h.to_dict() for name, h in sorted(histograms.items())}
+            for tool, histograms in sorted(_stage_times.items())
+        }
+    with _slowest_lock:
+        slowest = sorted(_slowest, reverse=True)
+    return {
+        "enabled": config.enabled,
+        "dump_dir": config.dump_dir,
+        "tools": tools,
+        "slowest": [
+            {"seconds": seconds, "path": str(path)} for seconds, _, path in slowest
+        ],
+    }
+
+
+def reset_profiling_stats() -> None:
+    """Forget the aggregated timings and dumped profiles. Used for testing.
+
+    Dumped files are left on disk.
+    """
+    with _stage_times_lock:
+        _stage_times.clear()
+    with _slowest_lock:
+        _slowest.clear()
@@ -0,0 +1,144 @@
+"""Selected subtrees of a birth chart, serialized without the rest of it.
+
+A field path such as ``d1_chart.planets`` or ``dashas.current`` starts at one
+chart section (computing only that section) and walks down model attributes,
+dict keys (snake_case or the camelCase used in the JSON-LD output) or list
+indices. Only the value it ends at is serialized.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from jyotishganit_mcp.chart_cache import DIVISIONAL_CHART_CODES, LazyBirthChart
+
+# Top-level fields, the chart section each one reads, and how to get it.
+_ROOTS: dict[str, tuple[tuple[str, ...], Callable[[LazyBirthChart], Any]]] = {
+    "person": ((), lambda chart: chart.person),
+    "ayanamsa": ((), lambda chart: chart.ayanamsa),
+    "panchanga": (("panchanga",), lambda chart: chart.panchanga),
+    "d1_chart": (("strengths",), lambda chart: chart.strengths),
+    "divisional_charts": (
+        DIVISIONAL_CHART_CODES,
+        lambda chart: chart.divisional_charts,
+    ),
+    "ashtakavarga": (("ashtakavarga",), lambda chart: chart.ashtakavarga),
+    "dashas": (("dashas",), lambda chart: chart.dashas),
+}
+
+FIELD_ROOTS = tuple(_ROOTS)
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def _split(field: str) -> tuple[str, list[str]]:
+    """Root name and remaining path segments; raises ValueError if unknown."""
+    root, *path = field.strip().split(".")
+    root = _snake(root)
+    if root not in _ROOTS or not all(path):
+        raise ValueError(f"Unknown field: {field!r}")
+    if root == "divisional_charts" and path:
+        path[0] = path[0].lower()
+        if path[0] not in DIVISIONAL_CHART_CODES:
+            raise ValueError(f"Unknown field: {field!r}")
+    return root, path
+
+
+def field_sections(fields: Sequence[str]) -> tuple[str, ...]:
+    """Chart sections the given fields read; raises ValueError for unknown ones."""
+    sections: list[str] = []
+    for field in fields:
+        root, path = _split(field)
+        if root == "divisional_charts" and path:
+            sections.append(path[0])
+        else:
+            sections.extend(_ROOTS[root][0])
+    return tuple(dict.fromkeys(sections))
+
+
+def uses_person(fields: Sequence[str]) -> bool:
+    """Whether any field reads the person (whose name varies per request)."""
+    return any(_split(field)[0] == "person" for field in fields)
+
+
+def _step(value: Any, segment: str, field: str) -> Any:
+    """Follow one path segment from ``value``."""
+    if isinstance(value, (list, tuple)):
+        if segment.isdigit() and int(segment) < len(value):
+            return value[int(segment)]
+    elif isinstance(value, dict):
+        for key in (segment, _camel(segment), segment.lower()):
+            if key in value:
+                return value[key]
+    elif hasattr(value, "to_dict") and not segment.startswith("_"):
+        attribute = getattr(value, _snake(segment), None)
+        if attribute is not None and not callable(attribute):
+            return attribute
+        return _step(value.to_dict(), segment, field)
+    raise ValueError(f"Unknown field: {field!r}")
+
+
+def _serialize(value: Any) -> Any:
+    """JSON-ready form of a model object or raw value, as in ``to_dict``."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _serialize(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialize(v) for v in value]
+    if isinstance(value, datetime):
+        # Raw datetimes only occur in dasha periods, which jyotishganit
+        # serializes as dates.
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def select(chart: LazyBirthChart, field: str) -> Any:
+    """Serialized value of one field path; raises ValueError if it is unknown."""
+    root, path = _split(field)
+    if root == "divisional_charts" and path:
+        code, *path = path
+        value: Any = chart.divisional_chart(code)
+    else:
+        value = _ROOTS[root][1](chart)
+    for segment in path:
+        value = _step(value, segment, field)
+    return _serialize(value)
+
+
+def project(chart: LazyBirthChart, fields: Sequence[str]) -> dict[str, Any]:
+    """Map each field path to its serialized value."""
+    return {field: select(chart, field) for field in fields}
+
+
+def strip_json_ld(value: Any) -> Any:
+    """Copy of ``value`` without ``@context``/``@type`` keys."""
+    if isinstance(value, dict):
+        return {
+            key: strip_json_ld(v)
+            for key, v in value.items()
+            if not (isinstance(key, str) and key.startswith("@"))
+        }
+    if isinstance(value, list):
+        return [strip_json_ld(v) for v in value]
+    return value
+
+
+def dumps(value: Any, compact: bool = False) -> str:
+    """JSON text: indented like the full chart, or minified without JSON-LD keys."""
+    if compact:
+        return json.dumps(
+            strip_json_ld(value), ensure_ascii=False, separators=(",", ":")
+        )
+    return json.dumps(value, indent=2, ensure_ascii=False)
@@ -1,28 +1,76 @@
-"""MCP server entry point and tool/resource definitions."""
+"""MCP server entry point and tool/resource definitions.
+
+Importing this module only registers the tools: jyotishganit, Skyfield and
+NumPy are imported on the first computation (or by the start-up warm-up), so
+listing tools stays cheap. Keep heavy imports inside functions.
+"""
 
 from __future__ import annotations
 
-# Use local hip_main.dat when JYOTISHGANIT_HIP_MAIN_DAT is set (before jyotishganit import)
-import jyotishganit_mcp._patch_skyfield  # noqa: E402
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable, Hashable, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from datetime import datetime
-from typing import TYPE_CHECKING
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import ContentBlock
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
-from jyotishganit import get_birth_chart_json_string
-from jyotishganit.core.astronomical import (
-    get_sunrise_sunset as jyotish_sunrise_sunset,
+from jyotishganit_mcp.access_log import get_access_log, set_access_log
+from jyotishganit_mcp.cache_limits import set_cache_limits
+from jyotishganit_mcp.profiling import (
+    profile_request,
+    profiling_stats,
+    set_profiling_config,
+    stage,
 )
-from jyotishganit.core.astronomical import (
-    is_birth_daytime,
+from jyotishganit_mcp.warmup import (
+    charts_file,
+    is_ready,
+    mark_ready,
+    start_warm_up,
+    warmup_enabled,
 )
-from mcp.server.fastmcp import FastMCP
-
-from jyotishganit_mcp.chart_cache import get_birth_chart
+from jyotishganit_mcp.workers import get_worker_pool
 
 if TYPE_CHECKING:
-    from jyotishganit.core.models import VedicBirthChart
+    from jyotishganit_mcp.chart_cache import BirthDetails, LazyBirthChart
+
+_T = TypeVar("_T")
+
+logger = logging.getLogger(__name__)
+
+
+class _ProfiledFastMCP(FastMCP):
+    """FastMCP that times each tool call when profiling is enabled."""
 
-mcp = FastMCP("Jyotishganit", json_response=True)
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Sequence[ContentBlock] | dict[str, Any]:
+        tool = self._tool_manager.get_tool(name)
+        if tool is None:
+            return await super().call_tool(name, arguments)
+        with profile_request(name) as profile:
+            if profile is None:
+                return await super().call_tool(name, arguments)
+            result = await self._tool_manager.call_tool(
+                name, arguments, context=self.get_context()
+            )
+            with stage("encode"):
+                try:
+                    return tool.fn_metadata.convert_result(result)
+                except Exception as e:
+                    raise ToolError(f"Error executing tool {name}: {e}") from e
+
+
+mcp = _ProfiledFastMCP("Jyotishganit", json_response=True)
 
 
 def _birth_datetime(
@@ -56,16 +104,19 @@ def _get_chart(
     timezone_offset: float,
     name: str = "",
     location_name: str = "",
-) -> VedicBirthChart:
+) -> LazyBirthChart:
     """Get cached birth chart from birth details."""
-    birth_date = _birth_datetime(
-        birth_year,
-        birth_month,
-        birth_day,
-        birth_hour,
-        birth_minute,
-        birth_second,
-    )
+    from jyotishganit_mcp.chart_cache import get_birth_chart
+
+    with stage("validate"):
+        birth_date = _birth_datetime(
+            birth_year,
+            birth_month,
+            birth_day,
+            birth_hour,
+            birth_minute,
+            birth_second,
+        )
     return get_birth_chart(
         birth_date=birth_date,
         latitude=latitude,
@@ -76,8 +127,227 @@ def _get_chart(
     )
 
 
+async def _chart_view(
+    view: Callable[[LazyBirthChart], _T],
+    sections: Sequence[str] | None,
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    *,
+    response_key: Hashable | None = None,
+    uncached: Callable[[datetime], _T] | None = None,
+) -> _T:
+    """Build ``view`` of the cached chart without blocking the event loop.
+
+    If the chart is cached and the chart ``sections`` the view reads are
+    already computed, the view is built inline so warm requests never wait
+    behind cold ones. Otherwise (or when ``sections`` is None, for views that
+    always compute) it runs in the worker pool, which may raise
+    ServerBusyError when full.
+
+    ``view`` gets the shared, unnamed cached chart; tools that output the
+    name apply it themselves. With a ``response_key``, the built view is
+    memoized on the cached chart, so repeated calls are a lookup.
+
+    ``uncached``, if given, computes the view from the birth date without a
+    chart; it runs in the worker pool instead of building one when the chart
+    is not cached.
+    """
+    from jyotishganit_mcp.chart_cache import peek_birth_chart
+
+    def build(chart: LazyBirthChart) -> _T:
+        with stage("build"):
+            if response_key is None:
+                return view(chart)
+            return chart.response(response_key, lambda: view(chart))
+
+    with stage("validate"):
+        birth_date = _birth_datetime(
+            birth_year,
+            birth_month,
+            birth_day,
+            birth_hour,
+            birth_minute,
+            birth_second,
+        )
+    with stage("cache_lookup"):
+        chart = peek_birth_chart(birth_date, latitude, longitude, timezone_offset)
+    if chart is not None and (
+        (response_key is not None and chart.has_response(response_key))
+        or (sections is not None and chart.has_sections(sections))
+    ):
+        return build(chart)
+    if chart is not None:
+        cached = chart
+        return await get_worker_pool().run(lambda: build(cached))
+    if uncached is not None:
+        compute = uncached
+        return await get_worker_pool().run(lambda: compute(birth_date))
+    return await get_worker_pool().run(
+        lambda: build(
+            _get_chart(
+                birth_year,
+                birth_month,
+                birth_day,
+                birth_hour,
+                birth_minute,
+                birth_second,
+                latitude,
+                longitude,
+                timezone_offset,
+            )
+        )
+    )
+
+
+def _birth_chart_json(chart: LazyBirthChart) -> str:
+    """Full chart as a JSON-LD string."""
+    from jyotishganit import get_birth_chart_json_string
+
+    return get_birth_chart_json_string(chart.to_birth_chart())
+
+
+def _json_with_name(text: str, name: str, compact: bool) -> str:
+    """Put ``name`` into full-chart JSON built for an unnamed person.
+
+    The person is the first object in the chart, so its name is the first
+    ``"name"`` key in the text.
+    """
+    if not name:
+        return text
+    colon = ":" if compact else ": "
+    named = json.dumps(name, ensure_ascii=False)
+    return text.replace(f'"name"{colon}null', f'"name"{colon}{named}', 1)
+
+
+def _panchanga_view(chart: LazyBirthChart) -> dict[str, str]:
+    """Panchanga limbs for the birth moment."""
+    p = chart.panchanga
+    return {
+        "tithi": p.tithi,
+        "nakshatra": p.nakshatra,
+        "yoga": p.yoga,
+        "karana": p.karana,
+        "vaara": p.vaara,
+    }
+
+
+def _planetary_positions_view(
+    chart: LazyBirthChart,
+) -> list[dict[str, str | int | float]]:
+    """D1 planetary positions."""
+    out = []
+    for planet in chart.d1_chart.planets:
+        out.append(
+            {
+                "celestial_body": planet.celestial_body,
+                "sign": planet.sign,
+                "sign_degrees": planet.sign_degrees,
+                "nakshatra": planet.nakshatra,
+                "pada": planet.pada,
+                "house": planet.house,
+                "motion_type": planet.motion_type,
+                "dignity": planet.dignities.dignity,
+            }
+        )
+    return out
+
+
+def _dashas_view(chart: LazyBirthChart) -> dict[str, object]:
+    """Vimshottari dasha periods."""
+    return chart.dashas.to_dict()
+
+
+def _ashtakavarga_view(chart: LazyBirthChart) -> dict[str, object]:
+    """Sarvashtakavarga and Bhinnashtakavarga."""
+    return chart.ashtakavarga.to_dict()
+
+
+def _shadbala_view(chart: LazyBirthChart) -> list[dict[str, object]]:
+    """Shadbala for each D1 planet."""
+    out = []
+    for planet in chart.strengths.planets:
+        out.append(
+            {
+                "celestial_body": planet.celestial_body,
+                "shadbala": planet.shadbala,
+            }
+        )
+    return out
+
+
+def _ascendant_view(chart: LazyBirthChart) -> dict[str, str | int | float]:
+    """Ascendant sign, degrees, nakshatra and pada."""
+    h1 = chart.d1_chart.houses[0]
+    result: dict[str, str | int | float] = {
+        "sign": h1.sign,
+        "house_number": h1.number,
+    }
+    if h1.sign_degrees is not None:
+        result["sign_degrees"] = h1.sign_degrees
+    if h1.nakshatra is not None:
+        result["nakshatra"] = h1.nakshatra
+    if h1.pada is not None:
+        result["pada"] = h1.pada
+    return result
+
+
+def _houses_summary_view(chart: LazyBirthChart) -> list[dict[str, object]]:
+    """D1 houses with sign, lord and occupants."""
+    out = []
+    for house in chart.d1_chart.houses:
+        occupants = [p.celestial_body for p in house.occupants]
+        out.append(
+            {
+                "number": house.number,
+                "sign": house.sign,
+                "lord": house.lord,
+                "occupants": occupants,
+            }
+        )
+    return out
+
+
+def _planetary_aspects_view(chart: LazyBirthChart) -> list[dict[str, object]]:
+    """Aspects given and received by each D1 planet."""
+    out = []
+    for planet in chart.d1_chart.planets:
+        out.append(
+            {
+                "celestial_body": planet.celestial_body,
+                "aspects_given": planet.aspects.get("gives", []),
+                "aspects_received": planet.aspects.get("receives", []),
+            }
+        )
+    return out
+
+
+def _ayanamsa_view(chart: LazyBirthChart) -> dict[str, str | float]:
+    """Ayanamsa name and value."""
+    return {"name": chart.ayanamsa.name, "value": chart.ayanamsa.value}
+
+
+def _sunrise_sunset_view(chart: LazyBirthChart) -> dict[str, float | bool]:
+    """Sunrise/sunset hours and day_birth flag."""
+    from jyotishganit.core.astronomical import get_sunrise_sunset, is_birth_daytime
+
+    sunrise_hr, sunset_hr = get_sunrise_sunset(chart.person)
+    day_birth = is_birth_daytime(chart.person)
+    return {
+        "sunrise_hours_from_midnight": sunrise_hr,
+        "sunset_hours_from_midnight": sunset_hr,
+        "day_birth": day_birth,
+    }
+
+
 @mcp.tool()
-def calculate_birth_chart(
+async def calculate_birth_chart(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -89,9 +359,48 @@ def calculate_birth_chart(
     timezone_offset: float,
     name: str = "",
     location_name: str = "",
+    fields: list[str] | None = None,
+    compact: bool = False,
 ) -> str:
-    """Compute a full Vedic birth chart and return it as JSON-LD."""
-    chart = _get_chart(
+    """Compute a full Vedic birth chart and return it as JSON-LD.
+
+    fields returns only the given subtrees, as a JSON object keyed by field,
+    computing only the chart sections they read, e.g. ["d1_chart.planets",
+    "dashas.current", "divisional_charts.d9.ascendant"]. Fields start with
+    person, ayanamsa, panchanga, d1_chart, divisional_charts, ashtakavarga or
+    dashas. compact returns minified JSON without @context/@type keys.
+    """
+    view: Callable[[LazyBirthChart], str] = _birth_chart_json
+    sections: tuple[str, ...] | None = None
+    response_key: Hashable | None = ("birth_chart", compact)
+    # The full chart is built once for the unnamed person and the name is
+    # patched into the text; selected fields are shared too unless they
+    # include a named person, which is projected from a view carrying the name.
+    named = False
+    if fields or compact:
+        from jyotishganit_mcp import projection
+
+        if fields:
+            try:
+                sections = projection.field_sections(fields)
+            except ValueError as e:
+                return str(e)
+            response_key = ("birth_chart", compact, tuple(fields))
+            if name and projection.uses_person(fields):
+                response_key, named = None, True
+
+        def view(chart: LazyBirthChart) -> str:
+            if named:
+                chart = chart.with_name(name)
+            try:
+                value = projection.project(chart, fields) if fields else chart.to_dict()
+            except ValueError as e:
+                return str(e)
+            return projection.dumps(value, compact)
+
+    text = await _chart_view(
+        view,
+        sections,
         birth_year,
         birth_month,
         birth_day,
@@ -101,14 +410,13 @@ def calculate_birth_chart(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=response_key,
     )
-    return get_birth_chart_json_string(chart)
+    return text if fields else _json_with_name(text, name, compact)
 
 
 @mcp.tool()
-def get_panchanga(
+async def get_panchanga(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -122,7 +430,17 @@ def get_panchanga(
     location_name: str = "",
 ) -> dict[str, str]:
     """Return Panchanga (tithi, nakshatra, yoga, karana, vaara) for the birth moment."""
-    chart = _get_chart(
+
+    # Without a cached chart, only the Sun and Moon are computed.
+    def from_sun_and_moon(birth_date: datetime) -> dict[str, str]:
+        from jyotishganit_mcp.panchanga_calendar import panchanga_at
+
+        with stage("compute:panchanga"):
+            return panchanga_at(birth_date, timezone_offset)
+
+    return await _chart_view(
+        _panchanga_view,
+        ("panchanga",),
         birth_year,
         birth_month,
         birth_day,
@@ -132,21 +450,13 @@ def get_panchanga(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("panchanga",),
+        uncached=from_sun_and_moon,
     )
-    p = chart.panchanga
-    return {
-        "tithi": p.tithi,
-        "nakshatra": p.nakshatra,
-        "yoga": p.yoga,
-        "karana": p.karana,
-        "vaara": p.vaara,
-    }
 
 
 @mcp.tool()
-def get_planetary_positions(
+async def get_planetary_positions(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -160,7 +470,9 @@ def get_planetary_positions(
     location_name: str = "",
 ) -> list[dict[str, str | int | float]]:
     """Return D1 planetary positions: body, sign, degrees, nakshatra, house, dignity."""
-    chart = _get_chart(
+    return await _chart_view(
+        _planetary_positions_view,
+        (),
         birth_year,
         birth_month,
         birth_day,
@@ -170,28 +482,12 @@ def get_planetary_positions(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("planetary_positions",),
     )
-    out = []
-    for planet in chart.d1_chart.planets:
-        out.append(
-            {
-                "celestial_body": planet.celestial_body,
-                "sign": planet.sign,
-                "sign_degrees": planet.sign_degrees,
-                "nakshatra": planet.nakshatra,
-                "pada": planet.pada,
-                "house": planet.house,
-                "motion_type": planet.motion_type,
-                "dignity": planet.dignities.dignity,
-            }
-        )
-    return out
 
 
 @mcp.tool()
-def get_dashas(
+async def get_dashas(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -205,7 +501,9 @@ def get_dashas(
     location_name: str = "",
 ) -> dict[str, object]:
     """Return Vimshottari dasha periods: current and upcoming mahadashas."""
-    chart = _get_chart(
+    return await _chart_view(
+        _dashas_view,
+        ("dashas",),
         birth_year,
         birth_month,
         birth_day,
@@ -215,14 +513,148 @@ def get_dashas(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("dashas",),
     )
-    return chart.dashas.to_dict()
+
+
+_MAX_DASHA_DEPTH = 5
+_MAX_DASHA_PERIODS = 2000
+
+
+def _dasha_moment(text: str, timezone_offset: float, *, end: bool = False) -> datetime:
+    """Local datetime of an ISO date or datetime; an end date covers its day.
+
+    A datetime with a UTC offset is converted to the chart's local time.
+    """
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is not None:
+        local = timezone(timedelta(hours=timezone_offset))
+        moment = moment.astimezone(local).replace(tzinfo=None)
+    if end and len(text.strip()) == 10:
+        moment += timedelta(days=1)
+    return moment
+
+
+@mcp.tool()
+async def get_dasha_at(
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    date: str,
+    depth: int = 3,
+) -> dict[str, object] | str:
+    """Return the Vimshottari periods running on a date, mahadasha first.
+
+    date is an ISO date or local datetime. depth is how many levels to
+    return: 1 mahadasha, 2 antardasha, 3 pratyantardasha (default), 4
+    sookshmadasha, 5 pranadasha.
+    """
+    if not 1 <= depth <= _MAX_DASHA_DEPTH:
+        return f"depth must be between 1 and {_MAX_DASHA_DEPTH}."
+    try:
+        moment = _dasha_moment(date, timezone_offset)
+    except ValueError as e:
+        return f"Invalid date: {e}"
+
+    def view(chart: LazyBirthChart) -> dict[str, object]:
+        periods = chart.dasha_index.at(moment, depth)
+        return {"date": date, "periods": [p.to_dict() for p in periods]}
+
+    return await _chart_view(
+        view,
+        ("dasha_index",),
+        birth_year,
+        birth_month,
+        birth_day,
+        birth_hour,
+        birth_minute,
+        birth_second,
+        latitude,
+        longitude,
+        timezone_offset,
+    )
+
+
+@mcp.tool()
+async def get_dasha_range(
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    start_date: str,
+    end_date: str,
+    depth: int = 2,
+) -> dict[str, object] | str:
+    """Return the Vimshottari periods of one level overlapping a date range.
+
+    start_date and end_date (inclusive) are ISO dates or local datetimes.
+    depth picks the level: 1 mahadasha, 2 antardasha (default), 3
+    pratyantardasha, 4 sookshmadasha, 5 pranadasha. Each period lists its
+    lords from the mahadasha down.
+    """
+    if not 1 <= depth <= _MAX_DASHA_DEPTH:
+        return f"depth must be between 1 and {_MAX_DASHA_DEPTH}."
+    try:
+        first = _dasha_moment(start_date, timezone_offset)
+        last = _dasha_moment(end_date, timezone_offset, end=True)
+    except ValueError as e:
+        return f"Invalid date: {e}"
+    if last <= first:
+        return "end_date must not be before start_date."
+
+    def view(chart: LazyBirthChart) -> dict[str, object] | str:
+        try:
+            periods = chart.dasha_index.between(
+                first, last, depth, limit=_MAX_DASHA_PERIODS
+            )
+        except ValueError as e:
+            return str(e)
+        return {"periods": [p.to_dict() for p in periods]}
+
+    return await _chart_view(
+        view,
+        ("dasha_index",),
+        birth_year,
+        birth_month,
+        birth_day,
+        birth_hour,
+        birth_minute,
+        birth_second,
+        latitude,
+        longitude,
+        timezone_offset,
+    )
+
+
+_DIVISIONAL_CODES = (
+    "d2",
+    "d3",
+    "d4",
+    "d7",
+    "d9",
+    "d10",
+    "d12",
+    "d16",
+    "d24",
+    "d27",
+    "d30",
+    "d60",
+)
 
 
 @mcp.tool()
-def get_divisional_chart(
+async def get_divisional_chart(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -238,24 +670,20 @@ def get_divisional_chart(
 ) -> dict[str, object] | str:
     """Return a divisional chart (d9 Navamsa, d10 Dasamsa, etc.). chart_code: d2-d60."""
     chart_code_lower = chart_code.strip().lower()
-    valid_codes = (
-        "d2",
-        "d3",
-        "d4",
-        "d7",
-        "d9",
-        "d10",
-        "d12",
-        "d16",
-        "d24",
-        "d27",
-        "d30",
-        "d60",
-    )
-    if chart_code_lower not in valid_codes:
-        valid = ", ".join(valid_codes)
+    if chart_code_lower not in _DIVISIONAL_CODES:
+        valid = ", ".join(_DIVISIONAL_CODES)
         return f"Unknown chart code: {chart_code!r}. Valid codes: {valid}"
-    chart = _get_chart(
+
+    def view(chart: LazyBirthChart) -> dict[str, object] | str:
+        try:
+            divisional = chart.divisional_chart(chart_code_lower)
+        except KeyError:
+            return f"Chart {chart_code_lower} not found."
+        return divisional.to_dict()
+
+    return await _chart_view(
+        view,
+        (chart_code_lower,),
         birth_year,
         birth_month,
         birth_day,
@@ -265,16 +693,12 @@ def get_divisional_chart(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=(chart_code_lower,),
     )
-    if chart_code_lower not in chart.divisional_charts:
-        return f"Chart {chart_code_lower} not found."
-    return chart.divisional_charts[chart_code_lower].to_dict()
 
 
 @mcp.tool()
-def get_ashtakavarga(
+async def get_ashtakavarga(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -288,7 +712,9 @@ def get_ashtakavarga(
     location_name: str = "",
 ) -> dict[str, object]:
     """Return Ashtakavarga: Sarvashtakavarga (SAV) and Bhinnashtakavarga per planet."""
-    chart = _get_chart(
+    return await _chart_view(
+        _ashtakavarga_view,
+        ("ashtakavarga",),
         birth_year,
         birth_month,
         birth_day,
@@ -298,14 +724,12 @@ def get_ashtakavarga(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("ashtakavarga",),
     )
-    return chart.ashtakavarga.to_dict()
 
 
 @mcp.tool()
-def get_shadbala(
+async def get_shadbala(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -319,7 +743,9 @@ def get_shadbala(
     location_name: str = "",
 ) -> list[dict[str, object]]:
     """Return Shadbala (six-fold strength) for each planet in D1 chart."""
-    chart = _get_chart(
+    return await _chart_view(
+        _shadbala_view,
+        ("strengths",),
         birth_year,
         birth_month,
         birth_day,
@@ -329,22 +755,12 @@ def get_shadbala(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("shadbala",),
     )
-    out = []
-    for planet in chart.d1_chart.planets:
-        out.append(
-            {
-                "celestial_body": planet.celestial_body,
-                "shadbala": planet.shadbala,
-            }
-        )
-    return out
 
 
 @mcp.tool()
-def get_ascendant(
+async def get_ascendant(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -358,7 +774,9 @@ def get_ascendant(
     location_name: str = "",
 ) -> dict[str, str | int | float]:
     """Return ascendant (Lagna) sign and degrees for the birth moment."""
-    chart = _get_chart(
+    return await _chart_view(
+        _ascendant_view,
+        (),
         birth_year,
         birth_month,
         birth_day,
@@ -368,25 +786,12 @@ def get_ascendant(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("ascendant",),
     )
-    h1 = chart.d1_chart.houses[0]
-    result: dict[str, str | int | float] = {
-        "sign": h1.sign,
-        "house_number": h1.number,
-    }
-    if h1.sign_degrees is not None:
-        result["sign_degrees"] = h1.sign_degrees
-    if h1.nakshatra is not None:
-        result["nakshatra"] = h1.nakshatra
-    if h1.pada is not None:
-        result["pada"] = h1.pada
-    return result
 
 
 @mcp.tool()
-def get_houses_summary(
+async def get_houses_summary(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -400,7 +805,9 @@ def get_houses_summary(
     location_name: str = "",
 ) -> list[dict[str, object]]:
     """Return D1 houses: sign, lord, occupant planet names for each of 12 houses."""
-    chart = _get_chart(
+    return await _chart_view(
+        _houses_summary_view,
+        (),
         birth_year,
         birth_month,
         birth_day,
@@ -410,25 +817,12 @@ def get_houses_summary(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("houses_summary",),
     )
-    out = []
-    for house in chart.d1_chart.houses:
-        occupants = [p.celestial_body for p in house.occupants]
-        out.append(
-            {
-                "number": house.number,
-                "sign": house.sign,
-                "lord": house.lord,
-                "occupants": occupants,
-            }
-        )
-    return out
 
 
 @mcp.tool()
-def get_planetary_aspects(
+async def get_planetary_aspects(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -442,7 +836,9 @@ def get_planetary_aspects(
     location_name: str = "",
 ) -> list[dict[str, object]]:
     """Return aspects given and received by each planet in D1 chart."""
-    chart = _get_chart(
+    return await _chart_view(
+        _planetary_aspects_view,
+        (),
         birth_year,
         birth_month,
         birth_day,
@@ -452,23 +848,12 @@ def get_planetary_aspects(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("planetary_aspects",),
     )
-    out = []
-    for planet in chart.d1_chart.planets:
-        out.append(
-            {
-                "celestial_body": planet.celestial_body,
-                "aspects_given": planet.aspects.get("gives", []),
-                "aspects_received": planet.aspects.get("receives", []),
-            }
-        )
-    return out
 
 
 @mcp.tool()
-def get_ayanamsa(
+async def get_ayanamsa(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -482,7 +867,9 @@ def get_ayanamsa(
     location_name: str = "",
 ) -> dict[str, str | float]:
     """Return ayanamsa name and value (degrees) used for the chart."""
-    chart = _get_chart(
+    return await _chart_view(
+        _ayanamsa_view,
+        (),
         birth_year,
         birth_month,
         birth_day,
@@ -492,14 +879,12 @@ def get_ayanamsa(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("ayanamsa",),
     )
-    return {"name": chart.ayanamsa.name, "value": chart.ayanamsa.value}
 
 
 @mcp.tool()
-def get_sunrise_sunset(
+async def get_sunrise_sunset(
     birth_year: int,
     birth_month: int,
     birth_day: int,
@@ -513,7 +898,9 @@ def get_sunrise_sunset(
     location_name: str = "",
 ) -> dict[str, float | bool]:
     """Return sunrise/sunset times (hours from midnight, local) and day_birth flag."""
-    chart = _get_chart(
+    return await _chart_view(
+        _sunrise_sunset_view,
+        None,
         birth_year,
         birth_month,
         birth_day,
@@ -523,18 +910,825 @@ def get_sunrise_sunset(
         latitude,
         longitude,
         timezone_offset,
-        name,
-        location_name,
+        response_key=("sunrise_sunset",),
     )
-    sunrise_hr, sunset_hr = jyotish_sunrise_sunset(chart.person)
-    day_birth = is_birth_daytime(chart.person)
-    return {
-        "sunrise_hours_from_midnight": sunrise_hr,
-        "sunset_hours_from_midnight": sunset_hr,
-        "day_birth": day_birth,
-    }
 
 
-def main() -> None:
-    """Run the MCP server over stdio (for CLI entry point)."""
-    mcp.run(transport="stdio")
+# Views available to batch requests, keyed by name. Divisional chart codes
+# (d2-d60) are accepted as view names too.
+_VIEWS: dict[str, Callable[[LazyBirthChart], object]] = {
+    "birth_chart": lambda chart: chart.to_dict(),
+    "panchanga": _panchanga_view,
+    "planetary_positions": _planetary_positions_view,
+    "dashas": _dashas_view,
+    "ashtakavarga": _ashtakavarga_view,
+    "shadbala": _shadbala_view,
+    "ascendant": _ascendant_view,
+    "houses_summary": _houses_summary_view,
+    "planetary_aspects": _planetary_aspects_view,
+    "ayanamsa": _ayanamsa_view,
+    "sunrise_sunset": _sunrise_sunset_view,
+}
+
+# Chart sections each view reads, so they are computed up front in one job.
+# birth_chart reads every section.
+_VIEW_SECTIONS: dict[str, tuple[str, ...]] = {
+    "panchanga": ("panchanga",),
+    "dashas": ("dashas",),
+    "ashtakavarga": ("ashtakavarga",),
+    "shadbala": ("strengths",),
+}
+# Views that search the almanac rather than read chart sections, so they are
+# never built on the event loop.
+_POOL_VIEWS = ("sunrise_sunset",)
+
+
+def _view(chart: LazyBirthChart, view: str) -> object:
+    """Build the named view (or divisional chart) of a chart, memoized on it."""
+    return chart.response((view,), lambda: _build_view(chart, view))
+
+
+def _build_view(chart: LazyBirthChart, view: str) -> object:
+    """Build the named view (or divisional chart) of a chart."""
+    from jyotishganit_mcp.chart_cache import DIVISIONAL_CHART_CODES
+
+    if view in DIVISIONAL_CHART_CODES:
+        return chart.divisional_chart(view).to_dict()
+    return _VIEWS[view](chart)
+
+
+def _check_views(views: Sequence[str], valid_views: Sequence[str]) -> str | None:
+    """Error message if any view name is not valid, else None."""
+    unknown = [v for v in views if v not in valid_views]
+    if not unknown:
+        return None
+    valid = ", ".join(valid_views)
+    return f"Unknown views: {', '.join(unknown)}. Valid views: {valid}"
+
+
+def _single_chart_views() -> list[str]:
+    """Views of get_chart_views: all but the (name-dependent) full chart."""
+    from jyotishganit_mcp.chart_cache import DIVISIONAL_CHART_CODES
+
+    return [*(v for v in _VIEWS if v != "birth_chart"), *DIVISIONAL_CHART_CODES]
+
+
+def _view_sections(views: Sequence[str]) -> list[str]:
+    """Chart sections the named views read (see ``_VIEW_SECTIONS``)."""
+    from jyotishganit_mcp.chart_cache import DIVISIONAL_CHART_CODES, SECTIONS
+
+    sections: set[str] = set()
+    for view in views:
+        if view in DIVISIONAL_CHART_CODES:
+            sections.add(view)
+        elif view == "birth_chart":
+            sections.update(SECTIONS)
+        else:
+            sections.update(_VIEW_SECTIONS.get(view, ()))
+    return sorted(sections)
+
+
+def _inline_sections(views: Sequence[str]) -> list[str] | None:
+    """Sections that let ``views`` be built inline, or None if they never can."""
+    if any(view in _POOL_VIEWS for view in views):
+        return None
+    return _view_sections(views)
+
+
+@mcp.tool()
+async def get_chart_views(
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    views: list[str],
+    name: str = "",
+    location_name: str = "",
+) -> dict[str, object] | str:
+    """Return several views of one birth chart in one call, keyed by view name.
+
+    views: panchanga, planetary_positions, dashas, ashtakavarga, shadbala,
+    ascendant, houses_summary, planetary_aspects, ayanamsa, sunrise_sunset, or
+    a divisional chart code (d2-d60) in place of get_divisional_chart's
+    chart_code. Each view is the same as its single tool returns; use
+    calculate_birth_chart for the full chart.
+    """
+    error = _check_views(views, _single_chart_views())
+    if error:
+        return error
+    return await _chart_view(
+        lambda chart: {view: _view(chart, view) for view in views},
+        _inline_sections(views),
+        birth_year,
+        birth_month,
+        birth_day,
+        birth_hour,
+        birth_minute,
+        birth_second,
+        latitude,
+        longitude,
+        timezone_offset,
+    )
+
+
+@mcp.tool()
+async def create_chart(
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    pin: bool = False,
+) -> dict[str, object] | str:
+    """Compute a birth chart and return its chart_id for get_chart_views_by_id.
+
+    The ID is stable: the same birth details always give the same chart_id.
+    With pin, the chart stays cached (it is not evicted) until release_chart.
+    """
+    from jyotishganit_mcp.chart_cache import chart_key, pin_chart, register_chart_id
+
+    birth_date = _birth_datetime(
+        birth_year, birth_month, birth_day, birth_hour, birth_minute, birth_second
+    )
+    key = chart_key(birth_date, latitude, longitude, timezone_offset)
+
+    def create() -> dict[str, object] | str:
+        _get_chart(
+            birth_year,
+            birth_month,
+            birth_day,
+            birth_hour,
+            birth_minute,
+            birth_second,
+            latitude,
+            longitude,
+            timezone_offset,
+        )
+        # Pin only once the chart exists, so a failed computation holds no pin.
+        if pin:
+            try:
+                pin_chart(key)
+            except ValueError as e:
+                return str(e)
+        return {"chart_id": register_chart_id(key), "pinned": pin}
+
+    return await get_worker_pool().run(create)
+
+
+@mcp.tool()
+async def release_chart(chart_id: str) -> dict[str, object] | str:
+    """Unpin a chart pinned by create_chart, so it can be evicted again."""
+    from jyotishganit_mcp.chart_cache import chart_key_for_id, unpin_chart
+
+    key = await get_worker_pool().run(lambda: chart_key_for_id(chart_id))
+    if key is None:
+        return _unknown_chart_id(chart_id)
+    return {"chart_id": chart_id, "was_pinned": unpin_chart(key)}
+
+
+def _unknown_chart_id(chart_id: str) -> str:
+    return f"Unknown chart_id: {chart_id}. Call create_chart to get one."
+
+
+@mcp.tool()
+async def get_chart_views_by_id(
+    chart_id: str, views: list[str]
+) -> dict[str, object] | str:
+    """Return views of a chart from create_chart, like get_chart_views.
+
+    views: panchanga, planetary_positions, dashas, ashtakavarga, shadbala,
+    ascendant, houses_summary, planetary_aspects, ayanamsa, sunrise_sunset, or
+    a divisional chart code (d2-d60).
+    """
+    from jyotishganit_mcp.chart_cache import get_chart_by_id, peek_chart_by_id
+
+    error = _check_views(views, _single_chart_views())
+    if error:
+        return error
+    sections = _inline_sections(views)
+
+    def build(chart: LazyBirthChart) -> dict[str, object]:
+        with stage("build"):
+            return {view: _view(chart, view) for view in views}
+
+    with stage("cache_lookup"):
+        chart = peek_chart_by_id(chart_id)
+    if chart is not None and sections is not None and chart.has_sections(sections):
+        return build(chart)
+
+    def load() -> dict[str, object] | str:
+        try:
+            found = get_chart_by_id(chart_id)
+        except KeyError:
+            return _unknown_chart_id(chart_id)
+        return build(found)
+
+    return await get_worker_pool().run(load)
+
+
+def _birth_details(record: dict[str, int | float]) -> BirthDetails:
+    """Build BirthDetails from a batch record; raises KeyError/ValueError."""
+    from jyotishganit_mcp.chart_cache import BirthDetails
+
+    return BirthDetails.from_record(record)
+
+
+def _error_message(e: Exception) -> str:
+    """Short per-item error message for batch results."""
+    if isinstance(e, KeyError):
+        return f"Missing field: {e.args[0]}"
+    return str(e) or type(e).__name__
+
+
+_MAX_BATCH_BIRTHS = 1000
+
+
+@mcp.tool()
+async def batch_get_chart_views(
+    births: list[dict[str, int | float]],
+    views: list[str],
+) -> list[dict[str, object]] | str:
+    """Return the requested views for many births in one call, in input order.
+
+    Each birth has the same fields as the other tools (birth_year, birth_month,
+    birth_day, birth_hour, birth_minute, birth_second, latitude, longitude,
+    timezone_offset). views: birth_chart, panchanga, planetary_positions, dashas,
+    ashtakavarga, shadbala, ascendant, houses_summary, planetary_aspects,
+    ayanamsa, sunrise_sunset, or a divisional chart code (d2-d60). Each result
+    maps view names to outputs, or is {"error": message} if that birth failed.
+    At most 1000 births per call.
+    """
+    from jyotishganit_mcp.chart_cache import DIVISIONAL_CHART_CODES, get_birth_charts
+
+    if len(births) > _MAX_BATCH_BIRTHS:
+        return f"Too many births; the limit is {_MAX_BATCH_BIRTHS}."
+    error = _check_views(views, (*_VIEWS, *DIVISIONAL_CHART_CODES))
+    if error:
+        return error
+    sections = _view_sections(views)
+
+    out: list[dict[str, object]] = [{} for _ in births]
+    details: list[BirthDetails] = []
+    indices: list[int] = []
+    for i, record in enumerate(births):
+        try:
+            details.append(_birth_details(record))
+            indices.append(i)
+        except (KeyError, TypeError, ValueError) as e:
+            out[i] = {"error": _error_message(e)}
+
+    def build() -> None:
+        charts = get_birth_charts(details, sections)
+        for i, chart in zip(indices, charts, strict=True):
+            if isinstance(chart, Exception):
+                out[i] = {"error": _error_message(chart)}
+                continue
+            try:
+                with stage("build"):
+                    out[i] = {view: _view(chart, view) for view in views}
+            except Exception as e:
+                out[i] = {"error": _error_message(e)}
+
+    await get_worker_pool().run(build)
+    return out
+
+
+_MAX_SERIES_POINTS = 10_000
+
+
+def _parse_datetimes(
+    start: str, end: str, step_hours: float, timestamps: list[str] | None
+) -> list[datetime]:
+    """Datetimes for a series request; raises ValueError on bad input."""
+    if timestamps:
+        return [datetime.fromisoformat(ts) for ts in timestamps]
+    if not start or not end:
+        raise ValueError("Give start and end, or a list of timestamps.")
+    first, last = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    if (first.tzinfo is None) != (last.tzinfo is None):
+        raise ValueError("start and end must both have a UTC offset, or neither.")
+    if last < first:
+        raise ValueError("end must not be before start.")
+    if step_hours <= 0:
+        raise ValueError("step_hours must be positive.")
+    step = timedelta(hours=step_hours)
+    count = int((last - first) / step) + 1
+    if count > _MAX_SERIES_POINTS:
+        raise ValueError(f"Too many points; the limit is {_MAX_SERIES_POINTS}.")
+    return [first + i * step for i in range(count)]
+
+
+@mcp.tool()
+async def get_position_series(
+    start: str = "",
+    end: str = "",
+    step_hours: float = 24.0,
+    timestamps: list[str] | None = None,
+    timezone_offset: float = 0.0,
+    bodies: list[str] | None = None,
+) -> dict[str, object] | str:
+    """Return sidereal graha positions over time as columnar arrays.
+
+    Give start and end (local ISO datetimes, e.g. 2024-01-01T00:00:00) with
+    step_hours, or an explicit list of timestamps. Datetimes with their own UTC
+    offset (e.g. 2024-01-01T00:00:00+00:00) use it instead of timezone_offset.
+    bodies defaults to all nine grahas. Each body has aligned lists of
+    longitude, sign, sign_degrees, nakshatra, pada, speed (degrees/day) and
+    motion_type.
+    """
+    try:
+        datetimes = _parse_datetimes(start, end, step_hours, timestamps)
+    except ValueError as e:
+        return str(e)
+    if len(datetimes) > _MAX_SERIES_POINTS:
+        return f"Too many points; the limit is {_MAX_SERIES_POINTS}."
+
+    def series() -> dict[str, object] | str:
+        from jyotishganit_mcp.ephemeris import GRAHAS, position_series
+
+        wanted = tuple(bodies) if bodies else GRAHAS
+        unknown = [b for b in wanted if b not in GRAHAS]
+        if unknown:
+            valid = ", ".join(GRAHAS)
+            return f"Unknown bodies: {', '.join(unknown)}. Valid bodies: {valid}"
+        with stage("compute:series"):
+            return position_series(datetimes, timezone_offset, wanted)
+
+    return await get_worker_pool().run(series)
+
+
+_MAX_EVENT_DAYS = 3660
+
+
+@mcp.tool()
+async def find_events(
+    start: str,
+    end: str,
+    event_types: list[str] | None = None,
+    bodies: list[str] | None = None,
+    conjunctions: list[str] | None = None,
+    timezone_offset: float = 0.0,
+) -> dict[str, object] | str:
+    """Find transit events of the grahas between two local datetimes.
+
+    start and end are local ISO datetimes (e.g. 2024-01-01T00:00:00), at most
+    ten years apart. event_types defaults to all of sign_ingress,
+    nakshatra_ingress, station (retrograde/direct), conjunction and eclipse
+    (new and full moons near a lunar node). bodies (default all nine grahas)
+    limits ingresses and stations; conjunctions lists pairs such as
+    "Jupiter-Saturn" (default every pair of bodies). Events are sorted by
+    time, to the second.
+    """
+    try:
+        first, last = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    except ValueError as e:
+        return f"Invalid datetime: {e}"
+    if last <= first:
+        return "end must be after start."
+    if last - first > timedelta(days=_MAX_EVENT_DAYS):
+        return f"Window too long; the limit is {_MAX_EVENT_DAYS} days."
+
+    def search() -> dict[str, object] | str:
+        from jyotishganit_mcp.ephemeris import GRAHAS
+        from jyotishganit_mcp.events import EVENT_TYPES
+        from jyotishganit_mcp.events import find_events as find
+
+        types = tuple(event_types) if event_types else EVENT_TYPES
+        unknown = [e for e in types if e not in EVENT_TYPES]
+        if unknown:
+            valid = ", ".join(EVENT_TYPES)
+            return f"Unknown event types: {', '.join(unknown)}. Valid types: {valid}"
+        wanted = tuple(bodies) if bodies else GRAHAS
+        pairs = []
+        for pair in conjunctions or []:
+            a, _, b = pair.partition("-")
+            if not b or a == b:
+                return f"Invalid conjunction {pair!r}; give two bodies: Jupiter-Saturn."
+            pairs.append((a, b))
+        if not conjunctions:
+            pairs = [
+                (a, b)
+                for n, a in enumerate(wanted)
+                for b in wanted[n + 1 :]
+                if {a, b} != {"Rahu", "Ketu"}
+            ]
+        named = [*wanted, *(body for pair in pairs for body in pair)]
+        unknown = sorted({b for b in named if b not in GRAHAS})
+        if unknown:
+            valid = ", ".join(GRAHAS)
+            return f"Unknown bodies: {', '.join(unknown)}. Valid bodies: {valid}"
+        with stage("compute:events"):
+            events = find(first, last, timezone_offset, types, wanted, pairs)
+        return {"timezone_offset": timezone_offset, "events": events}
+
+    return await get_worker_pool().run(search)
+
+
+_MAX_SWEEP_MINUTES = 720
+
+
+@mcp.tool()
+async def sweep_birth_time(
+    birth_year: int,
+    birth_month: int,
+    birth_day: int,
+    birth_hour: int,
+    birth_minute: int,
+    birth_second: int,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    window_minutes: float = 30.0,
+    charts: list[str] | None = None,
+) -> dict[str, object] | str:
+    """Show how the lagna changes if the birth time is off by up to window_minutes.
+
+    Returns segments (start, end: local times to the second) over which the
+    lagna sign, lagna nakshatra pada, Moon nakshatra (which fixes the first
+    mahadasha) and the lagna of each divisional chart (charts, default d9)
+    stay the same.
+    """
+    codes = [c.strip().lower() for c in charts] if charts else ["d9"]
+    unknown = [c for c in codes if c not in _DIVISIONAL_CODES]
+    if unknown:
+        valid = ", ".join(_DIVISIONAL_CODES)
+        return f"Unknown chart codes: {', '.join(unknown)}. Valid codes: {valid}"
+    if not 0 < window_minutes <= _MAX_SWEEP_MINUTES:
+        return f"window_minutes must be between 0 and {_MAX_SWEEP_MINUTES}."
+    try:
+        birth = _birth_datetime(
+            birth_year,
+            birth_month,
+            birth_day,
+            birth_hour,
+            birth_minute,
+            birth_second,
+        )
+    except ValueError as e:
+        return str(e)
+
+    def sweep() -> dict[str, object]:
+        from jyotishganit_mcp.sweep import sweep_birth_time as sweep_segments
+
+        with stage("compute:sweep"):
+            segments = sweep_segments(
+                birth,
+                timedelta(minutes=window_minutes),
+                latitude,
+                longitude,
+                timezone_offset,
+                codes,
+            )
+        return {"timezone_offset": timezone_offset, "segments": segments}
+
+    return await get_worker_pool().run(sweep)
+
+
+_MAX_CALENDAR_DAYS = 366
+
+
+@mcp.tool()
+async def get_panchanga_calendar(
+    start_date: str,
+    end_date: str,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+) -> dict[str, object] | str:
+    """Return the daily panchanga and exact limb transitions over a date range.
+
+    start_date and end_date are ISO dates (e.g. 2024-01-01), inclusive, at
+    most a year apart. Each day gives vaara, sunrise, sunset and the tithi,
+    nakshatra, yoga and karana at sunrise; transitions lists, per limb, the
+    local time each new one begins. Times are local to timezone_offset.
+    """
+    try:
+        first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError as e:
+        return f"Invalid date: {e}"
+    if last < first:
+        return "end_date must not be before start_date."
+    if (last - first).days + 1 > _MAX_CALENDAR_DAYS:
+        return f"Too many days; the limit is {_MAX_CALENDAR_DAYS}."
+
+    def calendar() -> dict[str, object]:
+        from jyotishganit_mcp.panchanga_calendar import panchanga_calendar
+
+        with stage("compute:calendar"):
+            result = panchanga_calendar(
+                first, last, latitude, longitude, timezone_offset
+            )
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": timezone_offset,
+            **result,
+        }
+
+    return await get_worker_pool().run(calendar)
+
+
+_MAX_MATCH_CANDIDATES = 100_000
+_MATCH_ROLES = ("groom", "bride")
+
+
+@mcp.tool()
+async def match_charts(
+    reference: dict[str, int | float],
+    candidates: list[dict[str, int | float]],
+    reference_role: str = "groom",
+    top_k: int = 10,
+) -> dict[str, object] | str:
+    """Rank candidates by Ashtakoota (guna milan) compatibility with a reference.
+
+    reference and each candidate have the same fields as batch_get_chart_views
+    births. reference_role is groom or bride; candidates take the other role.
+    Returns the reference's Moon sign and nakshatra and the top_k matches,
+    best first: index (in candidates), Moon sign and nakshatra, total (of 36)
+    and the points of each koota. Invalid candidates are listed in errors.
+    """
+    if reference_role not in _MATCH_ROLES:
+        return f"reference_role must be one of: {', '.join(_MATCH_ROLES)}"
+    if top_k < 1:
+        return "top_k must be at least 1."
+    if len(candidates) > _MAX_MATCH_CANDIDATES:
+        return f"Too many candidates; the limit is {_MAX_MATCH_CANDIDATES}."
+    try:
+        ref = _birth_details(reference)
+    except (KeyError, TypeError, ValueError) as e:
+        return f"Invalid reference: {_error_message(e)}"
+    details: list[BirthDetails] = []
+    indices: list[int] = []
+    errors: list[dict[str, object]] = []
+    for i, record in enumerate(candidates):
+        try:
+            details.append(_birth_details(record))
+            indices.append(i)
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append({"index": i, "error": _error_message(e)})
+
+    def match() -> dict[str, object]:
+        from jyotishganit_mcp.matching import rank_matches
+
+        with stage("compute:matching"):
+            result = rank_matches(ref, details, reference_role == "groom", top_k)
+        for m in result["matches"]:
+            m["index"] = indices[m["index"]]
+        return {"reference_role": reference_role, **result, "errors": errors}
+
+    return await get_worker_pool().run(match)
+
+
+@mcp.tool()
+async def cache_stats() -> dict[str, object]:
+    """Return chart cache statistics for capacity tuning.
+
+    Includes entries, approximate_bytes, the configured limits, hits, misses,
+    evictions, expirations and histograms of compute seconds per section.
+    """
+    from jyotishganit_mcp.chart_cache import cache_stats as chart_cache_stats
+
+    return chart_cache_stats()
+
+
+@mcp.resource("jyotishganit://stats/profiling", mime_type="application/json")
+def profiling_resource() -> str:
+    """Per-tool histograms of stage seconds recorded while profiling is enabled.
+
+    Also lists the cProfile dumps kept for the slowest calls, if any.
+    """
+    return json.dumps(profiling_stats(), indent=2)
+
+
+# Command-line options and the environment variables they override. Options
+# are exported to the environment so HTTP worker processes, which import this
+# module afresh, see them too.
+_OPTION_ENV = {
+    "transport": "JYOTISHGANIT_MCP_TRANSPORT",
+    "host": "JYOTISHGANIT_MCP_HOST",
+    "port": "JYOTISHGANIT_MCP_PORT",
+    "http_workers": "JYOTISHGANIT_MCP_HTTP_WORKERS",
+    "cache_size": "JYOTISHGANIT_MCP_CACHE_SIZE",
+    "cache_max_bytes": "JYOTISHGANIT_MCP_CACHE_MAX_BYTES",
+    "cache_ttl": "JYOTISHGANIT_MCP_CACHE_TTL",
+    "coord_decimals": "JYOTISHGANIT_MCP_COORD_DECIMALS",
+    "profile": "JYOTISHGANIT_MCP_PROFILE",
+    "profile_dir": "JYOTISHGANIT_MCP_PROFILE_DIR",
+    "profile_slowest": "JYOTISHGANIT_MCP_PROFILE_SLOWEST",
+    "warm_charts": "JYOTISHGANIT_MCP_WARM_CHARTS",
+    "access_log": "JYOTISHGANIT_MCP_ACCESS_LOG",
+}
+
+_TRANSPORTS = ("stdio", "streamable-http", "sse")
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    """Parse command-line options; they override the environment."""
+    parser = argparse.ArgumentParser(
+        prog="jyotishganit-mcp",
+        description="MCP server for jyotishganit Vedic astrology calculations.",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=_TRANSPORTS,
+        help="MCP transport (env JYOTISHGANIT_MCP_TRANSPORT; default stdio)",
+    )
+    parser.add_argument(
+        "--host",
+        help="HTTP address to listen on (env JYOTISHGANIT_MCP_HOST; default 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="HTTP port (env JYOTISHGANIT_MCP_PORT; default 8000)",
+    )
+    parser.add_argument(
+        "--http-workers",
+        type=int,
+        help="server processes sharing the port, streamable-http only "
+        "(env JYOTISHGANIT_MCP_HTTP_WORKERS; default 1)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="maximum cached charts (env JYOTISHGANIT_MCP_CACHE_SIZE; 0: no limit)",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        help="approximate cache size bound in bytes "
+        "(env JYOTISHGANIT_MCP_CACHE_MAX_BYTES; 0: no limit)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="seconds a chart stays cached (env JYOTISHGANIT_MCP_CACHE_TTL; "
+        "0: forever)",
+    )
+    parser.add_argument(
+        "--coord-decimals",
+        type=int,
+        help="decimal places coordinates are rounded to before computing, so "
+        "nearby requests share a chart (env JYOTISHGANIT_MCP_COORD_DECIMALS; "
+        "default 4)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_const",
+        const="1",
+        help="log per-stage timings of each tool call (env JYOTISHGANIT_MCP_PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="keep cProfile dumps of the slowest calls here, implies --profile "
+        "(env JYOTISHGANIT_MCP_PROFILE_DIR)",
+    )
+    parser.add_argument(
+        "--profile-slowest",
+        type=int,
+        help="number of slowest calls to keep dumps of "
+        "(env JYOTISHGANIT_MCP_PROFILE_SLOWEST; default 10)",
+    )
+    parser.add_argument(
+        "--warm-charts",
+        help="JSON Lines file of births (or an --access-log file) whose charts "
+        "are computed into the cache after start-up "
+        "(env JYOTISHGANIT_MCP_WARM_CHARTS)",
+    )
+    parser.add_argument(
+        "--access-log",
+        help="file the most requested charts are written to, for --warm-charts "
+        "on the next start (env JYOTISHGANIT_MCP_ACCESS_LOG)",
+    )
+    return parser.parse_args(argv)
+
+
+def _export_options(args: argparse.Namespace) -> None:
+    """Put the given command-line options into the environment."""
+    for option, variable in _OPTION_ENV.items():
+        value = getattr(args, option)
+        if value is not None:
+            os.environ[variable] = str(value)
+    # Reread the cache, profiling and access log settings from the updated
+    # environment.
+    set_cache_limits(None)
+    set_profiling_config(None)
+    set_access_log(None)
+
+
+def _http_workers() -> int:
+    """HTTP worker process count from JYOTISHGANIT_MCP_HTTP_WORKERS (default 1)."""
+    workers = os.environ.get("JYOTISHGANIT_MCP_HTTP_WORKERS", "").strip()
+    return max(1, int(workers)) if workers else 1
+
+
+def _configure_http() -> None:
+    """Apply the HTTP environment settings to the server.
+
+    With several workers the streamable-HTTP transport is made stateless, since
+    consecutive requests of a client may reach different worker processes.
+    """
+    host = os.environ.get("JYOTISHGANIT_MCP_HOST", "").strip() or "127.0.0.1"
+    port = os.environ.get("JYOTISHGANIT_MCP_PORT", "").strip()
+    mcp.settings.host = host
+    mcp.settings.port = int(port) if port else 8000
+    if host not in _LOOPBACK_HOSTS:
+        # As FastMCP does for non-loopback hosts: no DNS rebinding protection,
+        # whose allowed Host headers are loopback-only.
+        mcp.settings.transport_security = None
+    if _http_workers() > 1:
+        mcp.settings.stateless_http = True
+
+
+def _start_up() -> None:
+    """Warm up in the background unless JYOTISHGANIT_MCP_WARMUP is 0.
+
+    The warm-up also computes the charts of JYOTISHGANIT_MCP_WARM_CHARTS, and
+    the access log (JYOTISHGANIT_MCP_ACCESS_LOG), if set, starts being written.
+    """
+    log = get_access_log()
+    if log is not None:
+        log.start_writer()
+    if warmup_enabled():
+        start_warm_up(charts_file())
+    else:
+        mark_ready()
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> Response:
+    """Liveness probe: 200 while the process serves HTTP, with readiness."""
+    return JSONResponse({"status": "ok", "ready": is_ready(), "pid": os.getpid()})
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> Response:
+    """Readiness probe: 200 once start-up warm-up has finished, else 503."""
+    if is_ready():
+        return JSONResponse({"status": "ready"})
+    return JSONResponse({"status": "warming_up"}, status_code=503)
+
+
+def http_app() -> Starlette:
+    """Streamable-HTTP ASGI app, configured from the environment.
+
+    Used as the uvicorn app factory of each worker process in multi-worker
+    mode; every worker warms up its own ephemeris and reports ready after.
+    """
+    _configure_http()
+    _start_up()
+    return mcp.streamable_http_app()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the MCP server (for CLI entry point).
+
+    Serves stdio by default, or streamable HTTP or SSE on the configured host
+    and port. With several HTTP workers, uvicorn runs that many streamable-HTTP
+    processes on one socket; they share charts only through the persistent
+    chart cache (JYOTISHGANIT_MCP_CACHE_DB).
+
+    Unless JYOTISHGANIT_MCP_WARMUP is 0, astronomical data is loaded in the
+    background while the server starts, so the first tool call is fast.
+    """
+    args = _parse_args(argv)
+    _export_options(args)
+    transport = os.environ.get("JYOTISHGANIT_MCP_TRANSPORT", "").strip() or "stdio"
+    if transport not in _TRANSPORTS:
+        sys.exit(f"Unknown transport: {transport!r}. Valid: {', '.join(_TRANSPORTS)}")
+    workers = _http_workers()
+    if workers == 1:
+        if transport != "stdio":
+            _configure_http()
+        _start_up()
+        mcp.run(transport=transport)  # type: ignore[arg-type]
+        return
+    if transport != "streamable-http":
+        sys.exit("Several HTTP workers need the streamable-http transport.")
+    if not os.environ.get("JYOTISHGANIT_MCP_CACHE_DB", "").strip():
+        logger.warning(
+            "Each of the %d workers caches charts separately; set "
+            "JYOTISHGANIT_MCP_CACHE_DB to share computed charts between them.",
+            workers,
+        )
+    import uvicorn
+
+    _configure_http()
+    uvicorn.run(
+        "jyotishganit_mcp.server:http_app",
+        factory=True,
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        workers=workers,
+        log_level=mcp.settings.log_level.lower(),
+    )
@@ -0,0 +1,100 @@
+"""Compact on-disk cache of the Hipparcos row jyotishganit needs.
+
+jyotishganit's ayanamsa only uses Spica (HIP 65474), but finding it means
+parsing the whole ~50 MB hip_main.dat into a DataFrame. The first time Spica is
+needed, its astrometric fields are saved to a small ``.npy`` file (by default
+``spica.npy`` next to the ephemeris, or JYOTISHGANIT_MCP_STAR_CACHE), and later
+processes build the star from that file instead.
+
+Importing this module replaces ``jyotishganit.core.astronomical._get_spica``.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import tempfile
+from pathlib import Path
+
+import jyotishganit.core.astronomical as astronomical
+import numpy as np
+from numpy.typing import NDArray
+from skyfield.api import Star, load
+from skyfield.data import hipparcos
+
+# Use local hip_main.dat when JYOTISHGANIT_HIP_MAIN_DAT is set
+import jyotishganit_mcp._patch_skyfield  # noqa: F401
+
+SPICA_HIP = 65474
+_FIELDS = (
+    "ra_hours",
+    "dec_degrees",
+    "ra_mas_per_year",
+    "dec_mas_per_year",
+    "parallax_mas",
+    "epoch_year",
+)
+
+
+def star_cache_path() -> Path:
+    """Path of the compact Spica cache file."""
+    path = os.environ.get("JYOTISHGANIT_MCP_STAR_CACHE", "").strip()
+    if path:
+        return Path(path).expanduser()
+    return Path(astronomical.loader.directory) / "spica.npy"
+
+
+def _parse_catalog_row() -> NDArray[np.float64]:
+    """Spica's fields, parsed from the full Hipparcos catalog."""
+    with load.open(hipparcos.URL) as f:
+        df = hipparcos.load_dataframe(f)
+    row = df.loc[SPICA_HIP]
+    return np.array([row[field] for field in _FIELDS], dtype=np.float64)
+
+
+def _write_atomic(path: Path, row: NDArray[np.float64]) -> None:
+    """Save ``row`` to ``path`` so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npy")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, row)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_spica_row() -> NDArray[np.float64]:
+    """Spica's astrometric fields, from the compact cache when present."""
+    path = star_cache_path()
+    try:
+        row = np.load(path)
+        if row.shape == (len(_FIELDS),):
+            return np.asarray(row, dtype=np.float64)
+    except (OSError, ValueError):
+        pass
+    row = _parse_catalog_row()
+    try:
+        _write_atomic(path, row)
+    except OSError:
+        pass
+    return row
+
+
+@functools.cache
+def get_spica() -> Star:
+    """Spica as jyotishganit builds it, without re-parsing the catalog."""
+    fields = dict(zip(_FIELDS, load_spica_row().tolist(), strict=True))
+    return Star(
+        ra_hours=fields["ra_hours"],
+        dec_degrees=fields["dec_degrees"],
+        ra_mas_per_year=fields["ra_mas_per_year"],
+        dec_mas_per_year=fields["dec_mas_per_year"],
+        parallax_mas=fields["parallax_mas"],
+        epoch=1721045.0 + fields["epoch_year"] * 365.25,
+    )
+
+
+astronomical._get_spica = get_spica
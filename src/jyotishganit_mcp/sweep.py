@@ -0,0 +1,134 @@
+"""Birth-time sweeps: how lagna-dependent values change across a time window.
+
+For an uncertain birth time, the lagna sign, lagna nakshatra pada,
+divisional-chart lagnas and the Moon's nakshatra (which fixes the first
+mahadasha) are evaluated from the ascendant alone, vectorized over the window
+every few seconds, and each change is bisected to the whole second. Births
+are timed to the second, so every second inside a segment gives the same
+value as a chart built for it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+import numpy as np
+from jyotishganit.components.divisional_charts import (
+    compute_divisional_position_for_type,
+)
+from jyotishganit.core.astronomical import get_timescale
+from jyotishganit.core.constants import NAKSHATRAS, ZODIAC_SIGNS
+from skyfield.timelib import Time
+
+from jyotishganit_mcp.ephemeris import (
+    FloatArray,
+    IntArray,
+    ascendants,
+    ayanamsa,
+    bisect_changes,
+    changes,
+    tropical_longitudes,
+)
+
+# Seconds between samples; a power of two so bisection lands on whole seconds.
+# The fastest lagna (D60 near the poles) holds for more than half a minute.
+_SAMPLE_SECONDS = 16
+_BISECTIONS = 6
+
+_NAKSHATRA_SPAN = 360 / 27
+_PADA_SPAN = _NAKSHATRA_SPAN / 4
+
+
+def _divisional_sign(longitude: float, chart: str) -> int:
+    """Index of the sign a D1 longitude falls in in a divisional chart."""
+    sign = compute_divisional_position_for_type(
+        ZODIAC_SIGNS[int(longitude // 30)], longitude % 30, chart.upper()
+    )
+    return ZODIAC_SIGNS.index(sign)
+
+
+class _Sweep:
+    """Lagna states at whole seconds after ``start`` (UTC)."""
+
+    def __init__(
+        self, start: datetime, latitude: float, longitude: float, charts: Sequence[str]
+    ) -> None:
+        self.start = start
+        self.latitude = latitude
+        self.longitude = longitude
+        self.charts = tuple(charts)
+
+    def times(self, seconds: FloatArray) -> Time:
+        s = self.start
+        return get_timescale().utc(
+            s.year, s.month, s.day, s.hour, s.minute, s.second + np.floor(seconds)
+        )
+
+    def states(self, t: Time) -> dict[str, IntArray]:
+        ayan = ayanamsa(t)
+        lagna = ascendants(t, self.latitude, self.longitude, ayan)
+        moon = (tropical_longitudes(t, "Moon")[0] - ayan) % 360.0
+        out = {
+            "lagna_sign": (lagna // 30.0).astype(np.int64),
+            "lagna_pada": (
+                (lagna / _NAKSHATRA_SPAN).astype(np.int64) * 4
+                + ((lagna % _NAKSHATRA_SPAN) / _PADA_SPAN).astype(np.int64)
+            ),
+            "moon_nakshatra": (moon / _NAKSHATRA_SPAN).astype(np.int64),
+        }
+        for chart in self.charts:
+            out[f"{chart}_lagna"] = np.array(
+                [_divisional_sign(float(x), chart) for x in lagna], dtype=np.int64
+            )
+        return out
+
+
+def _describe(name: str, value: int) -> dict[str, object]:
+    if name == "lagna_pada":
+        return {"nakshatra": NAKSHATRAS[value // 4], "pada": value % 4 + 1}
+    if name == "moon_nakshatra":
+        return {"nakshatra": NAKSHATRAS[value]}
+    return {"sign": ZODIAC_SIGNS[value]}
+
+
+def sweep_birth_time(
+    birth: datetime,
+    window: timedelta,
+    latitude: float,
+    longitude: float,
+    timezone_offset: float,
+    charts: Sequence[str] = ("d9",),
+) -> dict[str, list[dict[str, object]]]:
+    """Segments of constant lagna values for births within ``window`` of ``birth``.
+
+    Returns ``{name: [{"start", "end", ...value}]}`` for lagna_sign,
+    lagna_pada, moon_nakshatra and ``<chart>_lagna`` of each divisional chart,
+    with local ISO times to the second; ``end`` is the last second of the
+    segment. ``window`` is rounded to whole seconds (at least one).
+    """
+    window = timedelta(seconds=max(1, round(window.total_seconds())))
+    first = birth.replace(microsecond=0) - window
+    span = int(2 * window.total_seconds())
+    sweep = _Sweep(
+        first - timedelta(hours=timezone_offset), latitude, longitude, charts
+    )
+    grid = np.append(np.arange(0, span, _SAMPLE_SECONDS), span).astype(np.float64)
+    on_grid = sweep.states(sweep.times(grid))
+    found = bisect_changes(
+        sweep.states, grid, on_grid, _BISECTIONS, to_time=sweep.times
+    )
+    segments = {}
+    for name, values in on_grid.items():
+        starts = [0, *np.floor(found[name]).astype(int).tolist()]
+        ends = [s - 1 for s in starts[1:]] + [span]
+        held = [values[0], *values[changes(values) + 1].tolist()]
+        segments[name] = [
+            {
+                "start": (first + timedelta(seconds=s)).isoformat(),
+                "end": (first + timedelta(seconds=e)).isoformat(),
+                **_describe(name, int(value)),
+            }
+            for s, e, value in zip(starts, ends, held, strict=True)
+        ]
+    return segments
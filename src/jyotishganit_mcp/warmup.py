@@ -0,0 +1,173 @@
+"""Start-up warm-up so the first tool call does not pay for data loading.
+
+Importing the scientific stack, loading the timescale and ephemeris, finding
+Spica and running the chart code paths once take seconds on a cold process.
+``warm_up`` does all of it up front and logs how long each stage took. After
+that, ``warm_charts`` can precompute the charts of a chart file (such as the
+server's own access log, see ``access_log``) into the chart cache, so popular
+charts are hits right after a restart. This module itself imports nothing
+heavy, so the server can import it cheaply.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Charts computed per get_birth_charts call, between progress messages.
+_WARM_BATCH = 64
+
+# Set once start-up warm-up has finished, failed or been skipped.
+_ready = threading.Event()
+
+
+def _import_modules() -> None:
+    """Import the chart and series modules (and so jyotishganit and Skyfield)."""
+    import jyotishganit_mcp.chart_cache  # noqa: F401
+    import jyotishganit_mcp.ephemeris  # noqa: F401
+
+
+def _load_ephemeris() -> None:
+    from jyotishganit.core.astronomical import get_ephemeris
+
+    get_ephemeris()
+
+
+def _load_spica() -> None:
+    from jyotishganit_mcp.star_cache import get_spica
+
+    get_spica()
+
+
+def _d1_chart() -> None:
+    """An uncached D1 chart, to run the chart code paths once."""
+    from jyotishganit.core.models import Person
+
+    from jyotishganit_mcp.chart_cache import LazyBirthChart
+
+    person = Person(
+        birth_datetime=datetime(2000, 1, 1, 12),
+        latitude=0.0,
+        longitude=0.0,
+        timezone_offset=0.0,
+    )
+    LazyBirthChart(person)
+
+
+_STAGES: tuple[tuple[str, Callable[[], None]], ...] = (
+    ("imports", _import_modules),
+    ("ephemeris", _load_ephemeris),
+    ("spica", _load_spica),
+    ("chart", _d1_chart),
+)
+
+
+def warm_up() -> dict[str, float]:
+    """Import, load astronomical data and run one D1 chart; return seconds per stage."""
+    timings = {}
+    for stage, load in _STAGES:
+        start = time.perf_counter()
+        load()
+        timings[stage] = time.perf_counter() - start
+        logger.info("Warm-up: %s loaded in %.3fs", stage, timings[stage])
+    logger.info("Warm-up finished in %.3fs", sum(timings.values()))
+    return timings
+
+
+def warm_charts(path: str) -> int:
+    """Compute the charts listed in a chart file into the cache; return how many.
+
+    Hottest charts come first and no more are computed than the cache holds.
+    Misses are computed in the batch worker processes (see
+    ``chart_cache.get_birth_charts``); invalid lines are logged and skipped.
+    """
+    from jyotishganit_mcp.access_log import read_chart_file
+    from jyotishganit_mcp.cache_limits import get_cache_limits
+    from jyotishganit_mcp.chart_cache import BirthDetails, get_birth_charts
+
+    start = time.perf_counter()
+    births = []
+    for record in read_chart_file(path):
+        try:
+            births.append(BirthDetails.from_record(record))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Chart warm-up: skipped %s: %r", record, e)
+    limit = get_cache_limits().max_entries
+    if limit and len(births) > limit:
+        births = births[:limit]
+    warmed = 0
+    for i in range(0, len(births), _WARM_BATCH):
+        results = get_birth_charts(births[i : i + _WARM_BATCH], record_access=False)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Chart warm-up: a chart failed: %r", result)
+            else:
+                warmed += 1
+        logger.info(
+            "Chart warm-up: %d/%d charts in %.3fs",
+            i + len(results),
+            len(births),
+            time.perf_counter() - start,
+        )
+    logger.info(
+        "Chart warm-up finished: %d charts from %s in %.3fs",
+        warmed,
+        path,
+        time.perf_counter() - start,
+    )
+    return warmed
+
+
+def charts_file() -> str | None:
+    """Chart file to warm the cache from (JYOTISHGANIT_MCP_WARM_CHARTS), if any."""
+    path = os.environ.get("JYOTISHGANIT_MCP_WARM_CHARTS", "").strip()
+    return os.path.expanduser(path) if path else None
+
+
+def warmup_enabled() -> bool:
+    """Whether to warm up at start-up (JYOTISHGANIT_MCP_WARMUP, default on)."""
+    value = os.environ.get("JYOTISHGANIT_MCP_WARMUP", "").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+def is_ready() -> bool:
+    """Whether start-up warm-up has finished (or failed, or was skipped)."""
+    return _ready.is_set()
+
+
+def mark_ready() -> None:
+    """Report the process as ready without warming up."""
+    _ready.set()
+
+
+def start_warm_up(charts: str | None = None) -> threading.Thread:
+    """Run ``warm_up`` in a background thread so start-up is not delayed.
+
+    ``is_ready`` turns true when it ends; if it fails, data loads on first use.
+    Then the charts of the chart file ``charts``, if given, are computed
+    (see ``warm_charts``) while the server already serves requests.
+    """
+
+    def run() -> None:
+        try:
+            warm_up()
+        except Exception:
+            logger.exception("Warm-up failed; data will load on first use")
+        finally:
+            _ready.set()
+        if charts is None:
+            return
+        try:
+            warm_charts(charts)
+        except Exception:
+            logger.exception("Chart warm-up from %s failed", charts)
+
+    thread = threading.Thread(target=run, name="jyotishganit-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,109 @@
+"""Bounded worker pool that keeps chart computation off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from jyotishganit_mcp.profiling import in_worker
+
+_T = TypeVar("_T")
+
+_DEFAULT_MAX_QUEUE = 64
+
+_pool: WorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when too many computations are already queued."""
+
+
+class WorkerPool:
+    """Thread pool with a limit on running plus queued computations.
+
+    At most ``max_workers`` computations run at once and at most ``max_queue``
+    more wait for a worker; further submissions fail fast with
+    ``ServerBusyError`` instead of growing the queue without bound.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = _DEFAULT_MAX_QUEUE) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="jyotishganit-worker"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of computations running or waiting for a worker."""
+        return self._pending
+
+    async def run(self, fn: Callable[[], _T]) -> _T:
+        """Run ``fn`` in a worker thread and return its result.
+
+        ``fn`` runs in a copy of the caller's context, so profiling stages it
+        records belong to the calling tool request.
+
+        Raises:
+            ServerBusyError: If the pool and its queue are full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise ServerBusyError(
+                    f"Server busy: {self._pending} computations pending; retry later."
+                )
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self._executor, context.run, in_worker(fn)
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def pool_from_env() -> WorkerPool:
+    """Create a pool sized by environment variables.
+
+    JYOTISHGANIT_MCP_WORKERS is the number of concurrent computations (default:
+    CPU count, at most 8); JYOTISHGANIT_MCP_MAX_QUEUE is how many more may wait
+    before requests are rejected (default 64).
+    """
+    workers = os.environ.get("JYOTISHGANIT_MCP_WORKERS", "").strip()
+    queue = os.environ.get("JYOTISHGANIT_MCP_MAX_QUEUE", "").strip()
+    return WorkerPool(
+        max_workers=max(1, int(workers)) if workers else min(8, os.cpu_count() or 1),
+        max_queue=max(0, int(queue)) if queue else _DEFAULT_MAX_QUEUE,
+    )
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the shared worker pool, creating it from env on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pool_from_env()
+        return _pool
+
+
+def set_worker_pool(pool: WorkerPool | None) -> None:
+    """Replace the shared worker pool (None recreates it from env on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is not pool:
+            _pool.shutdown()
+        _pool = pool
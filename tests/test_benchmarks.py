@@ -0,0 +1,38 @@
+"""Tests for the benchmark runner in benchmarks/run.py."""
+
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+RUNNER = Path(__file__).parent.parent / "benchmarks" / "run.py"
+
+
+def _load_runner() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("benchmarks_run", RUNNER)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_every_tool_has_a_benchmark_case() -> None:
+    """New tools must be added to the benchmark suite."""
+    assert _load_runner().missing_cases() == []
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    """Medians slower than the threshold ratio are marked as regressions."""
+    runner = _load_runner()
+    baseline = [
+        {"name": "get_panchanga", "mode": "warm", "median": 0.001},
+        {"name": "get_dashas", "mode": "warm", "median": 0.001},
+    ]
+    results = [
+        {"name": "get_panchanga", "mode": "warm", "median": 0.0011},
+        {"name": "get_dashas", "mode": "warm", "median": 0.002},
+        {"name": "cache_stats", "mode": "warm", "median": 0.001},
+    ]
+    lines = runner.compare(results, baseline, threshold=1.25)
+    assert len(lines) == 2
+    assert not lines[0].endswith("REGRESSION")
+    assert lines[1].endswith("REGRESSION")
@@ -1,8 +1,38 @@
 """Tests for the LRU-cached birth chart computation."""
 
+import pickle
+from collections.abc import Iterator
 from datetime import datetime
 
-from jyotishganit_mcp.chart_cache import clear_cache, get_birth_chart
+import pytest
+from jyotishganit import calculate_birth_chart
+
+from jyotishganit_mcp import chart_cache
+from jyotishganit_mcp.cache_limits import CacheLimits, set_cache_limits
+from jyotishganit_mcp.chart_cache import (
+    BirthDetails,
+    LazyBirthChart,
+    cache_stats,
+    chart_key,
+    clear_cache,
+    get_birth_chart,
+    get_birth_charts,
+    get_chart_by_id,
+    pin_chart,
+    register_chart_id,
+    unpin_chart,
+)
+
+LOCATION = (18.404, 75.195, 5.5)
+
+
+@pytest.fixture
+def limits() -> Iterator[None]:
+    """Restore the default cache limits after the test."""
+    clear_cache()
+    yield
+    set_cache_limits(None)
+    clear_cache()
 
 
 def test_same_params_return_same_cached_object() -> None:
@@ -26,6 +56,34 @@ def test_different_params_return_different_charts() -> None:
     assert chart1 is not chart2
 
 
+def test_keys_are_canonical_utc_instants_with_rounded_coordinates() -> None:
+    """Keys hold the UTC instant, coordinates to 4 places and the offset."""
+    key = chart_key(datetime(1996, 7, 4, 9, 10, 0), 18.4040001, 75.19499999, 5.5)
+    assert key == (1996, 7, 4, 3, 40, 0, 18.404, 75.195, 5.5)
+    near_midnight = chart_key(datetime(2000, 1, 1, 2, 0, 0), 0.0, -0.00001, 5.5)
+    assert near_midnight == (1999, 12, 31, 20, 30, 0, 0.0, 0.0, 5.5)
+
+
+def test_nearby_coordinates_share_a_chart_for_the_rounded_location() -> None:
+    """Coordinates equal at the configured precision hit the same chart."""
+    clear_cache()
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    chart1 = get_birth_chart(birth, 18.404, 75.195, 5.5)
+    chart2 = get_birth_chart(birth, 18.40400004, 75.19499996, 5.5)
+    assert chart1 is chart2
+    assert chart1.person.birth_datetime == birth
+    assert (chart1.person.latitude, chart1.person.longitude) == (18.404, 75.195)
+
+
+def test_coordinate_precision_is_configurable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """JYOTISHGANIT_MCP_COORD_DECIMALS sets the rounding of coordinates."""
+    monkeypatch.setenv("JYOTISHGANIT_MCP_COORD_DECIMALS", "2")
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    assert chart_key(birth, 18.404, 75.191, 5.5) == chart_key(birth, 18.4, 75.19, 5.5)
+
+
 def test_clear_cache_resets() -> None:
     """clear_cache() invalidates the cache so next call recomputes."""
     clear_cache()
@@ -35,3 +93,178 @@ def test_clear_cache_resets() -> None:
     clear_cache()
     chart2 = get_birth_chart(birth, lat, lon, tz)
     assert chart1 is not chart2
+
+
+def test_sections_are_computed_lazily_and_memoized() -> None:
+    """Sections are computed on first access and reused afterwards."""
+    clear_cache()
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    chart = get_birth_chart(birth, 18.404, 75.195, 5.5)
+    assert chart._sections == {}
+    dashas = chart.dashas
+    assert chart.dashas is dashas
+    assert set(chart._sections) == {"dashas"}
+    d9 = chart.divisional_chart("d9")
+    assert chart.divisional_chart("d9") is d9
+    assert "divisional:d10" not in chart._sections
+
+
+def test_named_chart_shares_sections_with_cached_chart() -> None:
+    """A chart patched with a name reuses the cached chart's sections."""
+    clear_cache()
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    named = get_birth_chart(birth, 18.404, 75.195, 5.5, name="Bhampu")
+    panchanga = named.panchanga
+    chart = get_birth_chart(birth, 18.404, 75.195, 5.5)
+    assert chart.person.name is None
+    assert named.person.name == "Bhampu"
+    assert chart.panchanga is panchanga
+
+
+def test_responses_are_memoized_shared_and_not_pickled() -> None:
+    """Built responses are reused by named views but left out of pickles."""
+    clear_cache()
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    chart = get_birth_chart(birth, 18.404, 75.195, 5.5)
+    built = chart.response(("panchanga",), lambda: {"tithi": chart.panchanga.tithi})
+    named = get_birth_chart(birth, 18.404, 75.195, 5.5, name="Bhampu")
+    assert named.has_response(("panchanga",))
+    assert named.response(("panchanga",), dict) is built
+    restored = pickle.loads(pickle.dumps(chart))
+    assert not restored.has_response(("panchanga",))
+    assert "panchanga" in restored._sections
+
+
+def test_lazy_chart_matches_full_calculation() -> None:
+    """The lazily assembled chart serializes like jyotishganit's full chart."""
+    clear_cache()
+    birth = datetime(1996, 7, 4, 9, 10, 0)
+    chart = get_birth_chart(birth, 18.404, 75.195, 5.5)
+    expected = calculate_birth_chart(birth, 18.404, 75.195, 5.5)
+    assert chart.to_dict() == expected.to_dict()
+
+
+def test_get_birth_charts_computes_misses_in_worker_processes() -> None:
+    """Batch misses are computed in the pool, deduplicated, and cached."""
+    clear_cache()
+    cached = get_birth_chart(datetime(1996, 7, 4, 9, 10, 0), 18.404, 75.195, 5.5)
+    births = [
+        BirthDetails(datetime(1996, 7, 4, 9, 10, 0), 18.404, 75.195, 5.5),
+        BirthDetails(datetime(1990, 1, 1, 12, 0, 0), 28.61, 77.21, 5.5),
+        BirthDetails(datetime(1985, 3, 15, 6, 30, 0), 19.07, 72.88, 5.5),
+        BirthDetails(datetime(1990, 1, 1, 12, 0, 0), 28.61, 77.21, 5.5),
+    ]
+    charts = get_birth_charts(births, ["panchanga"], max_workers=2)
+    assert charts[0] is cached
+    assert isinstance(charts[1], LazyBirthChart)
+    assert isinstance(charts[2], LazyBirthChart)
+    assert charts[3] is charts[1]
+    assert "panchanga" in charts[1]._sections
+    assert (
+        get_birth_chart(datetime(1990, 1, 1, 12, 0, 0), 28.61, 77.21, 5.5)
+        is (charts[1])
+    )
+
+
+def test_cache_evicts_beyond_max_entries(limits: None) -> None:
+    """The least recently used chart is evicted when the entry limit is hit."""
+    set_cache_limits(CacheLimits(max_entries=2))
+    evictions = cache_stats()["evictions"]
+    first = get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION)
+    get_birth_chart(datetime(1996, 7, 4, 2, 0, 0), *LOCATION)
+    assert get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION) is first
+    get_birth_chart(datetime(1996, 7, 4, 3, 0, 0), *LOCATION)
+    stats = cache_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == evictions + 1
+    assert get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION) is first
+
+
+def test_cache_bytes_grow_with_sections_and_bound_the_cache(limits: None) -> None:
+    """Computed sections add to the approximate size, which is bounded."""
+    chart = get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION)
+    before = cache_stats()["approximate_bytes"]
+    chart.dashas
+    after = cache_stats()["approximate_bytes"]
+    assert isinstance(before, int) and isinstance(after, int)
+    assert after > before > 0
+    set_cache_limits(CacheLimits(max_bytes=after + 1))
+    get_birth_chart(datetime(1996, 7, 4, 2, 0, 0), *LOCATION)
+    assert cache_stats()["entries"] == 1
+
+
+def test_cache_entries_expire_after_ttl(
+    limits: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An entry older than the TTL is recomputed and counted as expired."""
+    set_cache_limits(CacheLimits(ttl_seconds=60))
+    now = 1000.0
+    monkeypatch.setattr(chart_cache.time, "monotonic", lambda: now)
+    chart = get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION)
+    expirations = cache_stats()["expirations"]
+    now += 30
+    assert get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION) is chart
+    now += 31
+    assert get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION) is not chart
+    assert cache_stats()["expirations"] == expirations + 1
+
+
+def test_pinned_charts_are_not_evicted_or_expired(
+    limits: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A pinned chart outlives the entry limit and the TTL until unpinned."""
+    set_cache_limits(CacheLimits(max_entries=1, ttl_seconds=60))
+    now = 1000.0
+    monkeypatch.setattr(chart_cache.time, "monotonic", lambda: now)
+    pinned = datetime(1996, 7, 4, 1, 0, 0)
+    chart = get_birth_chart(pinned, *LOCATION)
+    pin_chart(chart_key(pinned, *LOCATION))
+    get_birth_chart(datetime(1996, 7, 4, 2, 0, 0), *LOCATION)
+    now += 120
+    assert get_birth_chart(pinned, *LOCATION) is chart
+    assert cache_stats()["pinned"] == 1
+    assert unpin_chart(chart_key(pinned, *LOCATION))
+    assert not unpin_chart(chart_key(pinned, *LOCATION))
+    get_birth_chart(datetime(1996, 7, 4, 3, 0, 0), *LOCATION)
+    assert cache_stats()["entries"] == 1
+    assert get_birth_chart(pinned, *LOCATION) is not chart
+
+
+def test_pinned_charts_are_bounded(
+    limits: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Pinning fails once the pin limit is reached; re-pinning does not count."""
+    monkeypatch.setattr(chart_cache, "_MAX_PINNED_CHARTS", 1)
+    pin_chart(chart_key(datetime(1996, 7, 4, 1, 0, 0), *LOCATION))
+    pin_chart(chart_key(datetime(1996, 7, 4, 1, 0, 0), *LOCATION))
+    with pytest.raises(ValueError, match="Too many pinned charts"):
+        pin_chart(chart_key(datetime(1996, 7, 4, 2, 0, 0), *LOCATION))
+
+
+def test_chart_ids_are_stable_and_resolve_to_the_chart(limits: None) -> None:
+    """An ID is a hash of the key and outlives the cached chart."""
+    key = chart_key(datetime(1996, 7, 4, 9, 10, 0), *LOCATION)
+    cid = register_chart_id(key)
+    assert cid == chart_cache.chart_id(key) and len(cid) == 16
+    assert cid != chart_cache.chart_id(chart_key(datetime(1996, 7, 4), *LOCATION))
+    chart = get_chart_by_id(cid)
+    assert chart is get_birth_chart(datetime(1996, 7, 4, 9, 10, 0), *LOCATION)
+    clear_cache()
+    assert get_chart_by_id(cid) is not chart
+    with pytest.raises(KeyError):
+        get_chart_by_id("0" * 16)
+
+
+def test_cache_stats_count_hits_misses_and_compute_times(limits: None) -> None:
+    """Stats report lookups and per-section compute-time histograms."""
+    before = cache_stats()
+    chart = get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION)
+    get_birth_chart(datetime(1996, 7, 4, 1, 0, 0), *LOCATION)
+    chart.panchanga
+    stats = cache_stats()
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+    compute = stats["compute_seconds"]
+    assert isinstance(compute, dict)
+    assert compute["chart"]["count"] >= 1
+    assert compute["panchanga"]["count"] >= 1
@@ -0,0 +1,204 @@
+"""Tests for the persistent SQLite chart store."""
+
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from jyotishganit_mcp import chart_cache, chart_store
+from jyotishganit_mcp.chart_cache import (
+    chart_key,
+    clear_cache,
+    get_birth_chart,
+    set_chart_store,
+)
+from jyotishganit_mcp.chart_store import ChartStore
+
+BIRTH = datetime(1996, 7, 4, 9, 10, 0)
+LAT, LON, TZ = 18.404, 75.195, 5.5
+KEY = chart_key(BIRTH, LAT, LON, TZ)
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[ChartStore]:
+    """A fresh store installed as the persistent tier for the test."""
+    s = ChartStore(str(tmp_path / "charts.db"))
+    set_chart_store(s)
+    yield s
+    set_chart_store(None)
+    s.close()
+
+
+def _fail(*args: object, **kwargs: object) -> None:
+    raise AssertionError("chart was recomputed")
+
+
+def test_restart_serves_stored_chart_without_computing(
+    store: ChartStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """After the in-process cache is cleared, charts and sections come from disk."""
+    chart = get_birth_chart(BIRTH, LAT, LON, TZ)
+    nakshatra = chart.panchanga.nakshatra
+    clear_cache()
+    monkeypatch.setattr(chart_cache, "calculate_all_positions", _fail)
+    monkeypatch.setattr(chart_cache.panchanga, "create_panchanga", _fail)
+    restored = get_birth_chart(BIRTH, LAT, LON, TZ)
+    assert restored is not chart
+    assert restored.panchanga.nakshatra == nakshatra
+    assert restored.d1_chart.houses[0].sign == chart.d1_chart.houses[0].sign
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """The store keeps at most max_entries rows, dropping the oldest access."""
+    clear_cache()
+    chart = get_birth_chart(BIRTH, LAT, LON, TZ)
+    s = ChartStore(str(tmp_path / "charts.db"), max_entries=2)
+    keys = [(*KEY[:3], hour, *KEY[4:]) for hour in (1, 2, 3)]
+    s.save(keys[0], chart)
+    s.save(keys[1], chart)
+    assert s.load(keys[0]) is not None
+    s.save(keys[2], chart)
+    assert len(s) == 2
+    assert s.load(keys[1]) is None
+    assert s.load(keys[0]) is not None
+    s.close()
+
+
+def test_other_format_version_is_ignored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows written under a different format version are not served."""
+    clear_cache()
+    chart = get_birth_chart(BIRTH, LAT, LON, TZ)
+    path = str(tmp_path / "charts.db")
+    old = ChartStore(path)
+    old.save(KEY, chart)
+    old.close()
+    monkeypatch.setattr(chart_store, "_FORMAT_VERSION", chart_store._FORMAT_VERSION + 1)
+    new = ChartStore(path)
+    assert new.load(KEY) is None
+    assert len(new) == 0
+    new.close()
+
+
+def test_dashas_from_an_earlier_day_are_recomputed(store: ChartStore) -> None:
+    """Current/upcoming dashas depend on today's date, so old ones are dropped."""
+    chart = get_birth_chart(BIRTH, LAT, LON, TZ)
+    chart.dashas
+    chart.panchanga
+    chart_cache.flush_store_writes()
+    store._conn.execute("UPDATE charts SET computed_on = '2000-01-01'")
+    restored = store.load(KEY)
+    assert restored is not None
+    assert "dashas" not in restored._sections
+    assert "panchanga" in restored._sections
+
+
+def test_new_sections_are_written_once_and_errors_are_logged(
+    store: ChartStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Sections computed together cost one write; a failed write is only logged."""
+    chart = get_birth_chart(BIRTH, LAT, LON, TZ)
+    writes = []
+    save_pickled = store.save_pickled
+
+    def counting(key: object, data: bytes) -> None:
+        writes.append(key)
+        save_pickled(key, data)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(store, "save_pickled", counting)
+    chart.panchanga
+    chart.dashas
+    chart.divisional_chart("d9")
+    chart_cache.flush_store_writes()
+    assert writes == [KEY]
+    restored = store.load(KEY)
+    assert restored is not None
+    assert {"panchanga", "dashas", "divisional:d9"} <= set(restored._sections)
+
+    def locked(key: object, data: bytes) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "save_pickled", locked)
+    assert chart.ashtakavarga is not None
+    chart_cache.flush_store_writes()
+
+
+def test_sections_computed_through_a_named_chart_are_stored_unnamed(
+    store: ChartStore,
+) -> None:
+    """A named view persists the shared, unnamed chart with its new section."""
+    named = get_birth_chart(BIRTH, LAT, LON, TZ, name="Bhampu")
+    named.panchanga
+    chart_cache.flush_store_writes()
+    restored = store.load(KEY)
+    assert restored is not None
+    assert restored.person.name is None
+    assert "panchanga" in restored._sections
+
+
+def test_chart_ids_survive_a_restart(
+    store: ChartStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A chart ID resolves from the store once the process has forgotten it."""
+    cid = chart_cache.register_chart_id(KEY)
+    chart = chart_cache.get_chart_by_id(cid)
+    monkeypatch.setattr(chart_cache, "_chart_ids", OrderedDict())
+    clear_cache()
+    assert store.load_chart_key(cid) == KEY
+    restored = chart_cache.get_chart_by_id(cid)
+    assert restored.d1_chart.houses[0].sign == chart.d1_chart.houses[0].sign
+
+
+def test_chart_ids_are_evicted_least_recently_used(tmp_path: Path) -> None:
+    """The store keeps at most max_entries chart IDs, dropping the oldest use."""
+    path = str(tmp_path / "charts.db")
+    # A table from before chart IDs were evicted gains the access time.
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE chart_ids (id TEXT PRIMARY KEY, key TEXT)")
+    old.close()
+    s = ChartStore(path, max_entries=2)
+    keys = [(*KEY[:3], hour, *KEY[4:]) for hour in (1, 2, 3)]
+    s.save_chart_id("a", keys[0])
+    s.save_chart_id("b", keys[1])
+    assert s.load_chart_key("a") == keys[0]
+    s.save_chart_id("c", keys[2])
+    assert s.load_chart_key("b") is None
+    assert s.load_chart_key("a") == keys[0]
+    assert s.load_chart_key("c") == keys[2]
+    s.close()
+
+
+def test_store_directory_is_created_and_failures_disable_the_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A missing directory is created; an unusable path leaves memory caching."""
+    s = ChartStore(str(tmp_path / "new" / "dir" / "charts.db"))
+    assert len(s) == 0
+    s.close()
+
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv("JYOTISHGANIT_MCP_CACHE_DB", str(blocker / "charts.db"))
+    monkeypatch.setattr(chart_cache, "_store", None)
+    monkeypatch.setattr(chart_cache, "_store_configured", False)
+    clear_cache()
+    assert chart_cache.get_chart_store() is None
+    assert chart_cache._store_configured
+    assert get_birth_chart(BIRTH, LAT, LON, TZ).panchanga.tithi
+
+
+def test_chart_id_is_kept_in_process_when_the_store_fails(
+    store: ChartStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A locked database does not stop create_chart from handing out an ID."""
+
+    def locked(*args: object) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "save_chart_id", locked)
+    cid = chart_cache.register_chart_id(KEY)
+    assert chart_cache.chart_key_for_id(cid) == KEY
@@ -0,0 +1,107 @@
+"""Tests for the dasha interval index and the dasha query tools."""
+
+from datetime import datetime
+
+import pytest
+
+from jyotishganit_mcp.chart_cache import LazyBirthChart, get_birth_chart
+from jyotishganit_mcp.server import get_dasha_at, get_dasha_range
+
+pytestmark = pytest.mark.asyncio
+
+BIRTH = (1996, 7, 4, 9, 10, 0, 18.404, 75.195, 5.5)
+
+
+def _chart() -> LazyBirthChart:
+    return get_birth_chart(datetime(*BIRTH[:6]), *BIRTH[6:])
+
+
+async def test_periods_match_jyotishganit_tree() -> None:
+    """Every pratyantardasha jyotishganit builds is found with the same dates."""
+    chart = _chart()
+    index = chart.dasha_index
+    for md, md_data in chart.dashas.all["mahadashas"].items():
+        for ad, ad_data in md_data["antardashas"].items():
+            for pd, pd_data in ad_data["pratyantardashas"].items():
+                path = index.at(pd_data["start"], 3)
+                assert [p.lords[-1] for p in path] == [md, ad, pd]
+                assert (path[0].start, path[0].end) == (
+                    md_data["start"],
+                    md_data["end"],
+                )
+                assert (path[1].start, path[1].end) == (
+                    ad_data["start"],
+                    ad_data["end"],
+                )
+                assert (path[2].start, path[2].end) == (
+                    pd_data["start"],
+                    pd_data["end"],
+                )
+
+
+async def test_range_periods_are_contiguous() -> None:
+    index = _chart().dasha_index
+    periods = index.between(datetime(2024, 1, 1), datetime(2025, 1, 1), 4)
+    assert periods[0].start <= datetime(2024, 1, 1) < periods[0].end
+    assert periods[-1].start < datetime(2025, 1, 1) <= periods[-1].end
+    for before, after in zip(periods, periods[1:], strict=False):
+        assert abs((after.start - before.end).total_seconds()) < 1e-3
+        assert len(after.lords) == 4
+    assert index.at(datetime(1800, 1, 1)) == []
+    with pytest.raises(ValueError, match="Too many periods"):
+        index.between(datetime(2000, 1, 1), datetime(2050, 1, 1), 5, limit=100)
+
+
+async def test_get_dasha_at() -> None:
+    result = await get_dasha_at(*BIRTH, date="2024-06-01", depth=5)
+    assert isinstance(result, dict)
+    periods = result["periods"]
+    assert isinstance(periods, list)
+    assert [p["level"] for p in periods] == [
+        "mahadasha",
+        "antardasha",
+        "pratyantardasha",
+        "sookshmadasha",
+        "pranadasha",
+    ]
+    assert periods[-1]["lords"] == [p["lord"] for p in periods]
+    for outer, inner in zip(periods, periods[1:], strict=False):
+        assert outer["start"] <= inner["start"] <= "2024-06-01T00:00:00"
+        assert "2024-06-01T00:00:00" < inner["end"] <= outer["end"]
+
+
+async def test_get_dasha_at_converts_offset_dates_to_local_time() -> None:
+    """A date with a UTC offset is the same moment in the chart's local time."""
+    local = await get_dasha_at(*BIRTH, date="2024-06-01T05:30:00", depth=5)
+    aware = await get_dasha_at(*BIRTH, date="2024-06-01T00:00:00+00:00", depth=5)
+    assert isinstance(aware, dict)
+    assert aware["periods"] == local["periods"]  # type: ignore[index]
+    ranged = await get_dasha_range(
+        *BIRTH,
+        start_date="2024-01-01T00:00:00+05:30",
+        end_date="2024-12-31T00:00:00+00:00",
+    )
+    assert isinstance(ranged, dict) and ranged["periods"]
+
+
+async def test_get_dasha_range() -> None:
+    result = await get_dasha_range(
+        *BIRTH, start_date="2024-01-01", end_date="2024-12-31", depth=2
+    )
+    assert isinstance(result, dict)
+    periods = result["periods"]
+    assert isinstance(periods, list)
+    assert periods[0]["start"] <= "2024-01-01T00:00:00"
+    assert periods[-1]["end"] > "2024-12-31T23:59:59"
+    assert {p["level"] for p in periods} == {"antardasha"}
+
+
+async def test_dasha_tools_reject_bad_input() -> None:
+    assert "depth" in await get_dasha_at(*BIRTH, date="2024-06-01", depth=6)
+    assert "Invalid date" in await get_dasha_at(*BIRTH, date="June")
+    assert "must not be before" in await get_dasha_range(
+        *BIRTH, start_date="2024-06-01", end_date="2024-01-01"
+    )
+    assert "Too many periods" in await get_dasha_range(
+        *BIRTH, start_date="1996-01-01", end_date="2096-01-01", depth=5
+    )
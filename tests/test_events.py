@@ -0,0 +1,94 @@
+"""Tests for the transit event search."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from jyotishganit_mcp.ephemeris import position_series
+from jyotishganit_mcp.events import find_events
+from jyotishganit_mcp.server import find_events as find_events_tool
+
+pytestmark = pytest.mark.asyncio
+
+
+def _body(moment: datetime, body: str, timezone_offset: float) -> dict:
+    series = position_series([moment], timezone_offset, (body,))
+    return {k: v[0] for k, v in series["bodies"][body].items()}
+
+
+async def test_ingresses_and_stations_are_exact() -> None:
+    """Sign, nakshatra and direction differ two seconds either side."""
+    events = find_events(
+        datetime(2024, 1, 1),
+        datetime(2024, 3, 1),
+        5.5,
+        ("sign_ingress", "nakshatra_ingress", "station"),
+        ("Moon", "Mercury", "Mars"),
+    )
+    assert [e["at"] for e in events] == sorted(str(e["at"]) for e in events)
+    kinds = {e["type"] for e in events}
+    assert kinds == {"sign_ingress", "nakshatra_ingress", "station_direct"}
+    for event in events:
+        at = datetime.fromisoformat(str(event["at"]))
+        before = _body(at - timedelta(seconds=2), str(event["body"]), 5.5)
+        after = _body(at + timedelta(seconds=2), str(event["body"]), 5.5)
+        if event["type"] == "station_direct":
+            assert before["speed"] < 0 < after["speed"]
+        else:
+            field = "sign" if event["type"] == "sign_ingress" else "nakshatra"
+            assert (before[field], after[field]) == (event["from"], event[field])
+
+
+async def test_known_events() -> None:
+    conjunction = find_events(
+        datetime(2020, 12, 1),
+        datetime(2021, 1, 1),
+        event_types=("conjunction",),
+        pairs=(("Jupiter", "Saturn"),),
+    )
+    assert [(e["at"][:16], e["sign"]) for e in conjunction] == [
+        ("2020-12-21T18:20", "Capricorn")
+    ]
+    ingress = find_events(
+        datetime(2025, 1, 1),
+        datetime(2026, 1, 1),
+        5.5,
+        ("sign_ingress",),
+        ("Saturn",),
+    )
+    assert [(e["at"][:10], e["sign"]) for e in ingress] == [("2025-03-29", "Pisces")]
+    eclipses = find_events(
+        datetime(2024, 1, 1), datetime(2025, 1, 1), event_types=("eclipse",)
+    )
+    dates = [(e["type"], e["at"][:10]) for e in eclipses]
+    assert ("solar_eclipse", "2024-04-08") in dates
+    assert ("solar_eclipse", "2024-10-02") in dates
+    assert ("lunar_eclipse", "2024-09-18") in dates
+    assert len(dates) <= 5
+
+
+async def test_tool_finds_events() -> None:
+    result = await find_events_tool(
+        "2024-10-01T00:00:00",
+        "2024-10-31T00:00:00",
+        event_types=["station"],
+        bodies=["Jupiter", "Saturn"],
+    )
+    assert isinstance(result, dict)
+    assert [(e["type"], e["body"]) for e in result["events"]] == [
+        ("station_retrograde", "Jupiter")
+    ]
+
+
+async def test_tool_rejects_bad_input() -> None:
+    start, end = "2024-01-01T00:00:00", "2024-02-01T00:00:00"
+    assert "Invalid datetime" in await find_events_tool("soon", end)
+    assert await find_events_tool(end, start) == "end must be after start."
+    assert "Window too long" in await find_events_tool(start, "2040-01-01T00:00:00")
+    assert "Unknown event types" in await find_events_tool(
+        start, end, event_types=["occultation"]
+    )
+    assert "Unknown bodies" in await find_events_tool(start, end, bodies=["Pluto"])
+    assert "Invalid conjunction" in await find_events_tool(
+        start, end, conjunctions=["Jupiter"]
+    )
@@ -0,0 +1,124 @@
+"""Tests for the HTTP transport options and health endpoints."""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from starlette.requests import Request
+
+from jyotishganit_mcp import server, warmup
+from jyotishganit_mcp.server import _configure_http, health, ready
+
+pytestmark = pytest.mark.asyncio
+
+BIRTH = {
+    "birth_year": 1996,
+    "birth_month": 7,
+    "birth_day": 4,
+    "birth_hour": 9,
+    "birth_minute": 10,
+    "birth_second": 0,
+    "latitude": 18.404,
+    "longitude": 75.195,
+    "timezone_offset": 5.5,
+}
+
+
+def _request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "headers": []})
+
+
+@pytest.fixture
+def not_ready() -> Iterator[None]:
+    was_ready = warmup.is_ready()
+    warmup._ready.clear()
+    yield
+    if was_ready:
+        warmup.mark_ready()
+
+
+async def test_ready_reports_503_until_warm_up_finishes(not_ready: None) -> None:
+    """Readiness fails until warm-up ends; liveness always succeeds."""
+    assert (await ready(_request("/ready"))).status_code == 503
+    assert (await health(_request("/health"))).status_code == 200
+    warmup.mark_ready()
+    assert (await ready(_request("/ready"))).status_code == 200
+
+
+async def test_several_workers_make_http_stateless(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Public hosts drop loopback-only Host checks; workers drop sessions."""
+    settings = server.mcp.settings
+    for name in ("host", "port", "transport_security", "stateless_http"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+    monkeypatch.setenv("JYOTISHGANIT_MCP_HOST", "0.0.0.0")
+    monkeypatch.setenv("JYOTISHGANIT_MCP_PORT", "9000")
+    monkeypatch.setenv("JYOTISHGANIT_MCP_HTTP_WORKERS", "4")
+    _configure_http()
+    assert (settings.host, settings.port) == ("0.0.0.0", 9000)
+    assert settings.transport_security is None
+    assert settings.stateless_http is True
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+async def _wait_ready(url: str, proc: subprocess.Popen[bytes]) -> None:
+    for _ in range(120):
+        assert proc.poll() is None, "server exited"
+        try:
+            with urllib.request.urlopen(url) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        await asyncio.sleep(0.25)
+    raise TimeoutError(url)
+
+
+async def test_multi_worker_streamable_http_serves_tools() -> None:
+    """Two worker processes report ready after warm-up and serve tool calls."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "jyotishganit_mcp",
+            "--transport",
+            "streamable-http",
+            "--port",
+            str(port),
+            "--http-workers",
+            "2",
+        ],
+        env={**os.environ, "JYOTISHGANIT_MCP_WARMUP": "1"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_ready(f"http://127.0.0.1:{port}/ready", proc)
+        async with streamable_http_client(f"http://127.0.0.1:{port}/mcp") as (
+            read,
+            write,
+            _,
+        ):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                result = await session.call_tool("get_ayanamsa", BIRTH)
+        assert not result.isError
+        assert "Chitra" in result.content[0].text  # type: ignore[union-attr]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
@@ -0,0 +1,39 @@
+"""Tests that registering the server's tools stays cheap to import."""
+
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("jyotishganit", "skyfield", "numpy", "pandas")
+
+# Lists the tools in a fresh interpreter, then reports which heavy top-level
+# packages -X importtime saw imported along the way.
+_LIST_TOOLS = """
+import asyncio, json, sys
+from jyotishganit_mcp.server import mcp
+tools = asyncio.run(mcp.list_tools())
+print(json.dumps(sorted(t.name for t in tools)))
+"""
+
+
+def _run_list_tools() -> tuple[list[str], set[str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _LIST_TOOLS],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            module = line.rsplit("|", 1)[1].strip()
+            imported.add(module.split(".")[0])
+    return json.loads(proc.stdout), imported
+
+
+def test_listing_tools_does_not_import_scientific_stack() -> None:
+    """Tool schemas register without importing jyotishganit, Skyfield or NumPy."""
+    tools, imported = _run_list_tools()
+    assert "calculate_birth_chart" in tools
+    assert "batch_get_chart_views" in tools
+    assert imported.isdisjoint(HEAVY_MODULES), imported & set(HEAVY_MODULES)
@@ -0,0 +1,55 @@
+"""Tests for the per-location sunrise/sunset caches."""
+
+from datetime import datetime
+
+import jyotishganit.core.astronomical as astronomical
+import pytest
+from jyotishganit.core.models import Person
+
+from jyotishganit_mcp import location_cache
+from jyotishganit_mcp.chart_cache import LazyBirthChart
+from jyotishganit_mcp.location_cache import clear_location_cache, location_cache_stats
+
+PEOPLE = [
+    Person(datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.5),
+    Person(datetime(1985, 11, 2, 23, 50), 40.7128, -74.006, -5.0),
+    Person(datetime(2001, 3, 1, 0, 5), -33.8688, 151.2093, 11.0),
+    # Midnight sun and polar night in Svalbard.
+    Person(datetime(2020, 6, 21, 0, 30), 78.2232, 15.6267, 2.0),
+    Person(datetime(2020, 12, 21, 12, 0), 78.2232, 15.6267, 1.0),
+]
+
+
+def _sun(person: Person) -> tuple[object, ...]:
+    return (
+        astronomical.get_sunrise_sunset(person),
+        astronomical.get_day_night_period(person),
+        astronomical.is_birth_daytime(person),
+    )
+
+
+def test_cached_results_match_jyotishganit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Sunrise, day/night period and day birth are unchanged by the caches."""
+    cached = [_sun(person) for person in PEOPLE]
+    with monkeypatch.context() as m:
+        m.setattr(astronomical, "_solar_events", location_cache._original_solar_events)
+        m.setattr(
+            astronomical,
+            "_solar_culmination",
+            location_cache._original_solar_culmination,
+        )
+        m.setattr(astronomical, "is_birth_daytime", location_cache._original_is_daytime)
+        expected = [_sun(person) for person in PEOPLE]
+    assert cached == expected
+
+
+def test_charts_for_one_place_and_day_share_the_sunrise_search() -> None:
+    """Strengths of two births on the same day search for sunrise once."""
+    clear_location_cache()
+    for hour in (6, 18):
+        person = Person(datetime(1996, 7, 4, hour, 0), 18.404, 75.195, 5.5)
+        LazyBirthChart(person).strengths
+    stats = location_cache_stats()
+    assert stats["solar_events"]["misses"] == 1
+    assert stats["solar_events"]["hits"] >= 3
+    assert stats["sunrise_predicates"]["misses"] == 1
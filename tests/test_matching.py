@@ -0,0 +1,107 @@
+"""Tests for Ashtakoota matching."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+from jyotishganit.core.constants import ZODIAC_SIGNS
+
+from jyotishganit_mcp.chart_cache import BirthDetails, get_birth_chart
+from jyotishganit_mcp.matching import (
+    _NAKSHATRA_TABLES,
+    MAX_POINTS,
+    moon_longitudes,
+    scores,
+)
+from jyotishganit_mcp.server import match_charts
+
+pytestmark = pytest.mark.asyncio
+
+BIRTH = {
+    "birth_year": 1996,
+    "birth_month": 7,
+    "birth_day": 4,
+    "birth_hour": 9,
+    "birth_minute": 10,
+    "birth_second": 0,
+    "latitude": 18.404,
+    "longitude": 75.195,
+    "timezone_offset": 5.5,
+}
+
+
+def _candidates(n: int) -> list[dict[str, int | float]]:
+    """Births a few days apart, so their Moons spread over the zodiac."""
+    return [
+        {**BIRTH, "birth_year": 1995, "birth_month": 1 + i % 12, "birth_day": 1 + i}
+        for i in range(n)
+    ]
+
+
+async def test_tables() -> None:
+    yoni = _NAKSHATRA_TABLES["yoni"]
+    assert (yoni == yoni.T).all()
+    # Sworn enemies: Ashwini (horse) and Hasta (buffalo), Ashlesha (cat) and
+    # Magha (rat).
+    assert yoni[0, 12] == 0 and yoni[8, 9] == 0
+    # Same Moon: everything but nadi.
+    same = scores(np.array([5.0]), np.array([5.0]))
+    assert {k: float(v[0]) for k, v in same.items()} == {
+        **MAX_POINTS,
+        "nadi": 0.0,
+        "total": 28.0,
+    }
+    moons = np.arange(0.5, 360.0, 3.0)
+    groom, bride = np.meshgrid(moons, moons)
+    points = scores(groom.ravel(), bride.ravel())
+    for name, top in MAX_POINTS.items():
+        assert 0.0 <= points[name].min() and points[name].max() == top
+    assert points["total"].max() <= 36.0
+
+
+async def test_moon_longitudes_match_charts() -> None:
+    births = [
+        BirthDetails(datetime(1990 + i, 3, 1 + i, 6, 30), 28.61, 77.21, -3.0 + i)
+        for i in range(4)
+    ]
+    computed = moon_longitudes(births)
+    for birth, longitude in zip(births, computed, strict=True):
+        chart = get_birth_chart(
+            birth.birth_date, birth.latitude, birth.longitude, birth.timezone_offset
+        )
+        moon = next(p for p in chart.d1_chart.planets if p.celestial_body == "Moon")
+        expected = ZODIAC_SIGNS.index(moon.sign) * 30.0 + moon.sign_degrees
+        assert longitude == pytest.approx(expected, abs=1e-6)
+    # All of them are cached now.
+    assert moon_longitudes(births) == pytest.approx(computed, abs=1e-6)
+
+
+async def test_tool_ranks_candidates() -> None:
+    candidates = _candidates(20)
+    candidates.insert(3, {**BIRTH, "birth_month": 13})
+    result = await match_charts(BIRTH, candidates, top_k=5)
+    assert isinstance(result, dict)
+    assert result["errors"] == [{"index": 3, "error": "month must be in 1..12"}]
+    matches = result["matches"]
+    assert len(matches) == 5
+    assert 3 not in [m["index"] for m in matches]
+    totals = [m["total"] for m in matches]
+    assert totals == sorted(totals, reverse=True)
+    for m in matches:
+        assert m["total"] == sum(m["kootas"].values())
+
+    # Swapping roles scores each pair from the other side.
+    everyone = await match_charts(BIRTH, candidates, top_k=100)
+    as_bride = await match_charts(BIRTH, candidates, "bride", top_k=100)
+    assert isinstance(everyone, dict) and isinstance(as_bride, dict)
+    assert len(everyone["matches"]) == 20
+    nadi = {m["index"]: m["kootas"]["nadi"] for m in everyone["matches"]}
+    assert nadi == {m["index"]: m["kootas"]["nadi"] for m in as_bride["matches"]}
+
+
+async def test_tool_rejects_bad_input() -> None:
+    assert "reference_role" in await match_charts(BIRTH, [], "partner")
+    assert "top_k" in await match_charts(BIRTH, [], top_k=0)
+    reference = {k: v for k, v in BIRTH.items() if k != "latitude"}
+    message = await match_charts(reference, [BIRTH])
+    assert message == "Invalid reference: Missing field: latitude"
@@ -0,0 +1,98 @@
+"""Tests for the panchanga calendar."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from jyotishganit.components.panchanga import (
+    calculate_karana,
+    calculate_nakshatra,
+    calculate_tithi,
+    calculate_yoga,
+    create_panchanga,
+)
+
+from jyotishganit_mcp.ephemeris import ayanamsa, utc_times
+from jyotishganit_mcp.panchanga_calendar import panchanga_calendar
+from jyotishganit_mcp.server import get_panchanga_calendar
+
+pytestmark = pytest.mark.asyncio
+
+LAT, LON, TZ = 18.404, 75.195, 5.5
+
+
+def _ayanamsa(moment: datetime) -> float:
+    return float(ayanamsa(utc_times([moment], TZ))[0])
+
+
+LIMB_AT = {
+    "tithi": lambda m: calculate_tithi(m, TZ),
+    "nakshatra": lambda m: calculate_nakshatra(m, TZ, _ayanamsa(m)),
+    "yoga": lambda m: calculate_yoga(m, TZ, _ayanamsa(m)),
+    "karana": lambda m: calculate_karana(m, TZ),
+}
+
+
+@pytest.fixture(scope="module")
+def calendar() -> dict[str, object]:
+    return panchanga_calendar(date(2024, 1, 1), date(2024, 1, 14), LAT, LON, TZ)
+
+
+async def test_days_match_panchanga_at_sunrise(calendar: dict) -> None:
+    """Each day's limbs are jyotishganit's panchanga at that sunrise."""
+    assert len(calendar["days"]) == 14
+    for day in calendar["days"]:
+        sunrise = datetime.fromisoformat(day["sunrise"])
+        assert sunrise.date().isoformat() == day["date"]
+        assert datetime.fromisoformat(day["sunset"]) > sunrise
+        p = create_panchanga(sunrise, TZ, _ayanamsa(sunrise))
+        assert (day["tithi"], day["nakshatra"], day["yoga"], day["karana"]) == (
+            p.tithi,
+            p.nakshatra,
+            p.yoga,
+            p.karana,
+        )
+        assert day["vaara"] == p.vaara
+
+
+async def test_transitions_are_exact(calendar: dict) -> None:
+    """A limb is the new one just after its transition and not just before."""
+    transitions = calendar["transitions"]
+    # About one tithi and nakshatra and two karanas per day.
+    assert 11 <= len(transitions["tithi"]) <= 16
+    assert 22 <= len(transitions["karana"]) <= 32
+    for limb, events in transitions.items():
+        times = [datetime.fromisoformat(e["at"]) for e in events]
+        assert times == sorted(times)
+        for event, at in zip(events, times, strict=True):
+            assert datetime(2024, 1, 1) <= at < datetime(2024, 1, 15)
+            assert LIMB_AT[limb](at + timedelta(seconds=2)) == event["name"]
+            assert LIMB_AT[limb](at - timedelta(seconds=2)) != event["name"]
+
+
+async def test_polar_night_has_no_sunrise() -> None:
+    result = panchanga_calendar(date(2020, 12, 20), date(2020, 12, 21), 78.22, 15.63, 1)
+    days: list[dict[str, object]] = result["days"]  # type: ignore[assignment]
+    assert [d["sunrise"] for d in days] == [None, None]
+    assert all(d["tithi"] for d in days)
+
+
+async def test_tool_validates_dates() -> None:
+    args = {"latitude": LAT, "longitude": LON, "timezone_offset": TZ}
+    bad = await get_panchanga_calendar("2024-13-01", "2024-12-31", **args)
+    assert isinstance(bad, str) and bad.startswith("Invalid date")
+    reversed_range = await get_panchanga_calendar("2024-02-01", "2024-01-01", **args)
+    assert reversed_range == "end_date must not be before start_date."
+    too_long = await get_panchanga_calendar("2024-01-01", "2025-01-01", **args)
+    assert isinstance(too_long, str) and too_long.startswith("Too many days")
+
+
+async def test_tool_returns_calendar() -> None:
+    result = await get_panchanga_calendar("2024-01-01", "2024-01-03", LAT, LON, TZ)
+    assert isinstance(result, dict)
+    assert result["timezone_offset"] == TZ
+    assert [d["date"] for d in result["days"]] == [
+        "2024-01-01",
+        "2024-01-02",
+        "2024-01-03",
+    ]
+    assert set(result["transitions"]) == {"tithi", "nakshatra", "yoga", "karana"}
@@ -0,0 +1,106 @@
+"""Tests for opt-in per-stage profiling of tool calls."""
+
+import json
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from jyotishganit_mcp import profiling
+from jyotishganit_mcp.chart_cache import clear_cache
+from jyotishganit_mcp.profiling import (
+    ProfilingConfig,
+    profile_request,
+    profiling_stats,
+    record,
+    reset_profiling_stats,
+    set_profiling_config,
+    stage,
+)
+from jyotishganit_mcp.server import mcp
+
+pytestmark = pytest.mark.asyncio
+
+BIRTH = {
+    "birth_year": 1996,
+    "birth_month": 7,
+    "birth_day": 4,
+    "birth_hour": 9,
+    "birth_minute": 10,
+    "birth_second": 0,
+    "latitude": 18.404,
+    "longitude": 75.195,
+    "timezone_offset": 5.5,
+}
+
+
+@pytest.fixture(autouse=True)
+def reset() -> Iterator[None]:
+    reset_profiling_stats()
+    yield
+    set_profiling_config(ProfilingConfig())
+    reset_profiling_stats()
+
+
+async def test_stages_are_ignored_outside_profiled_calls() -> None:
+    """stage and record do nothing when no tool call is being profiled."""
+    set_profiling_config(ProfilingConfig(enabled=False))
+    with profile_request("get_panchanga") as profile:
+        assert profile is None
+        with stage("build"):
+            record("compute:chart", 1.0)
+    assert profiling_stats()["tools"] == {}
+
+
+async def test_tool_call_records_stages_and_logs_them(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A cold call is split into validation, lookup, compute, build and encode."""
+    set_profiling_config(ProfilingConfig(enabled=True))
+    clear_cache()
+    with caplog.at_level(logging.INFO, logger=profiling.__name__):
+        await mcp.call_tool("get_dashas", BIRTH)
+
+    tools: Any = profiling_stats()["tools"]
+    stats = tools["get_dashas"]
+    for name in (
+        "request",
+        "validate",
+        "cache_lookup",
+        "queue",
+        "compute:chart",
+        "compute:dashas",
+        "build",
+        "encode",
+    ):
+        assert stats[name]["count"] == 1, name
+    logged = json.loads(caplog.records[-1].getMessage())
+    assert logged["tool"] == "get_dashas"
+    assert logged["stages"]["request"] == logged["seconds"]
+
+
+async def test_only_the_slowest_profiles_are_kept(tmp_path: Path) -> None:
+    """With a dump directory, pstats files of the N slowest calls are kept."""
+    set_profiling_config(
+        ProfilingConfig(enabled=True, dump_dir=str(tmp_path), dump_slowest=2)
+    )
+    clear_cache()
+    for _ in range(4):
+        await mcp.call_tool("get_ascendant", BIRTH)
+
+    slowest: Any = profiling_stats()["slowest"]
+    assert len(slowest) == 2
+    kept = sorted(str(path) for path in tmp_path.iterdir())
+    assert kept == sorted(s["path"] for s in slowest)
+
+
+async def test_profiling_resource_reports_per_tool_stats() -> None:
+    """The stats resource serves the aggregated timings as JSON."""
+    set_profiling_config(ProfilingConfig(enabled=True))
+    await mcp.call_tool("get_ayanamsa", BIRTH)
+    contents = list(await mcp.read_resource("jyotishganit://stats/profiling"))
+    stats = json.loads(contents[0].content)
+    assert stats["enabled"] is True
+    assert "request" in stats["tools"]["get_ayanamsa"]
@@ -0,0 +1,81 @@
+"""Tests for the birth-time sweep."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from jyotishganit_mcp.chart_cache import get_birth_chart
+from jyotishganit_mcp.server import sweep_birth_time
+from jyotishganit_mcp.sweep import sweep_birth_time as sweep_segments
+
+pytestmark = pytest.mark.asyncio
+
+BIRTH = datetime(1996, 7, 4, 9, 10)
+LAT, LON, TZ = 18.404, 75.195, 5.5
+
+
+def _chart_values(moment: datetime) -> dict[str, object]:
+    chart = get_birth_chart(moment, LAT, LON, TZ)
+    h1 = chart.d1_chart.houses[0]
+    moon = next(p for p in chart.d1_chart.planets if p.celestial_body == "Moon")
+    return {
+        "lagna_sign": {"sign": h1.sign},
+        "lagna_pada": {"nakshatra": h1.nakshatra, "pada": h1.pada},
+        "moon_nakshatra": {"nakshatra": moon.nakshatra},
+        "d9_lagna": {"sign": chart.divisional_chart("d9").ascendant.sign},
+    }
+
+
+async def test_segment_edges_match_full_charts() -> None:
+    """The first and last second of every segment give the segment's value."""
+    segments = sweep_segments(BIRTH, timedelta(minutes=20), LAT, LON, TZ, ("d9",))
+    assert [s["sign"] for s in segments["lagna_sign"]] == ["Cancer", "Leo"]
+    assert len(segments["d9_lagna"]) >= 3
+    for name, parts in segments.items():
+        assert parts[0]["start"] == "1996-07-04T08:50:00"
+        assert parts[-1]["end"] == "1996-07-04T09:30:00"
+        for part, following in zip(parts, parts[1:], strict=False):
+            end = datetime.fromisoformat(str(part["end"]))
+            assert following["start"] == (end + timedelta(seconds=1)).isoformat()
+        for part in parts:
+            value = {k: v for k, v in part.items() if k not in ("start", "end")}
+            for edge in ("start", "end"):
+                moment = datetime.fromisoformat(str(part[edge]))
+                assert _chart_values(moment)[name] == value, (name, edge, part)
+
+
+async def test_tool_returns_segments() -> None:
+    result = await sweep_birth_time(
+        1996, 7, 4, 9, 10, 0, LAT, LON, TZ, window_minutes=5, charts=["D60"]
+    )
+    assert isinstance(result, dict)
+    segments = result["segments"]
+    assert isinstance(segments, dict)
+    assert set(segments) == {
+        "lagna_sign",
+        "lagna_pada",
+        "moon_nakshatra",
+        "d60_lagna",
+    }
+    assert len(segments["d60_lagna"]) > 2
+
+
+async def test_tool_rejects_bad_input() -> None:
+    args = (1996, 7, 4, 9, 10, 0, LAT, LON, TZ)
+    assert "Unknown chart codes" in await sweep_birth_time(*args, charts=["d5"])
+    assert "window_minutes" in await sweep_birth_time(*args, window_minutes=0)
+    assert "window_minutes" in await sweep_birth_time(*args, window_minutes=1000)
+    assert "month" in await sweep_birth_time(1996, 13, 4, 9, 10, 0, LAT, LON, TZ)
+
+
+async def test_tool_times_stay_whole_seconds() -> None:
+    """A fractional window is rounded, so every time is to the second."""
+    result = await sweep_birth_time(
+        1996, 7, 4, 9, 10, 0, LAT, LON, TZ, window_minutes=0.001
+    )
+    assert isinstance(result, dict)
+    segments = result["segments"]
+    assert isinstance(segments, dict)
+    lagna = segments["lagna_sign"]
+    assert lagna[0]["start"] == "1996-07-04T09:09:59"
+    assert lagna[-1]["end"] == "1996-07-04T09:10:01"
@@ -1,16 +1,34 @@
 """Tests for MCP server tools using known birth data (July 4, 1996, Karmala)."""
 
+import asyncio
 import json
+import threading
+from datetime import datetime
 
+import pytest
+from jyotishganit import get_birth_chart_json_string
+
+from jyotishganit_mcp import chart_cache, server
 from jyotishganit_mcp.chart_cache import clear_cache
 from jyotishganit_mcp.server import (
+    batch_get_chart_views,
+    cache_stats,
     calculate_birth_chart,
+    create_chart,
+    get_ascendant,
+    get_chart_views,
+    get_chart_views_by_id,
     get_dashas,
     get_divisional_chart,
+    get_houses_summary,
     get_panchanga,
     get_planetary_positions,
+    get_position_series,
+    release_chart,
 )
 
+pytestmark = pytest.mark.asyncio
+
 # Known birth data from jyotishganit docs: Karmala, India
 BIRTH = {
     "birth_year": 1996,
@@ -27,10 +45,10 @@ BIRTH = {
 }
 
 
-def test_calculate_birth_chart_returns_valid_json() -> None:
+async def test_calculate_birth_chart_returns_valid_json() -> None:
     """calculate_birth_chart returns valid JSON with expected top-level keys."""
     clear_cache()
-    result = calculate_birth_chart(**BIRTH)
+    result = await calculate_birth_chart(**BIRTH)
     data = json.loads(result)
     assert "@context" in data
     assert "@type" in data
@@ -39,18 +57,60 @@ def test_calculate_birth_chart_returns_valid_json() -> None:
     assert "d1_chart" in data or "d1Chart" in data or "d1_chart" in str(data).lower()
 
 
-def test_calculate_birth_chart_passes_through_name() -> None:
+async def test_calculate_birth_chart_passes_through_name() -> None:
     """calculate_birth_chart includes caller-provided name in person metadata."""
     clear_cache()
-    result = calculate_birth_chart(**{**BIRTH, "name": "Bhampu"})
+    result = await calculate_birth_chart(**{**BIRTH, "name": "Bhampu"})
     data = json.loads(result)
     assert data["person"]["name"] == "Bhampu"
 
 
-def test_get_panchanga_returns_expected_fields() -> None:
+async def test_calculate_birth_chart_fields_match_full_chart() -> None:
+    """Selected fields equal the same subtrees of the full chart."""
+    clear_cache()
+    full = json.loads(await calculate_birth_chart(**BIRTH))
+    fields = ["panchanga.nakshatra", "dashas.current", "divisional_charts.d9"]
+    data = json.loads(await calculate_birth_chart(**BIRTH, fields=fields))
+    assert list(data) == fields
+    assert data["panchanga.nakshatra"] == "Dhanishta"
+    assert data["dashas.current"] == full["dashas"]["current"]
+    assert data["divisional_charts.d9"] == full["divisionalCharts"]["d9"]
+
+
+async def test_calculate_birth_chart_fields_compute_only_needed_sections() -> None:
+    """Selecting fields computes only the sections they read."""
+    clear_cache()
+    result = await calculate_birth_chart(**BIRTH, fields=["d1_chart.planets.0"])
+    assert json.loads(result)["d1_chart.planets.0"]["celestialBody"] == "Sun"
+    chart = chart_cache.peek_birth_chart(
+        datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.5
+    )
+    assert chart is not None
+    assert chart.has_sections(["strengths"])
+    assert not chart.has_sections(["dashas"])
+    assert not chart.has_sections(["d9"])
+
+
+async def test_calculate_birth_chart_compact_drops_json_ld_keys() -> None:
+    """compact returns minified JSON without @context/@type."""
+    result = await calculate_birth_chart(**BIRTH, compact=True)
+    assert "@type" not in result
+    assert "\n" not in result
+    assert json.loads(result)["panchanga"]["nakshatra"] == "Dhanishta"
+
+
+async def test_calculate_birth_chart_unknown_field_returns_error() -> None:
+    """Unknown fields return an error message instead of JSON."""
+    assert "Unknown field" in await calculate_birth_chart(**BIRTH, fields=["planets"])
+    assert "Unknown field" in await calculate_birth_chart(
+        **BIRTH, fields=["panchanga.nope"]
+    )
+
+
+async def test_get_panchanga_returns_expected_fields() -> None:
     """get_panchanga returns tithi, nakshatra, yoga, karana, vaara."""
     clear_cache()
-    result = get_panchanga(**BIRTH)
+    result = await get_panchanga(**BIRTH)
     assert "tithi" in result
     assert "nakshatra" in result
     assert "yoga" in result
@@ -60,10 +120,20 @@ def test_get_panchanga_returns_expected_fields() -> None:
     assert result["tithi"] == "Krishna Chaturthi"
 
 
-def test_get_planetary_positions_returns_nine_planets() -> None:
+async def test_cold_panchanga_does_not_build_a_chart() -> None:
+    """Without a cached chart the panchanga comes from the Sun and Moon alone."""
+    clear_cache()
+    fast = await get_panchanga(**BIRTH)
+    assert chart_cache.cache_stats()["entries"] == 0
+    chart = server._get_chart(**BIRTH)
+    assert fast == server._panchanga_view(chart)
+    assert await get_panchanga(**BIRTH) == fast
+
+
+async def test_get_planetary_positions_returns_nine_planets() -> None:
     """get_planetary_positions returns 9 planets with expected fields."""
     clear_cache()
-    result = get_planetary_positions(**BIRTH)
+    result = await get_planetary_positions(**BIRTH)
     assert len(result) == 9
     for p in result:
         assert "celestial_body" in p
@@ -78,20 +148,20 @@ def test_get_planetary_positions_returns_nine_planets() -> None:
     assert "Sun" in bodies
 
 
-def test_get_dashas_returns_current_and_upcoming() -> None:
+async def test_get_dashas_returns_current_and_upcoming() -> None:
     """get_dashas returns current and upcoming mahadashas."""
     clear_cache()
-    result = get_dashas(**BIRTH)
+    result = await get_dashas(**BIRTH)
     assert "current" in result
     assert "upcoming" in result
     assert "mahadashas" in result["current"]
     assert "mahadashas" in result["upcoming"]
 
 
-def test_get_divisional_chart_d9_returns_houses_and_planets() -> None:
+async def test_get_divisional_chart_d9_returns_houses_and_planets() -> None:
     """get_divisional_chart for d9 returns Navamsa with houses and ascendant."""
     clear_cache()
-    result = get_divisional_chart(**BIRTH, chart_code="d9")
+    result = await get_divisional_chart(**BIRTH, chart_code="d9")
     assert isinstance(result, dict)
     assert "ascendant" in result or "houses" in result
     if "houses" in result:
@@ -108,9 +178,319 @@ def test_get_divisional_chart_d9_returns_houses_and_planets() -> None:
         assert isinstance(occupants_with_degrees[0]["signDegrees"], (int, float))
 
 
-def test_get_divisional_chart_invalid_code_returns_error() -> None:
+async def test_get_divisional_chart_invalid_code_returns_error() -> None:
     """get_divisional_chart with invalid chart_code returns error message."""
     clear_cache()
-    result = get_divisional_chart(**BIRTH, chart_code="d99")
+    result = await get_divisional_chart(**BIRTH, chart_code="d99")
     assert isinstance(result, str)
     assert "Unknown" in result or "Valid codes" in result
+
+
+async def test_get_chart_views_matches_single_tools(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """get_chart_views returns what each single tool returns, in one call."""
+    clear_cache()
+    views = ["ascendant", "houses_summary", "dashas", "panchanga", "d9"]
+    result = await get_chart_views(**BIRTH, views=views)
+    assert isinstance(result, dict)
+    assert list(result) == views
+    assert result["ascendant"] == await get_ascendant(**BIRTH)
+    assert result["houses_summary"] == await get_houses_summary(**BIRTH)
+    assert result["dashas"] == await get_dashas(**BIRTH)
+    assert result["panchanga"] == await get_panchanga(**BIRTH)
+    assert result["d9"] == await get_divisional_chart(**BIRTH, chart_code="d9")
+
+    def no_pool() -> None:
+        raise AssertionError("worker pool used for a warm request")
+
+    monkeypatch.setattr(server, "get_worker_pool", no_pool)
+    assert await get_chart_views(**BIRTH, views=views) == result
+
+
+async def test_sunrise_sunset_view_is_not_built_on_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The almanac search of sunrise_sunset runs in the worker pool."""
+    clear_cache()
+    server._get_chart(**BIRTH).panchanga
+    loop_thread = threading.get_ident()
+    threads = []
+    sunrise_sunset = server._VIEWS["sunrise_sunset"]
+
+    def recording(chart: chart_cache.LazyBirthChart) -> object:
+        threads.append(threading.get_ident())
+        return sunrise_sunset(chart)
+
+    monkeypatch.setitem(server._VIEWS, "sunrise_sunset", recording)
+    result = await get_chart_views(**BIRTH, views=["panchanga", "sunrise_sunset"])
+    assert isinstance(result, dict) and list(result) == ["panchanga", "sunrise_sunset"]
+    assert threads and loop_thread not in threads
+
+
+async def test_sunrise_sunset_view_by_id_is_not_built_on_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """get_chart_views_by_id also runs the almanac search in the worker pool."""
+    clear_cache()
+    record = {k: v for k, v in BIRTH.items() if k not in ("name", "location_name")}
+    created = await create_chart(**record)
+    assert isinstance(created, dict)
+    loop_thread = threading.get_ident()
+    threads = []
+    sunrise_sunset = server._VIEWS["sunrise_sunset"]
+
+    def recording(chart: chart_cache.LazyBirthChart) -> object:
+        threads.append(threading.get_ident())
+        return sunrise_sunset(chart)
+
+    monkeypatch.setitem(server._VIEWS, "sunrise_sunset", recording)
+    result = await get_chart_views_by_id(str(created["chart_id"]), ["sunrise_sunset"])
+    assert isinstance(result, dict) and "sunrise_sunset" in result
+    assert threads and loop_thread not in threads
+
+
+async def test_get_chart_views_unknown_view_returns_error() -> None:
+    """get_chart_views rejects unknown views and the full chart."""
+    result = await get_chart_views(**BIRTH, views=["ascendant", "birth_chart"])
+    assert isinstance(result, str)
+    assert result.startswith("Unknown views: birth_chart.")
+
+
+async def test_chart_id_stands_in_for_birth_details(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """create_chart's ID serves the same views, and pinning can be undone."""
+    clear_cache()
+    created = await create_chart(
+        **{k: v for k, v in BIRTH.items() if k not in ("name", "location_name")},
+        pin=True,
+    )
+    assert isinstance(created, dict) and created["pinned"] is True
+    chart_id = str(created["chart_id"])
+    views = ["ascendant", "dashas", "d9"]
+    expected = await get_chart_views(**BIRTH, views=views)
+    assert await get_chart_views_by_id(chart_id, views) == expected
+    assert chart_cache.cache_stats()["pinned"] == 1
+
+    def no_pool() -> None:
+        raise AssertionError("worker pool used for a warm request")
+
+    with monkeypatch.context() as m:
+        m.setattr(server, "get_worker_pool", no_pool)
+        assert await get_chart_views_by_id(chart_id, views) == expected
+    assert await release_chart(chart_id) == {"chart_id": chart_id, "was_pinned": True}
+    assert chart_cache.cache_stats()["pinned"] == 0
+
+
+async def test_failed_create_chart_leaves_no_pin(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A chart that could not be computed is not pinned."""
+    clear_cache()
+
+    def fail(*args: object) -> None:
+        raise RuntimeError("ephemeris unavailable")
+
+    monkeypatch.setattr(server, "_get_chart", fail)
+    record = {k: v for k, v in BIRTH.items() if k not in ("name", "location_name")}
+    with pytest.raises(RuntimeError):
+        await create_chart(**record, pin=True)
+    assert chart_cache.cache_stats()["pinned"] == 0
+
+
+async def test_unknown_chart_id_returns_error() -> None:
+    """Unknown IDs and views are reported as messages."""
+    result = await get_chart_views_by_id("0" * 16, ["ascendant"])
+    assert isinstance(result, str) and result.startswith("Unknown chart_id")
+    assert "Unknown chart_id" in await release_chart("0" * 16)
+    assert "Unknown views" in await get_chart_views_by_id("0" * 16, ["nope"])
+
+
+async def test_batch_get_chart_views_returns_results_in_order() -> None:
+    """batch_get_chart_views returns per-birth views and per-item errors."""
+    clear_cache()
+    record = {k: v for k, v in BIRTH.items() if k not in ("name", "location_name")}
+    bad_date = {**record, "birth_month": 13}
+    missing = {k: v for k, v in record.items() if k != "latitude"}
+    result = await batch_get_chart_views(
+        [record, bad_date, missing, record], ["panchanga", "d9"]
+    )
+    assert isinstance(result, list)
+    assert len(result) == 4
+    assert result[0]["panchanga"] == await get_panchanga(**BIRTH)
+    assert result[0]["d9"] == await get_divisional_chart(**BIRTH, chart_code="d9")
+    assert result[3] == result[0]
+    assert "error" in result[1]
+    assert result[2] == {"error": "Missing field: latitude"}
+
+
+async def test_batch_get_chart_views_unknown_view_returns_error() -> None:
+    """batch_get_chart_views rejects unknown view names."""
+    result = await batch_get_chart_views([], ["horoscope"])
+    assert isinstance(result, str)
+    assert "Unknown views" in result
+
+
+async def test_batch_get_chart_views_limits_births() -> None:
+    """batch_get_chart_views rejects oversized batches before computing."""
+    births = [BIRTH] * (server._MAX_BATCH_BIRTHS + 1)
+    result = await batch_get_chart_views(births, ["ascendant"])
+    assert result == f"Too many births; the limit is {server._MAX_BATCH_BIRTHS}."
+
+
+async def test_concurrent_cold_requests_compute_chart_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Simultaneous requests for one uncached birth share a single computation."""
+    clear_cache()
+    created = []
+
+    class CountingChart(chart_cache.LazyBirthChart):
+        def __init__(self, *args: object, **kwargs: object) -> None:
+            created.append(self)
+            super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(chart_cache, "LazyBirthChart", CountingChart)
+    results = await asyncio.gather(*(get_ascendant(**BIRTH) for _ in range(10)))
+    assert len(created) == 1
+    assert all(r == results[0] for r in results)
+
+
+async def test_warm_panchanga_is_served_without_the_worker_pool(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A cached chart with panchanga computed does not queue for a worker."""
+    clear_cache()
+    server._get_chart(**BIRTH).panchanga
+    expected = await get_panchanga(**BIRTH)
+
+    def no_pool() -> None:
+        raise AssertionError("worker pool used for a warm request")
+
+    monkeypatch.setattr(server, "get_worker_pool", no_pool)
+    assert await get_panchanga(**BIRTH) == expected
+
+
+async def test_repeated_calls_reuse_the_built_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A second identical call returns the memoized response without a worker."""
+    clear_cache()
+    dashas = await get_dashas(**BIRTH)
+    full = await calculate_birth_chart(**BIRTH)
+
+    def no_pool() -> None:
+        raise AssertionError("worker pool used for a repeated request")
+
+    monkeypatch.setattr(server, "get_worker_pool", no_pool)
+    assert await get_dashas(**BIRTH) is dashas
+    assert await calculate_birth_chart(**BIRTH) is full
+
+
+async def test_named_full_chart_matches_direct_serialization() -> None:
+    """The name patched into the shared JSON gives the same text as a rebuild."""
+    clear_cache()
+    await calculate_birth_chart(**BIRTH)
+    named = {**BIRTH, "name": 'Bhampu "B"'}
+    chart = server._get_chart(**named)
+    expected = get_birth_chart_json_string(chart.to_birth_chart())
+    assert await calculate_birth_chart(**named) == expected
+    compact = json.loads(await calculate_birth_chart(**named, compact=True))
+    assert compact["person"]["name"] == 'Bhampu "B"'
+
+
+async def test_name_copies_the_chart_only_for_person_output(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tools that never output the name use the shared chart without a copy."""
+    clear_cache()
+    named = {**BIRTH, "name": "Bhampu", "location_name": "Karmala"}
+    copies = []
+    with_person = chart_cache.LazyBirthChart.with_person
+
+    def counting(
+        self: chart_cache.LazyBirthChart, person: object
+    ) -> chart_cache.LazyBirthChart:
+        copies.append(person)
+        return with_person(self, person)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(chart_cache.LazyBirthChart, "with_person", counting)
+    await get_panchanga(**named)
+    await get_dashas(**named)
+    await get_chart_views(**named, views=["ascendant", "shadbala"])
+    full = json.loads(await calculate_birth_chart(**named))
+    assert copies == []
+    assert full["person"]["name"] == "Bhampu"
+    person = json.loads(await calculate_birth_chart(**named, fields=["person"]))
+    assert person["person"]["name"] == "Bhampu"
+    assert len(copies) == 1
+
+
+async def test_cache_stats_reports_cached_charts() -> None:
+    """cache_stats reports the cached chart and its limits."""
+    clear_cache()
+    await get_dashas(**BIRTH)
+    stats = await cache_stats()
+    assert stats["entries"] == 1
+    assert stats["max_entries"] > 0
+    assert "dashas" in stats["compute_seconds"]
+
+
+async def test_get_position_series_matches_chart_positions() -> None:
+    """A one-point series at the birth moment agrees with the chart's D1."""
+    result = await get_position_series(
+        timestamps=["1996-07-04T09:10:00"], timezone_offset=5.5
+    )
+    assert isinstance(result, dict)
+    series = result["bodies"]
+    for planet in await get_planetary_positions(**BIRTH):
+        column = series[planet["celestial_body"]]
+        assert column["sign"] == [planet["sign"]]
+        assert column["nakshatra"] == [planet["nakshatra"]]
+        assert column["pada"] == [planet["pada"]]
+        assert column["motion_type"] == [planet["motion_type"]]
+
+
+async def test_get_position_series_over_a_range_is_columnar() -> None:
+    """Start/end/step yields aligned columns for the requested bodies."""
+    result = await get_position_series(
+        start="2024-01-01T00:00:00",
+        end="2024-01-31T00:00:00",
+        step_hours=24,
+        bodies=["Moon", "Saturn"],
+    )
+    assert isinstance(result, dict)
+    assert len(result["timestamps"]) == 31
+    assert set(result["bodies"]) == {"Moon", "Saturn"}
+    assert len(result["bodies"]["Moon"]["longitude"]) == 31
+    assert len(set(result["bodies"]["Moon"]["sign"])) == 12
+
+
+async def test_get_position_series_honours_utc_offsets() -> None:
+    """A timestamp with its own offset is that instant, not local time."""
+    local = await get_position_series(
+        timestamps=["2024-01-01T05:30:00"], timezone_offset=5.5, bodies=["Moon"]
+    )
+    aware = await get_position_series(
+        timestamps=["2024-01-01T00:00:00+00:00"], timezone_offset=5.5, bodies=["Moon"]
+    )
+    assert isinstance(local, dict) and isinstance(aware, dict)
+    assert aware["bodies"] == local["bodies"]
+    assert "UTC offset" in await get_position_series(
+        start="2024-01-01T00:00:00+00:00", end="2024-01-02T00:00:00"
+    )
+
+
+async def test_get_position_series_rejects_bad_input() -> None:
+    """Unknown bodies and oversized ranges return error messages."""
+    assert "Unknown bodies" in await get_position_series(
+        timestamps=["2024-01-01T00:00:00"], bodies=["Pluto"]
+    )
+    assert "Too many points" in await get_position_series(
+        start="2000-01-01T00:00:00", end="2024-01-01T00:00:00", step_hours=1
+    )
+    message = await get_position_series(
+        start="2024-01-02T00:00:00", end="2024-01-01T00:00:00"
+    )
+    assert message == "end must not be before start."
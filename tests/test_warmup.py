@@ -0,0 +1,135 @@
+"""Tests for start-up warm-up and the compact Spica cache."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from skyfield.api import Star, load
+from skyfield.data import hipparcos
+
+from jyotishganit_mcp import star_cache
+from jyotishganit_mcp.warmup import warm_charts, warm_up
+
+
+def _fail() -> None:
+    raise AssertionError("catalog was parsed")
+
+
+def test_spica_row_is_cached_on_disk(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The first load parses the catalog and writes the cache; later ones read it."""
+    path = tmp_path / "spica.npy"
+    monkeypatch.setenv("JYOTISHGANIT_MCP_STAR_CACHE", str(path))
+    parsed = star_cache.load_spica_row()
+    assert path.is_file()
+    monkeypatch.setattr(star_cache, "_parse_catalog_row", _fail)
+    np.testing.assert_array_equal(star_cache.load_spica_row(), parsed)
+
+
+def test_cached_spica_matches_catalog_star(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Spica built from the cache is the star jyotishganit builds from the catalog."""
+    monkeypatch.setenv("JYOTISHGANIT_MCP_STAR_CACHE", str(tmp_path / "spica.npy"))
+    with load.open(hipparcos.URL) as f:
+        expected = Star.from_dataframe(
+            hipparcos.load_dataframe(f).loc[star_cache.SPICA_HIP]
+        )
+    star_cache.get_spica.cache_clear()
+    try:
+        spica = star_cache.get_spica()
+    finally:
+        star_cache.get_spica.cache_clear()
+    assert spica.ra.hours == expected.ra.hours
+    assert spica.dec.degrees == expected.dec.degrees
+    assert spica.epoch == expected.epoch
+
+
+def test_warm_up_reports_each_stage() -> None:
+    """warm_up returns a non-negative timing for every stage."""
+    timings = warm_up()
+    assert set(timings) == {"imports", "ephemeris", "spica", "chart"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_access_log_round_trips_through_chart_warm_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The hottest logged charts are warmed first, up to the cache size."""
+    from datetime import datetime
+
+    from jyotishganit_mcp import chart_cache
+    from jyotishganit_mcp.access_log import AccessLog, read_chart_file
+    from jyotishganit_mcp.cache_limits import CacheLimits, set_cache_limits
+    from jyotishganit_mcp.chart_cache import chart_key, clear_cache
+
+    location = (18.404, 75.195, 5.5)
+    keys = [chart_key(datetime(1996, 7, 4, hour), *location) for hour in (1, 2, 3)]
+    log = AccessLog(str(tmp_path / "access.jsonl"))
+    for key, hits in zip(keys, (1, 3, 2), strict=True):
+        for _ in range(hits):
+            log.record(key)
+    assert log.write() == 3
+    with open(log.path, "a") as f:
+        f.write('\n["not", "an", "object"]\n{"birth_year": 1996}\n')
+    records = read_chart_file(log.path)
+    assert [r["hits"] for r in records[:3]] == [3, 2, 1]
+    assert records[0]["birth_hour"] == 2 and records[0]["timezone_offset"] == 5.5
+
+    clear_cache()
+    set_cache_limits(CacheLimits(max_entries=2))
+    monkeypatch.setattr(chart_cache, "_default_batch_workers", lambda: 1)
+    try:
+        assert warm_charts(log.path) == 2
+        assert set(chart_cache._cache) == {keys[1], keys[2]}
+    finally:
+        set_cache_limits(None)
+        clear_cache()
+
+
+def test_chart_lookups_are_counted_in_the_access_log(tmp_path: Path) -> None:
+    """Every lookup of a chart counts towards its place in the access log."""
+    from datetime import datetime
+
+    from jyotishganit_mcp.access_log import AccessLog, set_access_log
+    from jyotishganit_mcp.chart_cache import chart_key, get_birth_chart
+
+    log = AccessLog(str(tmp_path / "access.jsonl"))
+    set_access_log(log)
+    try:
+        get_birth_chart(datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.5)
+        get_birth_chart(datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.5)
+    finally:
+        set_access_log(None)
+    key = chart_key(datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.5)
+    assert log.hottest() == [(key, 2)]
+
+
+def test_access_log_resumes_from_its_file_and_skips_warm_up(tmp_path: Path) -> None:
+    """Reopened logs keep earlier hits; replaying them does not add any."""
+    from datetime import datetime
+
+    from jyotishganit_mcp.access_log import AccessLog, set_access_log
+    from jyotishganit_mcp.chart_cache import chart_key, clear_cache
+
+    key = chart_key(datetime(1996, 7, 4, 9, 10), 18.404, 75.195, 5.75)
+    path = str(tmp_path / "access.jsonl")
+    log = AccessLog(path)
+    for _ in range(3):
+        log.record(key)
+    log.write()
+    with open(path, "a") as f:
+        f.write('{"birth_year": 1996, "hits": "5"}\n')
+
+    reopened = AccessLog(path)
+    assert reopened.hottest() == [(key, 3)]
+    set_access_log(reopened)
+    try:
+        clear_cache()
+        assert warm_charts(path) == 1
+    finally:
+        set_access_log(None)
+        clear_cache()
+    assert reopened.hottest() == [(key, 3)]
+    assert [p.name for p in tmp_path.iterdir()] == ["access.jsonl"]
@@ -0,0 +1,34 @@
+"""Tests for the bounded worker pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from jyotishganit_mcp.workers import ServerBusyError, WorkerPool
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_run_returns_result_from_worker_thread() -> None:
+    """run() executes the callable off the event loop thread."""
+    pool = WorkerPool(max_workers=1)
+    loop_thread = threading.get_ident()
+    worker_thread = await pool.run(threading.get_ident)
+    assert worker_thread != loop_thread
+    pool.shutdown()
+
+
+async def test_full_pool_rejects_with_server_busy() -> None:
+    """Submissions beyond workers plus queue fail fast."""
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.pending == 2
+    with pytest.raises(ServerBusyError):
+        await pool.run(lambda: None)
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    assert pool.pending == 0
+    pool.shutdown()